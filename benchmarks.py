@@ -1,7 +1,9 @@
+from pathops import OpBuilder, Path, PathOp, op, simplify as pathops_simplify
 from pathops import union as pathops_union
 from booleanOperations import union as boolops_union
 from defcon import Font as DefconFont
 from ufoLib2 import Font as UfoLib2Font
+from concurrent.futures import ThreadPoolExecutor
 import math
 import timeit
 
@@ -28,6 +30,169 @@ def mean_and_stdev(runs, loops):
     return mean, stdev
 
 
+def glyph_paths(ufo):
+    font = UfoLib2Font(ufo)
+    paths = []
+    for glyph in font:
+        path = Path()
+        glyph.draw(path.getPen())
+        if path:
+            paths.append(path)
+    return paths
+
+
+def lower_half(path):
+    xMin, yMin, xMax, yMax = path.bounds
+    return xMin, yMin, xMax, (yMin + yMax) / 2
+
+
+def clip_with_op(paths):
+    for path in paths:
+        xMin, yMin, xMax, yMax = lower_half(path)
+        rect = Path()
+        rect.moveTo(xMin, yMin)
+        rect.lineTo(xMax, yMin)
+        rect.lineTo(xMax, yMax)
+        rect.lineTo(xMin, yMax)
+        rect.close()
+        op(path, rect, PathOp.INTERSECTION)
+
+
+def clip_with_clip_to_rect(paths):
+    for path in paths:
+        path.clip_to_rect(*lower_half(path))
+
+
+def run_clip(ufo, clip_func, repeat=REPEAT, number=NUMBER):
+    paths = glyph_paths(ufo)
+    all_runs = timeit.repeat(
+        stmt="clip_func(paths)",
+        repeat=repeat,
+        number=number,
+        globals={"paths": paths, "clip_func": clip_func},
+    )
+    mean, stdev = mean_and_stdev(all_runs, number)
+    print(
+        f"{clip_func.__name__}: {mean:.3f} s +- {stdev:.3f} s per loop "
+        f"(mean +- std. dev. of {repeat} run(s), {number} loop(s) each)"
+    )
+
+
+def run_scratch_stats(ufo):
+    from pathops._pathops import _scratch_stats
+
+    paths = glyph_paths(ufo)
+    acquired, allocated = _scratch_stats()
+    for path in paths:
+        pathops_simplify(path, clockwise=True)
+        path.reverse()
+    acquired, allocated = [
+        after - before for after, before in zip(_scratch_stats(), (acquired, allocated))
+    ]
+    print(f"scratch temporaries: {acquired}; allocations: {allocated}")
+
+
+def simplify_all(paths):
+    for path in paths:
+        pathops_simplify(path)
+
+
+def run_threaded(ufo, max_workers, repeat=REPEAT, number=NUMBER):
+    paths = glyph_paths(ufo)
+    chunks = [paths[i::max_workers] for i in range(max_workers)]
+    with ThreadPoolExecutor(max_workers) as executor:
+        all_runs = timeit.repeat(
+            stmt="list(executor.map(simplify_all, chunks))",
+            repeat=repeat,
+            number=number,
+            globals={
+                "executor": executor,
+                "simplify_all": simplify_all,
+                "chunks": chunks,
+            },
+        )
+    mean, stdev = mean_and_stdev(all_runs, number)
+    print(
+        f"simplify with {max_workers} thread(s): {mean:.3f} s +- {stdev:.3f} s "
+        f"per loop (mean +- std. dev. of {repeat} run(s), {number} loop(s) each)"
+    )
+    return mean
+
+
+def polygon_grid(n, size=10, step=7):
+    # a grid of overlapping squares rotated by a few degrees
+    path = Path()
+    angle = math.radians(5)
+    c, s = math.cos(angle), math.sin(angle)
+    corners = [(0, 0), (size, 0), (size, size), (0, size)]
+    for i in range(n):
+        for j in range(n):
+            pts = [
+                (i * step + x * c - y * s, j * step + x * s + y * c)
+                for x, y in corners
+            ]
+            path.moveTo(*pts[0])
+            for pt in pts[1:]:
+                path.lineTo(*pt)
+            path.close()
+    return path
+
+
+def run_polygon_engine(n, repeat=REPEAT, number=NUMBER):
+    path = polygon_grid(n)
+    for polygon_engine in [False, True]:
+        all_runs = timeit.repeat(
+            stmt="pathops_simplify(path, polygon_engine=polygon_engine)",
+            repeat=repeat,
+            number=number,
+            globals={
+                "pathops_simplify": pathops_simplify,
+                "path": path,
+                "polygon_engine": polygon_engine,
+            },
+        )
+        mean, stdev = mean_and_stdev(all_runs, number)
+        engine = "polygon" if polygon_engine else "skia"
+        print(
+            f"simplify {n}x{n} grid with {engine}: {mean:.3f} s +- {stdev:.3f} s "
+            f"per loop (mean +- std. dev. of {repeat} run(s), {number} loop(s) each)"
+        )
+
+
+def union_with_add(paths):
+    builder = OpBuilder()
+    for path in paths:
+        builder.add(path, PathOp.UNION)
+    return builder.resolve()
+
+
+def union_with_add_many(paths):
+    builder = OpBuilder()
+    builder.add_many(paths, PathOp.UNION)
+    return builder.resolve()
+
+
+def union_with_add_many_merged(paths):
+    builder = OpBuilder()
+    builder.add_many(paths, PathOp.UNION, merge_disjoint=True)
+    return builder.resolve()
+
+
+def run_op_builder(ufo, union_func, repeat=REPEAT, number=NUMBER):
+    paths = glyph_paths(ufo)
+    all_runs = timeit.repeat(
+        stmt="union_func(paths)",
+        repeat=repeat,
+        number=number,
+        globals={"paths": paths, "union_func": union_func},
+    )
+    mean, stdev = mean_and_stdev(all_runs, number)
+    print(
+        f"{union_func.__name__}: {mean:.3f} s +- {stdev:.3f} s per loop "
+        f"(mean +- std. dev. of {repeat} run(s), {number} loop(s) each)"
+    )
+
+
 def run(
     ufo,
     FontClass,
@@ -83,6 +248,25 @@ def main():
                 ufo, FontClass, union_func, pen_getter, repeat=repeat, **kwargs
             )
 
+    for clip_func in [clip_with_op, clip_with_clip_to_rect]:
+        run_clip(ufo, clip_func, repeat=repeat)
+
+    run_scratch_stats(ufo)
+
+    # on free-threaded builds the speedup should scale with the thread count
+    baseline = None
+    for max_workers in [1, 2, 4, 8]:
+        mean = run_threaded(ufo, max_workers, repeat=repeat)
+        if baseline is None:
+            baseline = mean
+        print(f"speedup: {baseline / mean:.2f}x")
+
+    for n in [10, 30]:
+        run_polygon_engine(n, repeat=repeat)
+
+    for union_func in [union_with_add, union_with_add_many, union_with_add_many_merged]:
+        run_op_builder(ufo, union_func, repeat=repeat)
+
     # import os
     # import shutil
 
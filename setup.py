@@ -13,6 +13,7 @@ from packaging.version import parse as parse_version
 import struct
 import subprocess
 import sys
+import sysconfig
 import os
 import platform
 from io import open
@@ -35,12 +36,16 @@ BUILD_SKIA_FROM_SOURCE = bool(int(os.environ.get("BUILD_SKIA_FROM_SOURCE", "1"))
 SKIA_LIBRARY_DIR = os.environ.get("SKIA_LIBRARY_DIR")
 
 # Python Limited API for stable ABI support is enabled by default.
-# PyPy does not support Limited API, so we disable it automatically.
+# PyPy and the free-threaded builds of CPython (3.13t and later) do not support
+# Limited API, so we disable it automatically.
 # Can also be disabled manually with USE_PY_LIMITED_API=0.
 # https://docs.python.org/3/c-api/stable.html#limited-c-api
 is_pypy = sys.implementation.name == "pypy"
+is_free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
 use_py_limited_api = (
-    False if is_pypy else bool_from_environ("USE_PY_LIMITED_API", default=True)
+    False
+    if is_pypy or is_free_threaded
+    else bool_from_environ("USE_PY_LIMITED_API", default=True)
 )
 # NOTE: this must be kept in sync with python_requires='>=3.10' below
 limited_api_min_version = "0x030A0000"  # Python 3.10
@@ -123,6 +128,7 @@ class custom_build_ext(build_ext):
                     "linetrace": linetrace,
                     "language_level": 3,
                     "embedsignature": True,
+                    "freethreading_compatible": True,
                 },
             )
 
@@ -429,6 +435,7 @@ setup_params = dict(
         "Operating System :: OS Independent",
         "Programming Language :: Python",
         "Programming Language :: Python :: 3",
+        "Programming Language :: Python :: Free Threading :: 2 - Beta",
         "Topic :: Multimedia :: Graphics",
         "Topic :: Multimedia :: Graphics :: Graphics Conversion",
     ],
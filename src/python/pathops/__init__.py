@@ -1,6 +1,8 @@
 from ._pathops import (
     PathPen,
     Path,
+    FrozenPath,
+    PathCollection,
     PathVerb,
     PathOp,
     FillType,
@@ -10,11 +12,17 @@ from ._pathops import (
     Direction,
     op,
     simplify,
+    outline_stroke,
+    metrics,
+    cubics_to_quads,
+    intersections,
+    self_intersections,
     OpBuilder,
     PathOpsError,
     UnsupportedVerbError,
     OpenPathError,
     NumberOfPointsError,
+    IncompatiblePathsError,
     bits2float,
     float2bits,
     decompose_quadratic_segment,
@@ -41,9 +49,11 @@ del _enum_class
 
 from .operations import (
     union,
+    iunion,
     difference,
     intersection,
     xor,
+    simplify_masters,
 )
 
 try:
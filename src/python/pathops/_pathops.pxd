@@ -8,10 +8,12 @@ from ._skia.core cimport (
     SkPathIter,
     SkPathVerb,
     SkPoint,
+    SkRect,
     SkScalar,
     SkSpan,
     SkPathDirection,
     SkMatrix,
+    SkPaint,
 )
 from ._skia.pathops cimport (
     SkOpBuilder,
@@ -22,8 +24,9 @@ from ._skia.pathops cimport (
     kXOR_SkPathOp,
     kReverseDifference_SkPathOp,
 )
-from libc.stdint cimport uint8_t, int32_t, uint32_t
+from libc.stdint cimport uint8_t, int32_t, uint32_t, uint64_t
 from libcpp.optional cimport optional
+from libcpp.vector cimport vector
 
 
 cpdef enum PathOp:
@@ -79,7 +82,9 @@ cdef float SCALAR_NEARLY_ZERO_SQD
 cdef bint can_normalize(SkScalar dx, SkScalar dy)
 
 
-cdef bint points_almost_equal(const SkPoint& p1, const SkPoint& p2)
+cdef bint points_almost_equal(
+    const SkPoint& p1, const SkPoint& p2, SkScalar tolerance=*
+)
 
 
 cdef bint is_middle_point(
@@ -88,19 +93,37 @@ cdef bint is_middle_point(
 
 
 cdef bint collinear(
-    const SkPoint& p1, const SkPoint& p2, const SkPoint& p3
+    const SkPoint& p1, const SkPoint& p2, const SkPoint& p3, SkScalar tolerance=*
 )
 
 
 cdef class Path:
 
     cdef SkPathBuilder path
+    cdef optional[SkPath] snapshot_cache
+    cdef optional[optional[SkRect]] bounds_cache
+    cdef optional[optional[SkRect]] control_bounds_cache
+    cdef optional[double] area_cache
+    cdef optional[bint] convex_cache
+    cdef _HitTester hit_tester
 
     @staticmethod
     cdef Path create(const SkPathBuilder& path)
 
+    cdef SkPath snapshot(self)
+
+    cdef void invalidate(self) noexcept
+
+    cdef optional[SkRect] tight_bounds(self)
+
+    cdef optional[SkRect] finite_bounds(self)
+
+    cdef double signed_area(self) except? -1234567
+
     cpdef PathPen getPen(self, object glyphSet=*, bint allow_open_paths=*)
 
+    cpdef void reserve(self, int n_verbs, int n_points)
+
     cpdef void moveTo(self, SkScalar x, SkScalar y)
 
     cpdef void lineTo(self, SkScalar x, SkScalar y)
@@ -160,8 +183,25 @@ cdef class Path:
         bint fix_winding=*,
         bint keep_starting_points=*,
         bint clockwise=*,
+        SkScalar round_to=*,
+        bint cleanup=*,
+        bint polygon_engine=*,
     )
 
+    cpdef quantize(self, SkScalar grid=*)
+
+    cpdef cleanup(self, SkScalar tolerance=*)
+
+    cpdef Path clip_to_rect(
+        self,
+        SkScalar left,
+        SkScalar top,
+        SkScalar right,
+        SkScalar bottom,
+    )
+
+    cpdef cubics_to_quads(self, double max_err=*, bint all_quadratic=*)
+
     cpdef convertConicsToQuads(self, float tolerance=*)
 
     cpdef stroke(
@@ -172,6 +212,18 @@ cdef class Path:
         SkScalar miter_limit,
         object dash_array=*,
         SkScalar dash_offset=*,
+        bint simplify=*,
+        bint fix_winding=*,
+        bint clockwise=*,
+    )
+
+    cpdef Path offset(
+        self,
+        SkScalar distance,
+        LineJoin join=*,
+        SkScalar miter_limit=*,
+        bint fix_winding=*,
+        bint clockwise=*,
     )
 
     cdef list getVerbs(self)
@@ -196,6 +248,19 @@ cdef class Path:
     )
 
 
+cdef class FrozenPath:
+
+    cdef SkPath path
+    cdef Py_hash_t _hash
+
+    @staticmethod
+    cdef FrozenPath create(const SkPath& path)
+
+    cpdef Path thaw(self)
+
+    cdef Py_hash_t compute_hash(self) except? -1
+
+
 cpdef enum PathVerb:
     MOVE = <uint8_t>SkPathVerb.kMove
     LINE = <uint8_t>SkPathVerb.kLine
@@ -205,6 +270,43 @@ cpdef enum PathVerb:
     CLOSE = <uint8_t>SkPathVerb.kClose
 
 
+cdef bytes PATH_COLLECTION_MAGIC
+
+
+cdef uint32_t BYTE_ORDER_MARK
+
+
+cdef struct _PathCollectionHeader:
+    char magic[8]
+    uint32_t version
+    uint32_t byte_order
+    uint64_t num_paths
+    uint64_t num_verbs
+    uint64_t num_points
+    uint64_t num_weights
+
+
+cdef class PathCollection:
+
+    cdef vector[uint8_t] verbs
+    cdef vector[SkPoint] points
+    cdef vector[SkScalar] weights
+    cdef vector[uint8_t] fill_types
+    cdef vector[uint64_t] verb_offsets
+    cdef vector[uint64_t] point_offsets
+    cdef vector[uint64_t] weight_offsets
+
+    cpdef append(self, Path path)
+
+    cdef int load_entry(self, Py_ssize_t index, SkPathBuilder& builder) except -1
+
+
+cdef size_t copy_array(const char *buf, size_t offset, void *dest, size_t size) noexcept
+
+
+cdef int check_offsets(const vector[uint64_t]& offsets, uint64_t total) except -1
+
+
 cdef uint8_t *POINTS_IN_VERB
 
 cdef dict VERB_METHODS
@@ -212,15 +314,18 @@ cdef dict VERB_METHODS
 cdef dict PEN_METHODS
 
 
+cdef int count_contours(SkSpan[const SkPathVerb] verbs) noexcept
+
+
 cdef class RawPathIterator:
 
-    cdef Path path
+    cdef FrozenPath path
     cdef optional[SkPathIter] iterator
 
 
 cdef class SegmentPenIterator:
 
-    cdef Path path
+    cdef FrozenPath path
     cdef const SkPoint *pts
     cdef const SkPathVerb *verbs
     cdef const SkPathVerb *verb_stop
@@ -246,8 +351,6 @@ cdef class PathPen:
 
     # def qCurveTo(self, *points)
 
-    cdef _qCurveToOne(self, pt1, pt2)
-
     cpdef closePath(self)
 
     cpdef endPath(self)
@@ -255,9 +358,26 @@ cdef class PathPen:
     cpdef addComponent(self, glyphName, transformation)
 
 
+cdef tuple rect_to_tuple(const optional[SkRect]& rect)
+
+
+cdef SkPoint sk_point(object pt) except *
+
+
+cdef SkPoint midpoint(const SkPoint& p1, const SkPoint& p2)
+
+
 cdef double get_path_area(const SkPathBuilder& path) except? -1234567
 
 
+cdef int walk_path_metrics(
+    const SkPathBuilder& path,
+    double *area,
+    optional[SkRect] *control_bounds,
+    int *contours,
+) except -1
+
+
 cdef class _SkScalarArray:
 
     cdef SkScalar *data
@@ -269,6 +389,340 @@ cdef class _SkScalarArray:
     cdef SkSpan[SkScalar] as_span(self)
 
 
+cdef SkPoint snap_point(const SkPoint& p, SkScalar grid)
+
+
+cdef bint has_three_distinct_points(SkSpan[const SkPoint] pts) noexcept
+
+
+cdef int add_quantized_contour(SkPathBuilder& contour, SkPathBuilder& result) except -1
+
+
+cdef int quantize_path(SkPathBuilder& path, SkScalar grid) except -1
+
+
+cdef int cleanup_path(SkPathBuilder& path, SkScalar tolerance) except -1
+
+
+cdef SkPoint lerp_points(const SkPoint& p1, const SkPoint& p2, double t)
+
+
+cdef void split_bezier(
+    const SkPoint *src, int n, double t, SkPoint *left, SkPoint *right
+) noexcept
+
+
+cdef double eval_bernstein(const double *c, int n, double t) noexcept
+
+
+cdef int quadratic_bernstein_roots(
+    double c0, double c1, double c2, double *ts
+) noexcept
+
+
+cdef int bezier_crossings(const double *c, int n, double *ts) noexcept
+
+
+cdef class _HalfPlaneClipper:
+
+    cdef SkPathBuilder result
+    cdef int axis
+    cdef double value
+    cdef double sign
+    cdef SkPoint start
+    cdef SkPoint current
+    cdef SkPoint pending
+    cdef bint has_pending
+    cdef bint pending_on_edge
+
+    cdef int clip(
+        self, const SkPathBuilder& contour, int axis, double value, double sign
+    ) except -1
+
+    cdef double side(self, const SkPoint& p)
+
+    cdef SkPoint project(self, const SkPoint& p)
+
+    cdef SkPoint snap(self, const SkPoint& p)
+
+    cdef int clip_segment(self, const SkPoint *pts, int n) except -1
+
+    cdef int add_piece(self, const SkPoint *pts, int n) except -1
+
+    cdef int add_line(self, const SkPoint& pt, bint on_edge) except -1
+
+    cdef int flush(self) except -1
+
+
+cdef int clip_path_to_rect(
+    const SkPathBuilder& path,
+    SkPathBuilder& result,
+    double left,
+    double top,
+    double right,
+    double bottom,
+) except -1
+
+
+cdef int clip_contour_to_rect(
+    SkPathBuilder& contour,
+    SkPathBuilder& result,
+    _HalfPlaneClipper clipper,
+    double left,
+    double top,
+    double right,
+    double bottom,
+) except -1
+
+
+cdef bint contour_enters_rect(
+    const SkPathBuilder& contour,
+    double left,
+    double top,
+    double right,
+    double bottom,
+) except -1
+
+
+cdef struct _HitTestEdge:
+    # a piece of a segment, between parameters t0 and t1, monotonic in y
+    double x[4]
+    double y[4]
+    double weight
+    int n
+    double t0
+    double t1
+    double left
+    double top
+    double right
+    double bottom
+    int winding
+
+
+cdef class _HitTester:
+
+    cdef _HitTestEdge *edges
+    cdef Py_ssize_t count
+    cdef Py_ssize_t *band_offsets
+    cdef Py_ssize_t *band_edges
+    cdef int num_bands
+    cdef double top
+    cdef double bottom
+    cdef double band_height
+    cdef bint even_odd
+    cdef bint inverse
+
+    @staticmethod
+    cdef _HitTester create(const SkPathBuilder& path)
+
+    cdef int add_segment(self, const SkPoint *pts, int n, double weight) except -1
+
+    cdef int build_bands(self) except -1
+
+    cdef int band_index(self, double y) noexcept
+
+    cdef int contains(self, double x, double y) noexcept
+
+
+cdef void eval_edge(
+    const _HitTestEdge *edge, double t, double *x, double *y
+) noexcept
+
+
+cdef struct _Segment:
+    # interleaved x, y coordinates of n points
+    double pts[8]
+    int n
+    # index of the segment's verb, and of its contour
+    Py_ssize_t index
+    Py_ssize_t contour
+    # whether this is the first segment of its contour
+    bint first
+    # xMin, yMin, xMax, yMax of the control points
+    double bounds[4]
+
+
+cdef class _SegmentList:
+
+    cdef _Segment *items
+    cdef Py_ssize_t count
+
+    @staticmethod
+    cdef _SegmentList create(const SkPathBuilder& path)
+
+    cdef int add(
+        self,
+        const SkPoint *pts,
+        int n,
+        Py_ssize_t index,
+        Py_ssize_t contour,
+        bint first,
+    ) except -1
+
+
+cdef void control_bounds(const double *pts, int n, double *bounds) noexcept
+
+
+cdef bint bounds_overlap(
+    const double *a, const double *b, double tolerance
+) noexcept
+
+
+cdef bint is_flat(const double *pts, int n, double tolerance) noexcept
+
+
+cdef void split_bezier_half(
+    const double *src, int n, double *left, double *right
+) noexcept
+
+
+cdef int intersect_segments(
+    const _Segment *a,
+    const _Segment *b,
+    double tolerance,
+    bint same_path,
+    list result,
+) except -1
+
+
+cdef int intersect_pieces(
+    const double *p,
+    int n,
+    double t0,
+    double t1,
+    const double *q,
+    int m,
+    double u0,
+    double u1,
+    double tolerance,
+    int depth,
+    list hits,
+) except -1
+
+
+cdef bint is_polygon(const SkPathBuilder& path) noexcept nogil
+
+
+cdef struct _PolyEdge:
+    double x0, y0, x1, y1
+    # the contribution of the edge to the winding number of each operand
+    int winding[2]
+
+
+cdef struct _EdgeSplit:
+    size_t edge
+    double t
+    double x, y
+
+
+cdef int add_polygon_edge(
+    vector[_PolyEdge]& edges, const SkPoint& p, const SkPoint& q, int operand
+) except -1 nogil
+
+
+cdef int add_polygon_edges(
+    const SkPathBuilder& path, int operand, vector[_PolyEdge]& edges
+) except -1 nogil
+
+
+cdef double edge_param(const _PolyEdge *e, double x, double y) noexcept nogil
+
+
+cdef int add_edge_split(
+    vector[_EdgeSplit]& splits, const _PolyEdge *e, size_t index, double x, double y
+) except -1 nogil
+
+
+cdef int intersect_polygon_edges(
+    const vector[_PolyEdge]& edges, size_t i, size_t j, vector[_EdgeSplit]& splits
+) except -1 nogil
+
+
+cdef int compare_edges_by_left(const void *a, const void *b) noexcept nogil
+
+
+cdef int compare_edge_splits(const void *a, const void *b) noexcept nogil
+
+
+cdef int compare_edges_by_points(const void *a, const void *b) noexcept nogil
+
+
+cdef bint split_polygon_edges(vector[_PolyEdge]& edges) except -1 nogil
+
+
+cdef int merge_polygon_edges(vector[_PolyEdge]& edges) except -1 nogil
+
+
+cdef class _PolygonBoolean:
+
+    cdef vector[_PolyEdge] edges
+    cdef vector[size_t] band_offsets
+    cdef vector[size_t] band_edges
+    cdef size_t num_bands
+    cdef double top
+    cdef double band_height
+    cdef int num_operands
+    cdef SkPathFillType fill_types[2]
+    cdef SkPathOp operator
+
+    cdef bint build(
+        self, const SkPathBuilder& one, const SkPathBuilder* two, SkPathOp operator
+    ) except -1 nogil
+
+    cdef int build_bands(self) except -1 nogil
+
+    cdef size_t band_index(self, double y) noexcept nogil
+
+    cdef void winding_at(
+        self, size_t skip, double x, double y, bint below, int *winding
+    ) noexcept nogil
+
+    cdef bint inside(self, const int *winding) noexcept nogil
+
+    cdef int resolve(self, SkPathBuilder& result) except -1 nogil
+
+
+cdef bint fill_contains(SkPathFillType fill_type, int winding) noexcept nogil
+
+
+cdef size_t next_polygon_edge(const vector[_PolyEdge]& edges, size_t i) noexcept nogil
+
+
+cdef bint is_straight(
+    const SkPoint& p1, const SkPoint& p2, const SkPoint& p3
+) noexcept nogil
+
+
+cdef int add_polygon_contour(vector[SkPoint]& pts, SkPathBuilder& result) except -1 nogil
+
+
+cdef int join_polygon_edges(
+    vector[_PolyEdge]& edges, SkPathBuilder& result
+) except -1 nogil
+
+
+cdef bint polygon_boolean(
+    const SkPathBuilder& one,
+    const SkPathBuilder* two,
+    SkPathOp operator,
+    SkPathBuilder& result,
+) except -1
+
+
+cdef int set_stroke_paint(
+    SkPaint *paint,
+    SkScalar width,
+    LineCap cap,
+    LineJoin join,
+    SkScalar miter_limit,
+    object dash_array,
+    SkScalar dash_offset,
+) except -1
+
+
+cdef int close_contours(const SkPathBuilder& path, SkPathBuilder& result) except -1
+
+
 cdef int pts_in_verb(SkPathVerb v) except -1
 
 
@@ -281,12 +735,30 @@ cdef int path_is_inside(const SkPathBuilder& self, const SkPathBuilder& other) e
 cpdef int restore_starting_points(Path path, list points) except -1
 
 
+cdef int append_first_points(
+    const SkPathBuilder& path, vector[SkPoint]& points
+) except -1
+
+
+cdef int restore_first_points(Path path, vector[SkPoint]& points) except -1
+
+
 cpdef bint winding_from_even_odd(Path path, bint clockwise=*) except False
 
 
 cdef list _decompose_quadratic_segment(tuple points)
 
 
+cdef int add_truetype_contour(
+    SkPathBuilder& path, const SkPoint *pts, const uint8_t *on_curve, int n
+) except -1
+
+
+cdef int end_truetype_contour(
+    list coords, bytearray flags, list end_pts, Py_ssize_t start
+) except -1
+
+
 cdef int find_oncurve_point(
     SkScalar x,
     SkScalar y,
@@ -310,6 +782,53 @@ cdef int compute_conic_to_quad_pow2(
 ) except -1
 
 
+cdef SkPath operand_snapshot(Path path, bint cleanup) except *
+
+
+cdef int convert_cubics_to_quads(
+    list paths, const double *max_errors, bint all_quadratic
+) except -1
+
+
+cdef double dot(double complex a, double complex b) noexcept
+
+
+cdef double complex cubic_approx_control(
+    double t,
+    double complex p0,
+    double complex p1,
+    double complex p2,
+    double complex p3,
+) noexcept
+
+
+cdef bint calc_intersect(
+    double complex a,
+    double complex b,
+    double complex c,
+    double complex d,
+    double complex *result,
+) noexcept
+
+
+cdef bint cubic_farthest_fit_inside(
+    double complex p0,
+    double complex p1,
+    double complex p2,
+    double complex p3,
+    double tolerance,
+) noexcept
+
+
+cdef int cubic_approx_spline(
+    const double complex *cubic,
+    int n,
+    double tolerance,
+    bint all_quadratic,
+    double complex *spline,
+) noexcept
+
+
 cpdef Path op(
     Path one,
     Path two,
@@ -317,6 +836,9 @@ cpdef Path op(
     bint fix_winding=*,
     bint keep_starting_points=*,
     bint clockwise=*,
+    SkScalar round_to=*,
+    bint cleanup=*,
+    bint polygon_engine=*,
 )
 
 
@@ -325,6 +847,22 @@ cpdef Path simplify(
     bint fix_winding=*,
     bint keep_starting_points=*,
     bint clockwise=*,
+    SkScalar round_to=*,
+    bint cleanup=*,
+    bint polygon_engine=*,
+)
+
+
+cpdef Path outline_stroke(
+    Path path,
+    SkScalar width,
+    LineCap cap,
+    LineJoin join,
+    SkScalar miter_limit,
+    object dash_array=*,
+    SkScalar dash_offset=*,
+    bint fix_winding=*,
+    bint clockwise=*,
 )
 
 
@@ -333,9 +871,13 @@ cdef class OpBuilder:
     cdef SkOpBuilder builder
     cdef bint fix_winding
     cdef bint keep_starting_points
-    cdef list first_points
+    cdef vector[SkPoint] first_points
+    cdef Py_ssize_t num_operands
     cdef bint clockwise
+    cdef SkScalar round_to
 
     cpdef add(self, Path path, SkPathOp operator)
 
+    cdef int add_group(self, SkPathBuilder& group, SkPathOp operator) except -1
+
     cpdef Path resolve(self)
@@ -20,6 +20,9 @@ from ._skia.core cimport (
     SkPathEffect,
     SkDashPathEffect,
     FillPathWithPaint,
+    SkParsePath,
+    SkPathMeasure,
+    SkString,
 )
 from libcpp.optional cimport optional
 from ._skia.pathops cimport (
@@ -34,10 +37,12 @@ from ._skia.pathops cimport (
     kXOR_SkPathOp,
     kReverseDifference_SkPathOp,
 )
-from libc.stdint cimport uint8_t, int32_t, uint32_t
-from libc.math cimport fabs, sqrt, isfinite
+from libc.stdint cimport uint8_t, int32_t, uint32_t, uint64_t
+from libc.math cimport M_PI, atan2, fabs, floor, fmax, fmin, sqrt, isfinite
+from libc.stdlib cimport qsort
 from libc.stddef cimport size_t
-from libc.string cimport memset
+from libc.string cimport memcpy, memset
+from libcpp.vector cimport vector
 cimport cython
 
 # Explicit declarations for Limited API / Stable ABI compatibility
@@ -45,6 +50,115 @@ cdef extern from "Python.h":
     void* PyMem_Malloc(size_t)
     void* PyMem_Realloc(void*, size_t)
     void  PyMem_Free(void*)
+
+# Per-thread pool of scratch builders and buffers for the temporaries used in
+# hot loops. Calling get() on a ScratchBuilder or ScratchBuffer local borrows
+# one from the pool, which is given back when the function returns (also on
+# error), so nested calls get distinct objects. reset() keeps the storage
+# allocated, so once the pool is warm the temporaries don't allocate; the ones
+# that grew larger than MAX_SCRATCH_SIZE are freed when they are given back.
+cdef extern from *:
+    """
+    #include <memory>
+    #include <vector>
+
+    namespace pathops {
+
+    static const size_t MAX_SCRATCH_SIZE = 1 << 16;
+
+    struct ScratchPool {
+        std::vector<std::unique_ptr<SkPathBuilder>> builders;
+        std::vector<std::unique_ptr<std::vector<char>>> buffers;
+        size_t builders_used = 0;
+        size_t buffers_used = 0;
+        size_t acquired = 0;
+        size_t allocated = 0;
+    };
+
+    static thread_local ScratchPool scratch_pool;
+
+    class ScratchBuilder {
+      public:
+        ScratchBuilder() : fBuilder(nullptr) {}
+        ~ScratchBuilder() {
+            if (fBuilder == nullptr) {
+                return;
+            }
+            scratch_pool.builders_used--;
+            if (fBuilder->countPoints() > (int)MAX_SCRATCH_SIZE) {
+                *fBuilder = SkPathBuilder();
+            }
+        }
+        ScratchBuilder(const ScratchBuilder&) = delete;
+        ScratchBuilder &operator=(const ScratchBuilder&) = delete;
+        SkPathBuilder *get() {
+            if (fBuilder != nullptr) {
+                return fBuilder;
+            }
+            ScratchPool &pool = scratch_pool;
+            if (pool.builders_used == pool.builders.size()) {
+                pool.builders.push_back(std::make_unique<SkPathBuilder>());
+                pool.allocated++;
+            }
+            pool.acquired++;
+            fBuilder = pool.builders[pool.builders_used++].get();
+            fBuilder->reset();
+            return fBuilder;
+        }
+
+      private:
+        SkPathBuilder *fBuilder;
+    };
+
+    class ScratchBuffer {
+      public:
+        ScratchBuffer() : fBuffer(nullptr) {}
+        ~ScratchBuffer() {
+            if (fBuffer == nullptr) {
+                return;
+            }
+            scratch_pool.buffers_used--;
+            if (fBuffer->size() > MAX_SCRATCH_SIZE) {
+                std::vector<char>().swap(*fBuffer);
+            }
+        }
+        ScratchBuffer(const ScratchBuffer&) = delete;
+        ScratchBuffer &operator=(const ScratchBuffer&) = delete;
+        // the size must be the same every time it's called
+        void *get(size_t size) {
+            if (fBuffer != nullptr) {
+                return fBuffer->data();
+            }
+            ScratchPool &pool = scratch_pool;
+            if (pool.buffers_used == pool.buffers.size()) {
+                pool.buffers.push_back(std::make_unique<std::vector<char>>());
+            }
+            fBuffer = pool.buffers[pool.buffers_used++].get();
+            if (fBuffer->size() < size || fBuffer->empty()) {
+                fBuffer->resize(size > 0 ? size : 1);
+                pool.allocated++;
+            }
+            pool.acquired++;
+            return fBuffer->data();
+        }
+
+      private:
+        std::vector<char> *fBuffer;
+    };
+
+    }  // namespace pathops
+    """
+    cdef cppclass ScratchBuilder "pathops::ScratchBuilder":
+        ScratchBuilder()
+        SkPathBuilder *get() except +MemoryError
+
+    cdef cppclass ScratchBuffer "pathops::ScratchBuffer":
+        ScratchBuffer()
+        void *get(size_t size) except +MemoryError
+
+    size_t scratch_acquired "pathops::scratch_pool.acquired"
+    size_t scratch_allocated "pathops::scratch_pool.allocated"
+
 import itertools
 import sys
 
@@ -65,6 +179,14 @@ else:
     from itertools import pairwise
 
 
+def _scratch_stats():
+    """Return the number of scratch objects borrowed from the current thread's
+    pool, and how many of those had to allocate memory, since the thread
+    started.
+    """
+    return scratch_acquired, scratch_allocated
+
+
 # Standard Python exception classes (not cdef classes) for Limited API compatibility
 class PathOpsError(Exception):
     pass
@@ -82,6 +204,10 @@ class NumberOfPointsError(PathOpsError):
     pass
 
 
+class IncompatiblePathsError(PathOpsError):
+    pass
+
+
 # Helpers to convert to/from a float and its bit pattern
 
 cdef inline int32_t _float2bits(float x):
@@ -128,8 +254,14 @@ cdef inline bint can_normalize(SkScalar dx, SkScalar dy):
     return (dx*dx + dy*dy) > SCALAR_NEARLY_ZERO_SQD
 
 
-cdef inline bint points_almost_equal(const SkPoint& p1, const SkPoint& p2):
-    return not can_normalize(p1.x() - p2.x(), p1.y() - p2.y())
+cdef inline bint points_almost_equal(
+    const SkPoint& p1, const SkPoint& p2, SkScalar tolerance=SK_ScalarNearlyZero
+):
+    if tolerance == SK_ScalarNearlyZero:
+        return not can_normalize(p1.x() - p2.x(), p1.y() - p2.y())
+    cdef SkScalar dx = p1.x() - p2.x()
+    cdef SkScalar dy = p1.y() - p2.y()
+    return dx * dx + dy * dy <= tolerance * tolerance
 
 
 cdef inline bint is_middle_point(
@@ -141,14 +273,18 @@ cdef inline bint is_middle_point(
 
 
 cdef inline bint collinear(
-    const SkPoint& p1, const SkPoint& p2, const SkPoint& p3
+    const SkPoint& p1,
+    const SkPoint& p2,
+    const SkPoint& p3,
+    SkScalar tolerance=SK_ScalarNearlyZero,
 ):
-    # the area of a triangle is zero iff the three vertices are collinear
+    # the area of a triangle is zero iff the three vertices are collinear;
+    # 'tolerance' is the largest area that is still considered zero
     return fabs(
         p1.x() * (p2.y() - p3.y()) +
         p2.x() * (p3.y() - p1.y()) +
         p3.x() * (p1.y() - p2.y())
-    ) <= 2 * SK_ScalarNearlyZero
+    ) <= 2 * tolerance
 
 
 def _format_hex_coords(floats):
@@ -176,10 +312,14 @@ cdef class Path:
 
     def __init__(self, other=None, fillType=None):
         cdef Path static_path
+        cdef FrozenPath frozen_path
         if other is not None:
             if isinstance(other, Path):
                 static_path = other
                 self.path = static_path.path
+            elif isinstance(other, FrozenPath):
+                frozen_path = other
+                self.path = frozen_path.path
             else:
                 other.draw(self.getPen())
         if fillType is not None:
@@ -191,13 +331,210 @@ cdef class Path:
         self.path = path
         return self
 
+    cdef SkPath snapshot(self):
+        # Return an immutable SkPath copy of the path. This is cached until the
+        # path is modified, so that using the same operand in many operations
+        # only pays for the copy once (copies of an SkPath share its data).
+        # The lock makes it safe to use the same Path in several threads at
+        # once, as long as none of them modifies it.
+        with cython.critical_section(self):
+            if not self.snapshot_cache.has_value():
+                self.snapshot_cache = self.path.snapshot()
+            return self.snapshot_cache.value()
+
+    cdef void invalidate(self) noexcept:
+        # must be called whenever self.path is modified
+        self.snapshot_cache.reset()
+        self.bounds_cache.reset()
+        self.control_bounds_cache.reset()
+        self.area_cache.reset()
+        self.convex_cache.reset()
+        self.hit_tester = None
+
+    # The derived values below are cached until the path is modified, like
+    # the snapshot.
+
+    cdef optional[SkRect] tight_bounds(self):
+        with cython.critical_section(self):
+            if not self.bounds_cache.has_value():
+                self.bounds_cache = self.path.computeTightBounds()
+            return self.bounds_cache.value()
+
+    cdef optional[SkRect] finite_bounds(self):
+        with cython.critical_section(self):
+            if not self.control_bounds_cache.has_value():
+                self.control_bounds_cache = self.path.computeFiniteBounds()
+            return self.control_bounds_cache.value()
+
+    cdef double signed_area(self) except? -1234567:
+        with cython.critical_section(self):
+            if not self.area_cache.has_value():
+                self.area_cache = get_path_area(self.path)
+            return self.area_cache.value()
+
     cpdef PathPen getPen(self, object glyphSet=None, bint allow_open_paths=True):
         return PathPen(self, glyphSet=glyphSet, allow_open_paths=allow_open_paths)
 
+    @staticmethod
+    def from_svg(str d, fillType=None):
+        """Return a new Path parsed from an SVG path data string.
+
+        Elliptical arc commands are converted to conic segments, same as
+        with arcTo(); use convertConicsToQuads() to get rid of them.
+
+        >>> path = Path.from_svg("M0 0L10 0 10 10z")
+        >>> path.to_svg()
+        'M0 0L10 0L10 10Z'
+        """
+        cdef bytes data = d.encode("utf-8")
+        cdef optional[SkPath] parsed = SkParsePath.FromSVGString(data)
+        if not parsed.has_value():
+            raise ValueError("invalid SVG path data: %r" % d)
+        cdef Path self = Path.__new__(Path)
+        self.path = parsed.value()
+        if fillType is not None:
+            self.fillType = fillType
+        return self
+
+    def to_svg(self, bint relative=False):
+        """Return the path as an SVG path data string.
+
+        If 'relative' is True, use relative coordinates for all commands.
+        """
+        cdef SkParsePath.PathEncoding encoding = (
+            SkParsePath.PathEncoding.kRelative
+            if relative
+            else SkParsePath.PathEncoding.kAbsolute
+        )
+        cdef SkString svg = SkParsePath.ToSVGString(self.snapshot(), encoding)
+        return (<bytes>svg.c_str()).decode("ascii")
+
+    @staticmethod
+    def from_truetype(coords, end_pts, flags, fillType=None):
+        """Return a new Path from TrueType 'glyf' outline data.
+
+        'coords' is a sequence of (x, y) points (e.g. GlyphCoordinates),
+        'end_pts' the index of the last point of each contour and 'flags'
+        a sequence of point flags, where bit 0 is set for on-curve points.
+        Implied on-curve points are inserted half-way between consecutive
+        off-curve points, including contours without any on-curve point.
+        All contours are closed.
+        """
+        cdef Py_ssize_t n = len(coords)
+        if len(flags) != n:
+            raise ValueError(
+                "expected %d flags, found %d" % (n, len(flags))
+            )
+
+        cdef Path self = Path.__new__(Path)
+        if fillType is not None:
+            self.fillType = fillType
+        if n == 0:
+            return self
+
+        cdef SkPoint *pts = <SkPoint *> PyMem_Malloc(n * sizeof(SkPoint))
+        cdef uint8_t *on_curve = <uint8_t *> PyMem_Malloc(n * sizeof(uint8_t))
+        if not pts or not on_curve:
+            PyMem_Free(pts)
+            PyMem_Free(on_curve)
+            raise MemoryError()
+
+        cdef Py_ssize_t i, end, start = 0
+        try:
+            for i in range(n):
+                pts[i] = sk_point(coords[i])
+                on_curve[i] = flags[i] & 1
+            for end in end_pts:
+                if end < start - 1 or end >= n:
+                    raise ValueError("invalid contour end point index: %d" % end)
+                add_truetype_contour(
+                    self.path, pts + start, on_curve + start, end - start + 1
+                )
+                start = end + 1
+            if start != n:
+                raise ValueError(
+                    "%d points do not belong to any contour" % (n - start)
+                )
+        finally:
+            PyMem_Free(pts)
+            PyMem_Free(on_curve)
+
+        return self
+
+    def to_truetype(self):
+        """Return a (coords, end_pts, flags) tuple of TrueType 'glyf' data.
+
+        'coords' is a list of (x, y) tuples, 'end_pts' a list with the index
+        of the last point of each contour, and 'flags' a bytearray with the
+        on-curve bit set for on-curve points. On-curve points which lie
+        half-way between two off-curve points are omitted, as well as the
+        closing point of a contour that overlaps its first point.
+        Open contours are treated as closed. Raises UnsupportedVerbError if
+        the path contains cubic or conic segments.
+        """
+        cdef list coords = []
+        cdef list end_pts = []
+        cdef bytearray flags = bytearray()
+
+        cdef SkSpan[const SkPathVerb] verbs = self.path.verbs()
+        cdef const SkPoint *pts = self.path.points().data()
+        cdef size_t vi, nverbs = verbs.size()
+        cdef SkPathVerb v
+        cdef SkPoint start_pt
+        cdef bint ends_contour
+        cdef Py_ssize_t contour_start = -1
+
+        for vi in range(nverbs):
+            v = verbs[vi]
+            ends_contour = (
+                vi + 1 == nverbs
+                or verbs[vi + 1] == SkPathVerb.kClose
+                or verbs[vi + 1] == SkPathVerb.kMove
+            )
+            if v == SkPathVerb.kMove:
+                if contour_start >= 0:
+                    end_truetype_contour(coords, flags, end_pts, contour_start)
+                contour_start = len(coords)
+                start_pt = pts[0]
+                coords.append((pts[0].x(), pts[0].y()))
+                flags.append(1)
+                pts += 1
+            elif v == SkPathVerb.kLine:
+                if not (ends_contour and points_almost_equal(pts[0], start_pt)):
+                    coords.append((pts[0].x(), pts[0].y()))
+                    flags.append(1)
+                pts += 1
+            elif v == SkPathVerb.kQuad:
+                coords.append((pts[0].x(), pts[0].y()))
+                flags.append(0)
+                if ends_contour:
+                    if not points_almost_equal(pts[1], start_pt):
+                        coords.append((pts[1].x(), pts[1].y()))
+                        flags.append(1)
+                elif not (
+                    verbs[vi + 1] == SkPathVerb.kQuad
+                    and is_middle_point(pts[0], pts[1], pts[2])
+                ):
+                    coords.append((pts[1].x(), pts[1].y()))
+                    flags.append(1)
+                pts += 2
+            elif v == SkPathVerb.kClose:
+                if contour_start >= 0:
+                    end_truetype_contour(coords, flags, end_pts, contour_start)
+                    contour_start = -1
+            else:
+                raise UnsupportedVerbError(PathVerb(v).name)
+
+        if contour_start >= 0:
+            end_truetype_contour(coords, flags, end_pts, contour_start)
+
+        return coords, end_pts, flags
+
     def __iter__(self):
         return RawPathIterator(self)
 
     def add(self, PathVerb verb, *pts):
+        self.invalidate()
         if verb is PathVerb.MOVE:
             self.path.moveTo(pts[0][0], pts[0][1])
         elif verb is PathVerb.LINE:
@@ -217,10 +554,48 @@ cdef class Path:
         else:
             raise UnsupportedVerbError(verb)
 
+    def extend(self, records):
+        """Append the (verb, points) records from an iterable, like the ones
+        yielded when iterating over a Path; same as calling add(verb, *points)
+        for each record, but faster.
+
+        If a record is invalid, the ones before it are still appended.
+        """
+        cdef uint8_t verb
+        self.invalidate()
+        for v, pts in records:
+            verb = v
+            if verb == <uint8_t>SkPathVerb.kMove:
+                self.path.moveTo(sk_point(pts[0]))
+            elif verb == <uint8_t>SkPathVerb.kLine:
+                self.path.lineTo(sk_point(pts[0]))
+            elif verb == <uint8_t>SkPathVerb.kQuad:
+                self.path.quadTo(sk_point(pts[0]), sk_point(pts[1]))
+            elif verb == <uint8_t>SkPathVerb.kConic:
+                self.path.conicTo(sk_point(pts[0]), sk_point(pts[1]), pts[2])
+            elif verb == <uint8_t>SkPathVerb.kCubic:
+                self.path.cubicTo(
+                    sk_point(pts[0]), sk_point(pts[1]), sk_point(pts[2])
+                )
+            elif verb == <uint8_t>SkPathVerb.kClose:
+                self.path.close()
+            else:
+                raise UnsupportedVerbError(v)
+
+    cpdef void reserve(self, int n_verbs, int n_points):
+        """Make room for the given number of additional verbs and points, so
+        that adding them doesn't need to grow the path's storage again.
+        """
+        if n_verbs < 0 or n_points < 0:
+            raise ValueError("n_verbs and n_points must be non-negative")
+        self.path.incReserve(n_points, n_verbs)
+
     cpdef void moveTo(self, SkScalar x, SkScalar y):
+        self.invalidate()
         self.path.moveTo(x, y)
 
     cpdef void lineTo(self, SkScalar x, SkScalar y):
+        self.invalidate()
         self.path.lineTo(x, y)
 
     cpdef void quadTo(
@@ -230,6 +605,7 @@ cdef class Path:
         SkScalar x2,
         SkScalar y2
     ):
+        self.invalidate()
         self.path.quadTo(x1, y1, x2, y2)
 
     cpdef void conicTo(
@@ -240,6 +616,7 @@ cdef class Path:
         SkScalar y2,
         SkScalar w
     ):
+        self.invalidate()
         self.path.conicTo(x1, y2, x2, y2, w)
 
     cpdef void cubicTo(
@@ -251,6 +628,7 @@ cdef class Path:
         SkScalar x3,
         SkScalar y3,
     ):
+        self.invalidate()
         self.path.cubicTo(x1, y1, x2, y2, x3, y3)
 
     cpdef void arcTo(
@@ -263,6 +641,7 @@ cdef class Path:
         SkScalar x,
         SkScalar y,
     ):
+        self.invalidate()
         self.path.arcTo(
             SkPoint.Make(rx, ry),
             xAxisRotate,
@@ -273,13 +652,16 @@ cdef class Path:
 
 
     cpdef void close(self):
+        self.invalidate()
         self.path.close()
 
     cpdef void reset(self):
+        self.invalidate()
         self.path.reset()
 
     cpdef void rewind(self):
         """Deprecated alias for reset(). Use reset() instead."""
+        self.invalidate()
         self.path.reset()
 
     cpdef draw(self, pen):
@@ -342,8 +724,28 @@ cdef class Path:
 
     __hash__ = None  # Path is a mutable object, let's make it unhashable
 
+    def freeze(self):
+        """Return an immutable, hashable FrozenPath copy of this path."""
+        return FrozenPath.create(self.snapshot())
+
+    @property
+    def nbytes(self):
+        """Approximate number of bytes used by the path.
+
+        This counts the path's points, verbs and conic weights, but not the
+        spare capacity the underlying SkPathBuilder may have reserved for
+        them; use freeze() to get an exactly-sized copy.
+        """
+        return (
+            sizeof(SkPathBuilder)
+            + self.path.points().size() * sizeof(SkPoint)
+            + self.path.verbs().size() * sizeof(SkPathVerb)
+            + self.path.conicWeights().size() * sizeof(SkScalar)
+        )
+
     cpdef addPath(self, Path path):
-        self.path.addPath(path.path.snapshot())
+        self.invalidate()
+        self.path.addPath(path.snapshot())
 
     @property
     def fillType(self):
@@ -352,38 +754,161 @@ cdef class Path:
     @fillType.setter
     def fillType(self, value):
         cdef uint32_t fill = int(FillType(value))
+        self.invalidate()
         self.path.setFillType(<SkPathFillType>fill)
 
     @property
     def isConvex(self):
-        return self.path.snapshot().isConvex()
+        cdef SkPath skpath = self.snapshot()
+        with cython.critical_section(self):
+            if not self.convex_cache.has_value():
+                self.convex_cache = skpath.isConvex()
+            return self.convex_cache.value()
 
     def contains(self, tuple pt):
         return self.path.contains(SkPoint.Make(pt[0], pt[1]))
 
+    def contains_many(self, points):
+        """Return a list of booleans telling whether each of the (x, y) points
+        is contained in the path, like contains().
+
+        'points' can be any iterable of (x, y) pairs, e.g. a list of tuples or
+        a NumPy array of shape (N, 2). The path's edges are split into
+        monotonic pieces and bucketed in horizontal bands the first time this
+        is called; that structure is reused until the path is modified.
+        """
+        cdef list result = []
+        cdef SkScalar x, y
+        cdef int inside
+        cdef _HitTester hit_tester
+        with cython.critical_section(self):
+            if self.hit_tester is None:
+                self.hit_tester = _HitTester.create(self.path)
+            hit_tester = self.hit_tester
+        for pt in points:
+            x, y = pt
+            inside = hit_tester.contains(x, y)
+            if inside < 0:
+                # on (or very close to) an edge, let Skia decide
+                inside = self.path.contains(SkPoint.Make(x, y))
+            result.append(inside == 1)
+        return result
+
+    def length(self):
+        """Return the total length of the path's contours.
+
+        Open contours don't include the closing segment.
+        """
+        cdef SkPath skpath = self.snapshot()
+        cdef SkPathMeasure *measure = new SkPathMeasure(skpath, False, 1)
+        cdef double total = 0
+        try:
+            while True:
+                total += measure.getLength()
+                if not measure.nextContour():
+                    break
+        finally:
+            del measure
+        return total
+
+    def sample(self, distances):
+        """Return the points and unit tangent vectors at the given distances
+        along the path, as two lists of (x, y) tuples.
+
+        The distances run across all the contours, one after the other, as
+        returned by length(); they are clamped between 0 and the total length.
+        Raise ValueError if the path has zero length.
+        """
+        cdef list values = list(distances)
+        cdef Py_ssize_t n = len(values)
+        cdef list positions = [None] * n
+        cdef list tangents = [None] * n
+        cdef list lengths = []
+        cdef SkPath skpath = self.snapshot()
+        cdef SkPathMeasure *measure = new SkPathMeasure(skpath, False, 1)
+        cdef SkPoint position, tangent
+        cdef Py_ssize_t i, contour = 0
+        cdef double offset = 0, distance
+        try:
+            # first collect the lengths of the contours, since SkPathMeasure
+            # can't tell whether there's another contour without moving to it
+            while True:
+                if measure.getLength() > 0:
+                    lengths.append(measure.getLength())
+                if not measure.nextContour():
+                    break
+        finally:
+            del measure
+        if not lengths:
+            raise ValueError("can't sample a path with zero length")
+
+        # then visit the distances in increasing order, moving forward
+        # through the contours
+        measure = new SkPathMeasure(skpath, False, 1)
+        try:
+            for i in sorted(range(n), key=values.__getitem__):
+                distance = values[i]
+                while (
+                    contour < len(lengths) - 1
+                    and distance > offset + <double>lengths[contour]
+                ):
+                    offset += <double>lengths[contour]
+                    contour += 1
+                    measure.nextContour()
+                measure.getPosTan(distance - offset, &position, &tangent)
+                positions[i] = (position.x(), position.y())
+                tangents[i] = (tangent.x(), tangent.y())
+        finally:
+            del measure
+        return positions, tangents
+
+    def segment(self, SkScalar start, SkScalar stop):
+        """Return a new Path with the part of this path between the 'start'
+        and 'stop' distances along it, measured like in sample().
+
+        Closed contours that lie entirely within the range are kept closed.
+        The result is empty if 'stop' is not greater than 'start'.
+        """
+        cdef Path result = Path()
+        cdef SkPath skpath
+        cdef SkPathMeasure *measure
+        cdef double offset = 0, length, s, e
+        result.path.setFillType(self.path.fillType())
+        if stop <= start:
+            return result
+        skpath = self.snapshot()
+        measure = new SkPathMeasure(skpath, False, 1)
+        try:
+            while offset < stop:
+                length = measure.getLength()
+                if length > 0 and start < offset + length:
+                    s = max(start - offset, 0)
+                    e = min(stop - offset, length)
+                    measure.getSegment(s, e, &result.path, True)
+                    if s == 0 and e == length and measure.isClosed():
+                        result.path.close()
+                offset += length
+                if not measure.nextContour():
+                    break
+        finally:
+            del measure
+        return result
+
     @property
     def bounds(self):
-        cdef optional[SkRect] bounds = self.path.computeTightBounds()
-        if not bounds.has_value():
-            return None
-        cdef SkRect r = bounds.value()
-        return (r.left(), r.top(), r.right(), r.bottom())
+        return rect_to_tuple(self.tight_bounds())
 
     @property
     def controlPointBounds(self):
-        cdef optional[SkRect] bounds = self.path.computeFiniteBounds()
-        if not bounds.has_value():
-            return None
-        cdef SkRect r = bounds.value()
-        return (r.left(), r.top(), r.right(), r.bottom())
+        return rect_to_tuple(self.finite_bounds())
 
     @property
     def area(self):
-        return fabs(get_path_area(self.path))
+        return fabs(self.signed_area())
 
     @property
     def clockwise(self):
-        return get_path_area(self.path) < 0
+        return self.signed_area() < 0
 
     @clockwise.setter
     def clockwise(self, value):
@@ -397,6 +922,7 @@ cdef class Path:
         for contour in self.contours:
             reverse_contour(contour.path)
             skpath.addPath(contour.path.snapshot())
+        self.invalidate()
         self.path = skpath
 
     cpdef simplify(
@@ -404,40 +930,140 @@ cdef class Path:
         bint fix_winding=True,
         bint keep_starting_points=True,
         bint clockwise=False,
+        SkScalar round_to=0,
+        bint cleanup=False,
+        bint polygon_engine=False,
     ):
         cdef list first_points
+        cdef SkPath skpath
+        cdef optional[SkPath] simplified
+        cdef SkPathBuilder source, polygon
+        cdef bint resolved = False
         if keep_starting_points:
             first_points = self.firstPoints
-        cdef optional[SkPath] simplified = Simplify(self.path.snapshot())
-        if not simplified.has_value():
-            raise PathOpsError("simplify operation did not succeed")
-        self.path = simplified.value()
+        if cleanup:
+            self.cleanup()
+        skpath = self.snapshot()
+        if polygon_engine and is_polygon(self.path):
+            source = skpath
+            resolved = polygon_boolean(source, NULL, kUnion_SkPathOp, polygon)
+        if resolved:
+            self.invalidate()
+            self.path = polygon
+        else:
+            with nogil:
+                simplified = Simplify(skpath)
+            if not simplified.has_value():
+                raise PathOpsError("simplify operation did not succeed")
+            self.invalidate()
+            self.path = simplified.value()
         if fix_winding:
             winding_from_even_odd(self, clockwise)
         if keep_starting_points:
             restore_starting_points(self, first_points)
+        if round_to > 0:
+            self.quantize(round_to)
 
+    cpdef quantize(self, SkScalar grid=1.0):
+        """Round all the coordinates to the nearest multiple of 'grid'.
+
+        Segments that become zero-length after rounding are removed, and so
+        are the points in between collinear line segments, and the contours
+        that are left with fewer than 3 distinct points, which can't enclose
+        any area.
+        """
+        if not grid > 0:
+            raise ValueError("grid must be greater than 0: %r" % grid)
+        self.invalidate()
+        quantize_path(self.path, grid)
+
+    cpdef cleanup(self, SkScalar tolerance=SK_ScalarNearlyZero):
+        """Remove degenerate geometry that doesn't change the filled area.
+
+        Drop the segments whose points are all within 'tolerance' from the
+        previous point, merge consecutive line segments that are collinear
+        within 'tolerance', drop closing lines that duplicate the implied
+        one, and remove the contours that are left without segments.
+
+        With the even-odd fill rule, each pair of duplicated contours (same
+        points in the same order) is dropped too, since they cancel each other
+        out; with the non-zero winding rule they are kept, as removing one
+        would change the winding number.
+        """
+        if not tolerance >= 0:
+            raise ValueError("tolerance must be non-negative: %r" % tolerance)
+        self.invalidate()
+        cleanup_path(self.path, tolerance)
 
     def _has(self, verb):
         return any(my_verb == verb for my_verb, _ in self)
 
+    cpdef Path clip_to_rect(
+        self,
+        SkScalar left,
+        SkScalar top,
+        SkScalar right,
+        SkScalar bottom,
+    ):
+        """Return a new Path with the intersection of this path and a rectangle.
+
+        This is a faster alternative to op() with a rectangular path, for
+        non-inverse fill types. Contours entirely inside the rectangle are kept
+        as they are and those entirely outside are dropped, based on their
+        bounds; only the remaining ones are clipped. Unlike op(), the result is
+        not simplified: overlaps between contours are left as they are, and so
+        are their directions and starting points.
+        """
+        cdef Path rect
+        cdef Path result = Path()
+        result.path.setFillType(self.path.fillType())
+        if not (left < right and top < bottom):
+            return result
+
+        if (
+            self.path.fillType() == SkPathFillType.kInverseWinding
+            or self.path.fillType() == SkPathFillType.kInverseEvenOdd
+        ):
+            rect = Path()
+            rect.moveTo(left, top)
+            rect.lineTo(right, top)
+            rect.lineTo(right, bottom)
+            rect.lineTo(left, bottom)
+            rect.close()
+            return op(
+                self,
+                rect,
+                kIntersect_SkPathOp,
+                fix_winding=False,
+                keep_starting_points=False,
+            )
+
+        clip_path_to_rect(self.path, result.path, left, top, right, bottom)
+        return result
+
+    cpdef cubics_to_quads(self, double max_err=1.0, bint all_quadratic=True):
+        """Approximate all the cubic segments with quadratic splines, within
+        'max_err' distance from the original curves, as with fontTools.cu2qu.
+
+        The splines are stored as consecutive quadratic segments with implied
+        on-curve points, which draw() merges back into a single qCurveTo.
+        If 'all_quadratic' is False, cubics that would need more than one
+        quadratic segment are left as they are.
+        """
+        convert_cubics_to_quads([self], &max_err, all_quadratic)
+
     cpdef convertConicsToQuads(self, float tolerance=0.25):
         # TODO is 0.25 too delicate? - blindly copies from Skias own use
         if not self._has(SkPathVerb.kConic):
             return
 
         cdef max_pow2 = 5
-        cdef count = 1 + 2 * (1<<max_pow2)
-        cdef SkPoint *quad_pts
-        cdef num_quads
-
         # The most points we could possibly need
-        quad_pts = <SkPoint *> PyMem_Malloc(count * sizeof(SkPoint))
-        if not quad_pts:
-            raise MemoryError()
-        cdef SkPoint *quad = quad_pts
+        cdef SkPoint quad_pts[1 + 2 * (1 << 5)]
+        cdef num_quads
 
-        cdef SkPathBuilder temp
+        cdef ScratchBuilder scratch
+        cdef SkPathBuilder *temp = scratch.get()
         cdef SkPathFillType fillType = self.path.fillType()
         temp.setFillType(fillType)
 
@@ -447,60 +1073,57 @@ cdef class Path:
         cdef SkScalar weight
         cdef int pow2
 
-        try:
-            prev = (0., 0.)
-            for verb, pts in self:
-                if verb != SkPathVerb.kConic:
-                    if verb != SkPathVerb.kClose:
-                        prev_verb = verb
-                        prev = pts[-1]
-
-                    # TODO cython got angry when I tried to make this a fn
-                    if verb == SkPathVerb.kMove:
-                        temp.moveTo(pts[0][0], pts[0][1])
-                    elif verb == SkPathVerb.kLine:
-                        temp.lineTo(pts[0][0], pts[0][1])
-                    elif verb == SkPathVerb.kQuad:
-                        temp.quadTo(pts[0][0], pts[0][1],
-                                    pts[1][0], pts[1][1])
-                    elif verb == SkPathVerb.kCubic:
-                        temp.cubicTo(pts[0][0], pts[0][1],
-                                     pts[1][0], pts[1][1],
-                                     pts[2][0], pts[2][1])
-                    elif verb == SkPathVerb.kClose:
-                        temp.close()
-                    else:
-                        raise UnsupportedVerbError(verb)
-
-                    continue
-
-                # Figure out a good value for pow2
-                p0 = SkPoint.Make(prev[0], prev[1])
-                p1 = SkPoint.Make(pts[0][0], pts[0][1])
-                p2 = SkPoint.Make(pts[1][0], pts[1][1])
-                weight = pts[2]
-
-                pow2 = compute_conic_to_quad_pow2(p0, p1, p2, weight, tolerance)
-                assert pow2 <= max_pow2
-                num_quads = ConvertConicToQuads(p0, p1, p2,
-                                                weight, quad_pts,
-                                                pow2)
-
-                # quad_pts[0] is effectively a moveTo that may be a nop
-                if prev != (quad_pts[0].x(), quad_pts[0].y()):
-                    temp.moveTo(quad_pts[0].x(), quad_pts[0].y())
-
-                for i in range(num_quads):
-                    p1 = quad_pts[2 * i + 1]
-                    p2 = quad_pts[2 * i + 2]
-                    temp.quadTo(p1.x(), p1.y(), p2.x(), p2.y())
-
-                prev = pts[-2] # -1 is weight
-
-        finally:
-            PyMem_Free(quad_pts)
-
-        self.path = temp
+        prev = (0., 0.)
+        for verb, pts in self:
+            if verb != SkPathVerb.kConic:
+                if verb != SkPathVerb.kClose:
+                    prev_verb = verb
+                    prev = pts[-1]
+
+                # TODO cython got angry when I tried to make this a fn
+                if verb == SkPathVerb.kMove:
+                    temp.moveTo(pts[0][0], pts[0][1])
+                elif verb == SkPathVerb.kLine:
+                    temp.lineTo(pts[0][0], pts[0][1])
+                elif verb == SkPathVerb.kQuad:
+                    temp.quadTo(pts[0][0], pts[0][1],
+                                pts[1][0], pts[1][1])
+                elif verb == SkPathVerb.kCubic:
+                    temp.cubicTo(pts[0][0], pts[0][1],
+                                 pts[1][0], pts[1][1],
+                                 pts[2][0], pts[2][1])
+                elif verb == SkPathVerb.kClose:
+                    temp.close()
+                else:
+                    raise UnsupportedVerbError(verb)
+
+                continue
+
+            # Figure out a good value for pow2
+            p0 = SkPoint.Make(prev[0], prev[1])
+            p1 = SkPoint.Make(pts[0][0], pts[0][1])
+            p2 = SkPoint.Make(pts[1][0], pts[1][1])
+            weight = pts[2]
+
+            pow2 = compute_conic_to_quad_pow2(p0, p1, p2, weight, tolerance)
+            assert pow2 <= max_pow2
+            num_quads = ConvertConicToQuads(p0, p1, p2,
+                                            weight, quad_pts,
+                                            pow2)
+
+            # quad_pts[0] is effectively a moveTo that may be a nop
+            if prev != (quad_pts[0].x(), quad_pts[0].y()):
+                temp.moveTo(quad_pts[0].x(), quad_pts[0].y())
+
+            for i in range(num_quads):
+                p1 = quad_pts[2 * i + 1]
+                p2 = quad_pts[2 * i + 2]
+                temp.quadTo(p1.x(), p1.y(), p2.x(), p2.y())
+
+            prev = pts[-2] # -1 is weight
+
+        self.invalidate()
+        self.path = temp[0]
 
     cpdef stroke(
         self,
@@ -510,27 +1133,89 @@ cdef class Path:
         SkScalar miter_limit,
         object dash_array=None,
         SkScalar dash_offset=0.0,
+        bint simplify=False,
+        bint fix_winding=True,
+        bint clockwise=False,
     ):
-        cdef _SkScalarArray intervals
-        cdef sk_sp[SkPathEffect] dash
-        cdef SkPaint paint = SkPaint()
+        """Replace the path with the outline of its stroke.
 
-        paint.setStyle(SkPaintStyle.kStroke_Style)
-        paint.setStrokeWidth(width)
-        paint.setStrokeCap(<SkLineCap>cap)
-        paint.setStrokeJoin(<SkLineJoin>join)
-        paint.setStrokeMiter(miter_limit)
-
-        if dash_array:
-            intervals = _SkScalarArray.create(dash_array)
-            if intervals.count % 2 != 0:
-                raise ValueError("Expected an even number of dash_array entries")
-            paint.setPathEffect(
-                SkDashPathEffect.Make(<SkSpan[const SkScalar]>intervals.as_span(), dash_offset)
-            )
+        If 'simplify' is True, the overlaps in the stroke outline are removed
+        straight away, without round-tripping through Python; 'fix_winding'
+        and 'clockwise' then work as in the simplify() method. The starting
+        points are never restored, as the stroker output has none that are
+        meaningful.
+        """
+        cdef SkPaint paint = SkPaint()
+        cdef SkPath stroked
+        cdef optional[SkPath] simplified
 
+        set_stroke_paint(
+            &paint, width, cap, join, miter_limit, dash_array, dash_offset
+        )
+        self.invalidate()
         FillPathWithPaint(self.path.detach(), paint, &self.path)
 
+        if simplify:
+            stroked = self.path.detach()
+            with nogil:
+                simplified = Simplify(stroked)
+            if not simplified.has_value():
+                self.path = stroked
+                raise PathOpsError("simplify operation did not succeed")
+            self.path = simplified.value()
+            if fix_winding:
+                winding_from_even_odd(self, clockwise)
+
+    cpdef Path offset(
+        self,
+        SkScalar distance,
+        LineJoin join=LineJoin.MITER_JOIN,
+        SkScalar miter_limit=4,
+        bint fix_winding=True,
+        bint clockwise=False,
+    ):
+        """Return a new simplified Path with the fill outline grown by
+        'distance', or shrunk if 'distance' is negative.
+
+        The fill is simplified first, so that only its outer boundary is
+        stroked, not the edges of overlapping contours inside it. The
+        outline is then stroked at twice the distance, with the given 'join'
+        and 'miter_limit', and the stroke is added to (or subtracted from)
+        the simplified fill in a single boolean operation. Open contours are
+        treated as closed, as when filling. The starting points are not
+        restored.
+        """
+        cdef SkPathBuilder closed
+        cdef SkPathBuilder stroked
+        cdef SkPaint paint = SkPaint()
+        cdef SkPath source, outline
+        cdef SkPathOp operator
+        cdef optional[SkPath] skresult
+
+        close_contours(self.path, closed)
+        source = closed.detach()
+        with nogil:
+            skresult = Simplify(source)
+        if not skresult.has_value():
+            raise PathOpsError("operation did not succeed")
+        if distance != 0:
+            source = skresult.value()
+            set_stroke_paint(
+                &paint, 2 * fabs(distance), LineCap.BUTT_CAP, join, miter_limit, None, 0
+            )
+            FillPathWithPaint(source, paint, &stroked)
+            outline = stroked.detach()
+            operator = kUnion_SkPathOp if distance > 0 else kDifference_SkPathOp
+            with nogil:
+                skresult = Op(source, outline, operator)
+            if not skresult.has_value():
+                raise PathOpsError("operation did not succeed")
+        cdef Path result = Path()
+        result.path = skresult.value()
+        if fix_winding:
+            winding_from_even_odd(result, clockwise)
+        return result
+
     cdef list getVerbs(self):
         return [PathVerb(verb) for verb in self.path.verbs()]
 
@@ -548,22 +1233,19 @@ cdef class Path:
     cdef int countContours(self) except -1:
         if self.path.isEmpty():
             return 0
-        cdef int n = 0
-        for verb in self.path.verbs():
-            if verb == SkPathVerb.kMove:
-                n += 1
-        return n
+        return count_contours(self.path.verbs())
 
     @property
     def firstPoints(self):
-        cdef SkPoint *p = NULL
-        cdef int count = 0
         cdef list result = []
-        if self.getFirstPoints(&p, &count):
-            for i in range(count):
-                result.append((p[i].x(), p[i].y()))
-            if p is not NULL:
-                PyMem_Free(p)
+        cdef SkSpan[const SkPathVerb] verbs = self.path.verbs()
+        cdef SkSpan[const SkPoint] pts = self.path.points()
+        cdef size_t i
+        cdef size_t j = 0
+        for i in range(verbs.size()):
+            if verbs[i] == SkPathVerb.kMove:
+                result.append((pts[j].x(), pts[j].y()))
+            j += pts_in_verb(verbs[i])
         return result
 
     cdef int getFirstPoints(self, SkPoint **pp, int *count) except -1:
@@ -604,7 +1286,9 @@ cdef class Path:
 
         cdef SkPathVerb verb
         cdef SkSpan[const SkPoint] p
-        cdef optional[SkPathIter] iterator = self.path.iter()
+        # iterate over a snapshot, in case the path is modified meanwhile
+        cdef SkPath skpath = self.snapshot()
+        cdef optional[SkPathIter] iterator = skpath.iter()
         cdef optional[SkPathIter.Rec] rec
 
         while True:
@@ -639,37 +1323,7 @@ cdef class Path:
 
     @property
     def segments(self):
-        # We need to check for TrueType special quadratic closed spline made of
-        # off-curve points only so that we can make the move point implied.
-        # It's easier to do this in here than inside the SegmentPenIterator, as that
-        # yields each segment one by one, whereas we want to sometimes *not* yield a
-        # moveTo in very specific circumstances (i.e. the whole contour is a single
-        # closed quadratic spline where all the on-curve points are midway between
-        # consecutive off-curve points) based on previous and next segments.
-        cdef SkPoint p1, p2, p3
-        result = []
-        it = itertools.chain([None], SegmentPenIterator(self), [None])
-        for previous, current, next_ in triplewise(it):
-            if (
-                previous is not None
-                and previous[0] == "moveTo"
-                and current[0] == "qCurveTo"
-                and next_ is not None
-                and next_[0] == "closePath"
-                and previous[1][0] == current[1][-1]
-            ):
-                qpoints = current[1]
-                last_off, move_pt, first_off = qpoints[-2], qpoints[-1], qpoints[0]
-                p1 = SkPoint.Make(last_off[0], last_off[1])
-                p2 = SkPoint.Make(move_pt[0], move_pt[1])
-                p3 = SkPoint.Make(first_off[0], first_off[1])
-                if is_middle_point(p1, p2, p3):
-                    # drop the moveTo and make the last on-curve None
-                    del result[-1]
-                    result.append((current[0], current[1][:-1] + (None,)))
-                    continue
-            result.append(current)
-        yield from result
+        return _segments(self)
 
     cpdef Path transform(
         self,
@@ -729,102 +1383,618 @@ cdef class Path:
         return result
 
 
-DEF NUM_VERBS = 7
-
-cdef uint8_t *POINTS_IN_VERB = [
-    1,  # MOVE
-    1,  # LINE
-    2,  # QUAD
-    2,  # CONIC
-    3,  # CUBIC
-    0,  # CLOSE
-    0   # DONE
-]
-
-cdef dict VERB_METHODS = {
-    SkPathVerb.kMove: "moveTo",
-    SkPathVerb.kLine: "lineTo",
-    SkPathVerb.kQuad: "quadTo",
-    SkPathVerb.kConic: "conicTo",
-    SkPathVerb.kCubic: "cubicTo",
-    SkPathVerb.kClose: "close",
-}
-
-cdef dict PEN_METHODS = {
-    SkPathVerb.kMove: "moveTo",
-    SkPathVerb.kLine: "lineTo",
-    SkPathVerb.kQuad: "qCurveTo",
-    SkPathVerb.kCubic: "curveTo",
-    SkPathVerb.kClose: "closePath",
-}
-
+cdef class FrozenPath:
+    """Immutable and hashable path.
 
-cdef tuple NO_POINTS = ()
+    The points and verbs are stored in an exactly-sized SkPath, which is
+    shared (not copied) between FrozenPath objects made from one another.
+    Use thaw(), or pass it to the Path constructor, to get a mutable Path.
+    """
 
+    def __init__(self, other=None, fillType=None):
+        cdef Path path
+        if isinstance(other, Path) and fillType is None:
+            path = other
+        else:
+            path = Path(other, fillType=fillType)
+        self.path = path.snapshot()
 
-cdef class RawPathIterator:
+    def __cinit__(self):
+        self._hash = -1
 
-    def __cinit__(self, Path path):
+    @staticmethod
+    cdef FrozenPath create(const SkPath& path):
+        cdef FrozenPath self = FrozenPath.__new__(FrozenPath)
         self.path = path
-        self.iterator = self.path.path.iter()
-
-    def __iter__(self):
         return self
 
-    def __next__(self):
-        cdef tuple pts
-        cdef SkPathVerb verb
-        cdef SkSpan[const SkPoint] p
+    cpdef Path thaw(self):
+        return Path.create(SkPathBuilder(self.path))
 
-        rec = self.iterator.value().next()
-        if not rec.has_value():
-            raise StopIteration()
-        verb = rec.value().fVerb
-        p = rec.value().fPoints
+    def __iter__(self):
+        return RawPathIterator(self)
 
-        if verb == SkPathVerb.kMove:
-            pts = ((p[0].x(), p[0].y()),)
-        elif verb == SkPathVerb.kLine:
-            pts = ((p[1].x(), p[1].y()),)
-        elif verb == SkPathVerb.kQuad:
-            pts = ((p[1].x(), p[1].y()),
-                   (p[2].x(), p[2].y()))
-        elif verb == SkPathVerb.kConic:
-            pts = ((p[1].x(), p[1].y()),
-                   (p[2].x(), p[2].y()),
-                   rec.value().conicWeight())
-        elif verb == SkPathVerb.kCubic:
-            pts = ((p[1].x(), p[1].y()),
-                   (p[2].x(), p[2].y()),
-                   (p[3].x(), p[3].y()))
-        elif verb == SkPathVerb.kClose:
-            pts = NO_POINTS
-        else:
-            raise UnsupportedVerbError(verb)
+    @property
+    def segments(self):
+        return _segments(self)
 
-        return (PathVerb(verb), pts)
+    def draw(self, pen):
+        for method, pts in _segments(self):
+            getattr(pen, method)(*pts)
 
+    def __len__(self):
+        if self.path.isEmpty():
+            return 0
+        return count_contours(self.path.verbs())
 
-cdef tuple END_PATH = ("endPath", NO_POINTS)
-cdef tuple CLOSE_PATH = ("closePath", NO_POINTS)
+    def __repr__(self):
+        return "<pathops.FrozenPath object at %s: %d contours>" % (
+            hex(id(self)), len(self)
+        )
 
+    def __eq__(self, other):
+        cdef FrozenPath static_other
+        if isinstance(other, FrozenPath):
+            static_other = other
+            return self.path == static_other.path
+        elif isinstance(other, Path):
+            return self.path == (<Path>other).snapshot()
+        return NotImplemented
 
-cdef class SegmentPenIterator:
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        # racing threads may both compute the hash, but they store the same value
+        if self._hash == -1:
+            self._hash = self.compute_hash()
+        return self._hash
+
+    cdef Py_hash_t compute_hash(self) except? -1:
+        cdef int n_verbs = self.path.countVerbs()
+        cdef int n_pts = self.path.countPoints()
+        cdef uint8_t *verbs = <uint8_t *> PyMem_Malloc(n_verbs * sizeof(uint8_t) + 1)
+        cdef SkPoint *pts = <SkPoint *> PyMem_Malloc(n_pts * sizeof(SkPoint) + 1)
+        cdef float *coords = <float *> pts
+        cdef int i
+        if not verbs or not pts:
+            PyMem_Free(verbs)
+            PyMem_Free(pts)
+            raise MemoryError()
+        try:
+            self.path.getVerbs(verbs, n_verbs)
+            self.path.getPoints(pts, n_pts)
+            # -0.0 == 0.0 for SkPath::operator==, make them hash the same
+            for i in range(2 * n_pts):
+                coords[i] += 0.0
+            return hash((
+                <uint32_t>self.path.getFillType(),
+                (<char *>verbs)[:n_verbs],
+                (<char *>pts)[:n_pts * sizeof(SkPoint)],
+            ))
+        finally:
+            PyMem_Free(verbs)
+            PyMem_Free(pts)
 
-    def __cinit__(self, Path path):
-        self.path = Path.create(path.path)
-        self.pts = self.path.path.points().begin()
-        self.verbs = self.path.path.verbs().begin() - 1  # TODO: UB
-        self.verb_stop = self.path.path.verbs().end()
-        self.move_pt = SkPoint.Make(.0, .0)
-        self.closed = True
+    def __copy__(self):
+        return self
 
-    def __iter__(self):
+    def __deepcopy__(self, memo):
         return self
 
-    def __next__(self):
-        cdef tuple points
-        cdef SkPathVerb verb
+    @property
+    def fillType(self):
+        return FillType(<uint32_t>self.path.getFillType())
+
+    @property
+    def isConvex(self):
+        return self.path.isConvex()
+
+    @property
+    def bounds(self):
+        if self.path.isEmpty():
+            return None
+        cdef SkRect r = self.path.computeTightBounds()
+        return (r.left(), r.top(), r.right(), r.bottom())
+
+    @property
+    def controlPointBounds(self):
+        if self.path.isEmpty():
+            return None
+        cdef SkRect r = self.path.getBounds()
+        return (r.left(), r.top(), r.right(), r.bottom())
+
+    @property
+    def nbytes(self):
+        """Approximate number of bytes used by the underlying SkPath."""
+        return self.path.approximateBytesUsed()
+
+
+DEF PATH_COLLECTION_VERSION = 1
+cdef bytes PATH_COLLECTION_MAGIC = b"SKPATHS\0"
+cdef uint32_t BYTE_ORDER_MARK = 0x01020304
+
+
+cdef class PathCollection:
+    """Many paths packed in contiguous arrays of verbs, points, conic weights
+    and fill types, with per-path offsets into them.
+
+    to_bytes() returns the arrays as they are laid out in memory, prefixed by
+    a small header, so from_bytes() and open() only need to validate the
+    offsets and copy them back, without decoding the individual paths. The
+    format uses the native byte order and can't be loaded on a machine with a
+    different one.
+    """
+
+    def __cinit__(self):
+        self.verb_offsets.push_back(0)
+        self.point_offsets.push_back(0)
+        self.weight_offsets.push_back(0)
+
+    def __init__(self, paths=()):
+        self.extend(paths)
+
+    def __len__(self):
+        return self.fill_types.size()
+
+    def __getitem__(self, Py_ssize_t index):
+        cdef Py_ssize_t n = self.fill_types.size()
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("PathCollection index out of range")
+        cdef Path path = Path()
+        self.load_entry(index, path.path)
+        return path
+
+    def __iter__(self):
+        cdef Py_ssize_t i
+        for i in range(self.fill_types.size()):
+            yield self[i]
+
+    def __repr__(self):
+        return "<PathCollection of %d paths>" % len(self)
+
+    cpdef append(self, Path path):
+        cdef SkSpan[const SkPathVerb] verbs = path.path.verbs()
+        cdef SkSpan[const SkPoint] pts = path.path.points()
+        cdef SkSpan[const SkScalar] weights = path.path.conicWeights()
+        cdef size_t n
+
+        n = self.verbs.size()
+        self.verbs.resize(n + verbs.size())
+        if verbs.size():
+            memcpy(&self.verbs[n], verbs.data(), verbs.size() * sizeof(uint8_t))
+
+        n = self.points.size()
+        self.points.resize(n + pts.size())
+        if pts.size():
+            memcpy(&self.points[n], pts.data(), pts.size() * sizeof(SkPoint))
+
+        n = self.weights.size()
+        self.weights.resize(n + weights.size())
+        if weights.size():
+            memcpy(&self.weights[n], weights.data(), weights.size() * sizeof(SkScalar))
+
+        self.verb_offsets.push_back(self.verbs.size())
+        self.point_offsets.push_back(self.points.size())
+        self.weight_offsets.push_back(self.weights.size())
+        self.fill_types.push_back(<uint8_t>path.path.fillType())
+
+    def extend(self, paths):
+        for path in paths:
+            self.append(path)
+
+    cdef int load_entry(self, Py_ssize_t index, SkPathBuilder& builder) except -1:
+        cdef uint64_t v = self.verb_offsets[index]
+        cdef uint64_t v_end = self.verb_offsets[index + 1]
+        cdef uint64_t p = self.point_offsets[index]
+        cdef uint64_t p_end = self.point_offsets[index + 1]
+        cdef uint64_t w = self.weight_offsets[index]
+        cdef uint64_t w_end = self.weight_offsets[index + 1]
+        cdef const SkPoint *pts = self.points.data()
+        cdef SkPathVerb verb
+        cdef int n
+
+        builder.reset()
+        builder.setFillType(<SkPathFillType>self.fill_types[index])
+        while v < v_end:
+            verb = <SkPathVerb>self.verbs[v]
+            if <uint8_t>verb > <uint8_t>SkPathVerb.kClose:
+                raise ValueError("invalid verb in PathCollection: %d" % verb)
+            n = POINTS_IN_VERB[<uint8_t>verb]
+            if p + n > p_end:
+                raise ValueError("not enough points in PathCollection entry")
+            if verb == SkPathVerb.kMove:
+                builder.moveTo(pts[p])
+            elif verb == SkPathVerb.kLine:
+                builder.lineTo(pts[p])
+            elif verb == SkPathVerb.kQuad:
+                builder.quadTo(pts[p], pts[p + 1])
+            elif verb == SkPathVerb.kConic:
+                if w >= w_end:
+                    raise ValueError("not enough weights in PathCollection entry")
+                builder.conicTo(pts[p], pts[p + 1], self.weights[w])
+                w += 1
+            elif verb == SkPathVerb.kCubic:
+                builder.cubicTo(pts[p], pts[p + 1], pts[p + 2])
+            else:
+                builder.close()
+            p += n
+            v += 1
+        return 0
+
+    def to_bytes(self):
+        """Return the collection serialized in the format read by from_bytes()."""
+        cdef _PathCollectionHeader header
+        memcpy(header.magic, <const char *>PATH_COLLECTION_MAGIC, 8)
+        header.version = PATH_COLLECTION_VERSION
+        header.byte_order = BYTE_ORDER_MARK
+        header.num_paths = self.fill_types.size()
+        header.num_verbs = self.verbs.size()
+        header.num_points = self.points.size()
+        header.num_weights = self.weights.size()
+        cdef size_t offsets_size = (header.num_paths + 1) * sizeof(uint64_t)
+        # the arrays are sorted by alignment, so they don't need padding
+        return b"".join([
+            (<char *>&header)[:sizeof(header)],
+            (<char *>self.verb_offsets.data())[:offsets_size],
+            (<char *>self.point_offsets.data())[:offsets_size],
+            (<char *>self.weight_offsets.data())[:offsets_size],
+            (<char *>self.points.data())[:header.num_points * sizeof(SkPoint)],
+            (<char *>self.weights.data())[:header.num_weights * sizeof(SkScalar)],
+            (<char *>self.verbs.data())[:header.num_verbs],
+            (<char *>self.fill_types.data())[:header.num_paths],
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Return a PathCollection from data returned by to_bytes().
+
+        'data' can be bytes or any object supporting the buffer protocol,
+        like a mmap or the 'buf' of a multiprocessing.shared_memory block.
+        Any data following the collection is ignored.
+        """
+        if not isinstance(data, bytes):
+            # the buffer protocol is not part of the 3.10 limited API
+            data = bytes(data)
+        cdef const char *buf = data
+        cdef Py_ssize_t size = len(data)
+        cdef _PathCollectionHeader header
+        if size < <Py_ssize_t>sizeof(header):
+            raise ValueError("data is too short for a PathCollection")
+        memcpy(&header, buf, sizeof(header))
+        if buf[:8] != PATH_COLLECTION_MAGIC:
+            raise ValueError("data is not a PathCollection")
+        if header.byte_order != BYTE_ORDER_MARK:
+            raise ValueError("PathCollection was saved with a different byte order")
+        if header.version != PATH_COLLECTION_VERSION:
+            raise ValueError(
+                "unsupported PathCollection version: %d" % header.version
+            )
+        # every element takes at least one byte, so bounding the counts by the
+        # size of the data keeps the arithmetic below from overflowing
+        if (
+            header.num_paths > <uint64_t>size
+            or header.num_verbs > <uint64_t>size
+            or header.num_points > <uint64_t>size
+            or header.num_weights > <uint64_t>size
+        ):
+            raise ValueError("data is too short for a PathCollection")
+        cdef uint64_t expected_size = (
+            sizeof(header)
+            + 3 * (header.num_paths + 1) * sizeof(uint64_t)
+            + header.num_points * sizeof(SkPoint)
+            + header.num_weights * sizeof(SkScalar)
+            + header.num_verbs
+            + header.num_paths
+        )
+        if <uint64_t>size < expected_size:
+            raise ValueError("data is too short for a PathCollection")
+
+        cdef PathCollection self = cls.__new__(cls)
+        cdef size_t num_paths = header.num_paths
+        self.verb_offsets.resize(num_paths + 1)
+        self.point_offsets.resize(num_paths + 1)
+        self.weight_offsets.resize(num_paths + 1)
+        self.points.resize(header.num_points)
+        self.weights.resize(header.num_weights)
+        self.verbs.resize(header.num_verbs)
+        self.fill_types.resize(num_paths)
+
+        cdef size_t offsets_size = (num_paths + 1) * sizeof(uint64_t)
+        cdef size_t offset = sizeof(header)
+        offset = copy_array(buf, offset, self.verb_offsets.data(), offsets_size)
+        offset = copy_array(buf, offset, self.point_offsets.data(), offsets_size)
+        offset = copy_array(buf, offset, self.weight_offsets.data(), offsets_size)
+        offset = copy_array(
+            buf, offset, self.points.data(), header.num_points * sizeof(SkPoint)
+        )
+        offset = copy_array(
+            buf, offset, self.weights.data(), header.num_weights * sizeof(SkScalar)
+        )
+        offset = copy_array(buf, offset, self.verbs.data(), header.num_verbs)
+        offset = copy_array(buf, offset, self.fill_types.data(), num_paths)
+
+        check_offsets(self.verb_offsets, header.num_verbs)
+        check_offsets(self.point_offsets, header.num_points)
+        check_offsets(self.weight_offsets, header.num_weights)
+        cdef size_t i
+        for i in range(num_paths):
+            if self.fill_types[i] > <uint8_t>SkPathFillType.kInverseEvenOdd:
+                raise ValueError("invalid fill type in PathCollection")
+        return self
+
+    def save(self, file):
+        """Write the collection to a file path or a binary file object."""
+        data = self.to_bytes()
+        if hasattr(file, "write"):
+            file.write(data)
+        else:
+            with open(file, "wb") as f:
+                f.write(data)
+
+    @classmethod
+    def open(cls, file):
+        """Load a collection saved with save() by memory-mapping the file."""
+        import mmap
+
+        with open(file, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                return cls.from_bytes(m)
+
+    def simplify(
+        self,
+        fix_winding=True,
+        keep_starting_points=True,
+        clockwise=False,
+        round_to=0,
+        cleanup=False,
+    ):
+        """Simplify each path; return the results in a new PathCollection."""
+        cdef PathCollection result = PathCollection()
+        cdef Path path = Path()
+        cdef Py_ssize_t i
+        for i in range(self.fill_types.size()):
+            self.load_entry(i, path.path)
+            path.invalidate()
+            result.append(
+                simplify(
+                    path,
+                    fix_winding=fix_winding,
+                    keep_starting_points=keep_starting_points,
+                    clockwise=clockwise,
+                    round_to=round_to,
+                    cleanup=cleanup,
+                )
+            )
+        return result
+
+    def op(
+        self,
+        PathCollection other,
+        operator,
+        fix_winding=True,
+        keep_starting_points=True,
+        clockwise=False,
+        round_to=0,
+        cleanup=False,
+    ):
+        """Apply the operator to each pair of paths with the same index in
+        this and the other collection; return the results in a new
+        PathCollection.
+        """
+        if len(self) != len(other):
+            raise ValueError(
+                "PathCollections have different lengths: %d != %d"
+                % (len(self), len(other))
+            )
+        cdef PathCollection result = PathCollection()
+        cdef Path one = Path()
+        cdef Path two = Path()
+        cdef Py_ssize_t i
+        for i in range(self.fill_types.size()):
+            self.load_entry(i, one.path)
+            other.load_entry(i, two.path)
+            one.invalidate()
+            two.invalidate()
+            result.append(
+                op(
+                    one,
+                    two,
+                    operator,
+                    fix_winding=fix_winding,
+                    keep_starting_points=keep_starting_points,
+                    clockwise=clockwise,
+                    round_to=round_to,
+                    cleanup=cleanup,
+                )
+            )
+        return result
+
+    @property
+    def nbytes(self):
+        """Number of bytes used by the packed arrays."""
+        return (
+            self.verbs.size()
+            + self.fill_types.size()
+            + self.points.size() * sizeof(SkPoint)
+            + self.weights.size() * sizeof(SkScalar)
+            + 3 * self.verb_offsets.size() * sizeof(uint64_t)
+        )
+
+
+cdef inline size_t copy_array(
+    const char *buf, size_t offset, void *dest, size_t size
+) noexcept:
+    if size:
+        memcpy(dest, buf + offset, size)
+    return offset + size
+
+
+cdef int check_offsets(const vector[uint64_t]& offsets, uint64_t total) except -1:
+    cdef size_t i
+    if offsets[0] != 0 or offsets[offsets.size() - 1] != total:
+        raise ValueError("invalid offsets in PathCollection")
+    for i in range(1, offsets.size()):
+        if offsets[i] < offsets[i - 1]:
+            raise ValueError("invalid offsets in PathCollection")
+    return 0
+
+
+DEF NUM_VERBS = 7
+
+cdef uint8_t *POINTS_IN_VERB = [
+    1,  # MOVE
+    1,  # LINE
+    2,  # QUAD
+    2,  # CONIC
+    3,  # CUBIC
+    0,  # CLOSE
+    0   # DONE
+]
+
+# These are never modified after the module is initialized, so they can be read
+# from multiple threads without locking.
+cdef dict VERB_METHODS = {
+    SkPathVerb.kMove: "moveTo",
+    SkPathVerb.kLine: "lineTo",
+    SkPathVerb.kQuad: "quadTo",
+    SkPathVerb.kConic: "conicTo",
+    SkPathVerb.kCubic: "cubicTo",
+    SkPathVerb.kClose: "close",
+}
+
+cdef dict PEN_METHODS = {
+    SkPathVerb.kMove: "moveTo",
+    SkPathVerb.kLine: "lineTo",
+    SkPathVerb.kQuad: "qCurveTo",
+    SkPathVerb.kCubic: "curveTo",
+    SkPathVerb.kClose: "closePath",
+}
+
+
+cdef tuple NO_POINTS = ()
+
+
+cdef int count_contours(SkSpan[const SkPathVerb] verbs) noexcept:
+    cdef int n = 0
+    for verb in verbs:
+        if verb == SkPathVerb.kMove:
+            n += 1
+    return n
+
+
+def _segments(path):
+    # We need to check for TrueType special quadratic closed spline made of
+    # off-curve points only so that we can make the move point implied.
+    # It's easier to do this in here than inside the SegmentPenIterator, as that
+    # yields each segment one by one, whereas we want to sometimes *not* yield a
+    # moveTo in very specific circumstances (i.e. the whole contour is a single
+    # closed quadratic spline where all the on-curve points are midway between
+    # consecutive off-curve points) based on previous and next segments.
+    cdef SkPoint p1, p2, p3
+    result = []
+    it = itertools.chain([None], SegmentPenIterator(path), [None])
+    for previous, current, next_ in triplewise(it):
+        if (
+            previous is not None
+            and previous[0] == "moveTo"
+            and current[0] == "qCurveTo"
+            and next_ is not None
+            and next_[0] == "closePath"
+            and previous[1][0] == current[1][-1]
+        ):
+            qpoints = current[1]
+            last_off, move_pt, first_off = qpoints[-2], qpoints[-1], qpoints[0]
+            p1 = SkPoint.Make(last_off[0], last_off[1])
+            p2 = SkPoint.Make(move_pt[0], move_pt[1])
+            p3 = SkPoint.Make(first_off[0], first_off[1])
+            if is_middle_point(p1, p2, p3):
+                # drop the moveTo and make the last on-curve None
+                del result[-1]
+                result.append((current[0], current[1][:-1] + (None,)))
+                continue
+        result.append(current)
+    yield from result
+
+
+cdef class RawPathIterator:
+
+    def __cinit__(self, path):
+        # iterate over an immutable copy, so that the path can be modified
+        # meanwhile (e.g. extended with its own records)
+        if isinstance(path, FrozenPath):
+            self.path = path
+        else:
+            self.path = FrozenPath.create((<Path?>path).snapshot())
+        self.iterator = self.path.path.iter()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        cdef tuple pts
+        cdef SkPathVerb verb
+        cdef SkSpan[const SkPoint] p
+
+        rec = self.iterator.value().next()
+        if not rec.has_value():
+            raise StopIteration()
+        verb = rec.value().fVerb
+        p = rec.value().fPoints
+
+        if verb == SkPathVerb.kMove:
+            pts = ((p[0].x(), p[0].y()),)
+        elif verb == SkPathVerb.kLine:
+            pts = ((p[1].x(), p[1].y()),)
+        elif verb == SkPathVerb.kQuad:
+            pts = ((p[1].x(), p[1].y()),
+                   (p[2].x(), p[2].y()))
+        elif verb == SkPathVerb.kConic:
+            pts = ((p[1].x(), p[1].y()),
+                   (p[2].x(), p[2].y()),
+                   rec.value().conicWeight())
+        elif verb == SkPathVerb.kCubic:
+            pts = ((p[1].x(), p[1].y()),
+                   (p[2].x(), p[2].y()),
+                   (p[3].x(), p[3].y()))
+        elif verb == SkPathVerb.kClose:
+            pts = NO_POINTS
+        else:
+            raise UnsupportedVerbError(verb)
+
+        return (PathVerb(verb), pts)
+
+
+cdef tuple END_PATH = ("endPath", NO_POINTS)
+cdef tuple CLOSE_PATH = ("closePath", NO_POINTS)
+
+
+cdef class SegmentPenIterator:
+
+    def __cinit__(self, path):
+        # iterate over an immutable copy, which is cheap as it shares the
+        # data of the path's snapshot
+        if isinstance(path, FrozenPath):
+            self.path = path
+        else:
+            self.path = FrozenPath.create((<Path?>path).snapshot())
+        self.pts = self.path.path.points().begin()
+        self.verbs = self.path.path.verbs().begin() - 1  # TODO: UB
+        self.verb_stop = self.path.path.verbs().end()
+        self.move_pt = SkPoint.Make(.0, .0)
+        self.closed = True
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        cdef tuple points
+        cdef SkPathVerb verb
 
         self.verbs += 1
         if self.verbs >= self.verb_stop:
@@ -944,25 +2114,24 @@ cdef class PathPen:
         self.allow_open_paths = allow_open_paths
 
     cpdef moveTo(self, pt):
-        self.path.moveTo(pt[0], pt[1])
+        self.path.invalidate()
+        self.path.path.moveTo(sk_point(pt))
 
     cpdef lineTo(self, pt):
-        self.path.lineTo(pt[0], pt[1])
+        self.path.invalidate()
+        self.path.path.lineTo(sk_point(pt))
 
     def curveTo(self, *points):
-        num_offcurves = len(points) - 1
+        cdef Py_ssize_t num_offcurves = len(points) - 1
+        self.path.invalidate()
         if num_offcurves == 2:
-            pt1, pt2, pt3 = points
-            self.path.cubicTo(
-                pt1[0], pt1[1],
-                pt2[0], pt2[1],
-                pt3[0], pt3[1])
+            self.path.path.cubicTo(
+                sk_point(points[0]), sk_point(points[1]), sk_point(points[2])
+            )
         elif num_offcurves == 1:
-            pt1, pt2 = points
-            self.path.quadTo(pt1[0], pt1[1], pt2[0], pt2[1])
+            self.path.path.quadTo(sk_point(points[0]), sk_point(points[1]))
         elif num_offcurves == 0:
-            pt = points[0]
-            self.path.lineTo(pt[0], pt[1])
+            self.path.path.lineTo(sk_point(points[0]))
         else:
             # support BasePen "super-beziers"? Nah.
             raise NumberOfPointsError(
@@ -970,7 +2139,12 @@ cdef class PathPen:
             )
 
     def qCurveTo(self, *points):
-        num_offcurves = len(points) - 1
+        cdef Py_ssize_t num_offcurves = len(points) - 1
+        cdef Py_ssize_t i
+        cdef SkPoint off, next_off, oncurve
+        cdef SkPathBuilder *builder = &self.path.path
+        cdef bint oncurveless_contour
+        self.path.invalidate()
         if num_offcurves > 0:
             oncurveless_contour = points[-1] is None
             if oncurveless_contour:
@@ -980,55 +2154,2071 @@ cdef class PathPen:
                 # the last and the first off-curve points:
                 # https://github.com/fonttools/fonttools/blob/02a0636/Lib/fontTools/pens/basePen.py#L332-L344
                 # https://github.com/fonttools/skia-pathops/issues/45
-                x, y = points[-2]
-                nx, ny = points[0]
-                implied_pt = (0.5 * (x + nx), 0.5 * (y + ny))
-                self.moveTo(implied_pt)
-                points = points[:-1] + (implied_pt,)
-            for pt1, pt2 in _decompose_quadratic_segment(points):
-                self._qCurveToOne(pt1, pt2)
+                oncurve = midpoint(sk_point(points[num_offcurves - 1]), sk_point(points[0]))
+                builder.moveTo(oncurve)
+            else:
+                oncurve = sk_point(points[num_offcurves])
+            # decompose the TrueType quadratic spline, inserting the implied
+            # on-curve points half-way between consecutive off-curve points
+            off = sk_point(points[0])
+            for i in range(1, num_offcurves):
+                next_off = sk_point(points[i])
+                builder.quadTo(off, midpoint(off, next_off))
+                off = next_off
+            builder.quadTo(off, oncurve)
             if oncurveless_contour:
                 # oncurve-less contour is closed by definition
-                self.closePath()
+                builder.close()
         elif num_offcurves == 0:
-            self.lineTo(points[0])
+            builder.lineTo(sk_point(points[0]))
+        else:
+            raise NumberOfPointsError("qCurveTo requires at least 1 point; got 0")
+
+    cpdef closePath(self):
+        self.path.invalidate()
+        self.path.path.close()
+
+    cpdef endPath(self):
+        if not self.allow_open_paths:
+            raise OpenPathError()
+
+    cpdef addComponent(self, glyphName, transformation):
+        if self.glyphSet is None:
+            raise TypeError("Missing required glyphSet; can't decompose components")
+
+        base_glyph = self.glyphSet[glyphName]
+        cdef Path base_path = Path()
+        base_glyph.draw(base_path.getPen(glyphSet=self.glyphSet))
+        cdef Path component_path = base_path.transform(*transformation)
+
+        self.path.addPath(component_path)
+
+
+cdef inline tuple rect_to_tuple(const optional[SkRect]& rect):
+    if not rect.has_value():
+        return None
+    cdef SkRect r = rect.value()
+    return (r.left(), r.top(), r.right(), r.bottom())
+
+
+cdef inline SkPoint sk_point(object pt) except *:
+    # works with any 2-item sequence or iterable, not just tuples
+    cdef SkScalar x, y
+    x, y = pt
+    return SkPoint.Make(x, y)
+
+
+cdef inline SkPoint midpoint(const SkPoint& p1, const SkPoint& p2):
+    return SkPoint.Make(0.5 * (p1.x() + p2.x()), 0.5 * (p1.y() + p2.y()))
+
+
+cdef double get_path_area(const SkPathBuilder& path) except? -1234567:
+    cdef double area
+    cdef optional[SkRect] control_bounds
+    cdef int contours
+    walk_path_metrics(path, &area, &control_bounds, &contours)
+    return area
+
+
+cdef int walk_path_metrics(
+    const SkPathBuilder& path,
+    double *area,
+    optional[SkRect] *control_bounds,
+    int *contours,
+) except -1:
+    # Compute the signed area, the control point bounds (None if empty or not
+    # finite, like SkPathBuilder.computeFiniteBounds) and the number of
+    # contours in a single walk over the path's verbs and points.
+    # The area is adapted from fontTools/pens/areaPen.py
+    cdef SkSpan[const SkPathVerb] verbs = path.verbs()
+    cdef SkSpan[const SkPoint] pts = path.points()
+    cdef const SkPoint *p
+    cdef double value = .0
+    cdef SkPathVerb verb
+    cdef SkPoint p0, start_point
+    cdef SkScalar x0, y0, x1, y1, x2, y2, x3, y3
+    cdef SkScalar left = 0, top = 0, right = 0, bottom = 0
+    cdef bint need_close = False
+    cdef bint finite = True
+    cdef size_t i, j = 0
+
+    contours[0] = 0
+    if pts.empty():
+        area[0] = 0
+        control_bounds[0] = path.computeFiniteBounds()
+        return 0
+    left = right = pts[0].x()
+    top = bottom = pts[0].y()
+    for i in range(pts.size()):
+        if not (isfinite(pts[i].x()) and isfinite(pts[i].y())):
+            finite = False
+        if pts[i].x() < left:
+            left = pts[i].x()
+        elif pts[i].x() > right:
+            right = pts[i].x()
+        if pts[i].y() < top:
+            top = pts[i].y()
+        elif pts[i].y() > bottom:
+            bottom = pts[i].y()
+
+    p0 = start_point = SkPoint.Make(.0, .0)
+    for i in range(verbs.size()):
+        verb = verbs[i]
+        if verb == SkPathVerb.kMove:
+            if need_close:
+                x0, y0 = p0.x(), p0.y()
+                x1, y1 = start_point.x(), start_point.y()
+                value -= (x1 - x0) * (y1 + y0) * .5
+            p0 = start_point = pts[j]
+            j += 1
+            need_close = True
+            contours[0] += 1
+            continue
+        # p[1], p[2]... are the segment's new points, p[0] the previous one
+        p = pts.data() + j - 1
+        j += pts_in_verb(verb)
+        if verb == SkPathVerb.kLine:
+            x0, y0 = p0.x(), p0.y()
+            x1, y1 = p[1].x(), p[1].y()
+            value -= (x1 - x0) * (y1 + y0) * .5
+            p0 = p[1]
+        elif verb == SkPathVerb.kQuad:
+            # https://github.com/Pomax/bezierinfo/issues/44
+            x0, y0 = p0.x(), p0.y()
+            x1, y1 = p[1].x() - x0, p[1].y() - y0
+            x2, y2 = p[2].x() - x0, p[2].y() - y0
+            value -= (x2 * y1 - x1 * y2) / 3
+            value -= (p[2].x() - x0) * (p[2].y() + y0) * .5
+            p0 = p[2]
+        elif verb == SkPathVerb.kConic:
+            raise UnsupportedVerbError("CONIC")
+        elif verb == SkPathVerb.kCubic:
+            # https://github.com/Pomax/bezierinfo/issues/44
+            x0, y0 = p0.x(), p0.y()
+            x1, y1 = p[1].x() - x0, p[1].y() - y0
+            x2, y2 = p[2].x() - x0, p[2].y() - y0
+            x3, y3 = p[3].x() - x0, p[3].y() - y0
+            value -= (
+                       x1 * (   -   y2 -   y3) +
+                       x2 * (y1        - 2*y3) +
+                       x3 * (y1 + 2*y2       )
+                     ) * 0.15
+            value -= (p[3].x() - x0) * (p[3].y() + y0) * .5
+            p0 = p[3]
+        elif verb == SkPathVerb.kClose:
+            x0, y0 = p0.x(), p0.y()
+            x1, y1 = start_point.x(), start_point.y()
+            value -= (x1 - x0) * (y1 + y0) * .5
+            p0 = start_point = SkPoint.Make(.0, .0)
+            need_close = False
+        else:
+            raise AssertionError(verb)
+
+    if need_close:
+        x0, y0 = p0.x(), p0.y()
+        x1, y1 = start_point.x(), start_point.y()
+        value -= (x1 - x0) * (y1 + y0) * .5
+
+    area[0] = value
+    if finite:
+        control_bounds[0] = SkRect.MakeLTRB(left, top, right, bottom)
+    else:
+        control_bounds[0] = optional[SkRect]()
+    return 0
+
+
+cdef class _SkScalarArray:
+
+    @staticmethod
+    cdef _SkScalarArray create(object values):
+        # 'values' must be a sequence (e.g. list or tuple) of floats
+        cdef _SkScalarArray self = _SkScalarArray.__new__(_SkScalarArray)
+        self.count = len(values)
+        self.data = <SkScalar *> PyMem_Malloc(self.count * sizeof(SkScalar))
+        if not self.data:
+            raise MemoryError()
+        for i, v in enumerate(values):
+            self.data[i] = v
+        return self
+
+    def __dealloc__(self):
+        PyMem_Free(self.data)  # no-op if data is NULL
+
+    cdef SkSpan[SkScalar] as_span(self):
+        return SkSpan[SkScalar](self.data, self.count)
+
+
+cdef inline SkPoint snap_point(const SkPoint& p, SkScalar grid):
+    # round half up, like fontTools.misc.roundTools.otRound
+    return SkPoint.Make(
+        floor(p.x() / grid + 0.5) * grid, floor(p.y() / grid + 0.5) * grid
+    )
+
+
+cdef bint has_three_distinct_points(SkSpan[const SkPoint] pts) noexcept:
+    # otherwise, a contour can't enclose any area
+    cdef size_t i
+    cdef SkPoint second
+    cdef bint has_second = False
+    for i in range(1, pts.size()):
+        if pts[i] == pts[0]:
+            continue
+        if not has_second:
+            second = pts[i]
+            has_second = True
+        elif pts[i] != second:
+            return True
+    return False
+
+
+cdef int add_quantized_contour(SkPathBuilder& contour, SkPathBuilder& result) except -1:
+    if has_three_distinct_points(contour.points()):
+        result.addPath(contour.snapshot())
+    contour.reset()
+    return 0
+
+
+cdef int quantize_path(SkPathBuilder& path, SkScalar grid) except -1:
+    cdef SkPathBuilder result, contour
+    result.setFillType(path.fillType())
+
+    cdef SkPathVerb verb
+    cdef SkSpan[const SkPoint] p
+    cdef optional[SkPathIter] iterator = path.iter()
+    cdef optional[SkPathIter.Rec] rec
+    cdef SkPoint start, last, line_start, line_end, p1, p2, p3
+    # as in cleanup_path, a line segment is only added to the contour when
+    # the next segment isn't collinear with it, or when it doesn't just
+    # close the contour
+    cdef bint has_line = False
+
+    while True:
+        rec = iterator.value().next()
+        if not rec.has_value():
+            break
+        verb = rec.value().fVerb
+        p = rec.value().fPoints
+        if verb == SkPathVerb.kMove:
+            if has_line:
+                contour.lineTo(line_end)
+                has_line = False
+            add_quantized_contour(contour, result)
+            start = last = snap_point(p[0], grid)
+            contour.moveTo(start)
+        elif verb == SkPathVerb.kLine:
+            p1 = snap_point(p[1], grid)
+            if points_almost_equal(p1, last):
+                continue
+            if has_line and collinear(line_start, line_end, p1):
+                # extend the pending line segment instead of adding a new one
+                line_end = p1
+                if points_almost_equal(line_start, line_end):
+                    # the line went back to where it started
+                    has_line = False
+            else:
+                if has_line:
+                    contour.lineTo(line_end)
+                line_start = last
+                line_end = p1
+                has_line = True
+            last = p1
+        elif verb == SkPathVerb.kQuad or verb == SkPathVerb.kConic:
+            p1 = snap_point(p[1], grid)
+            p2 = snap_point(p[2], grid)
+            if points_almost_equal(p1, last) and points_almost_equal(p2, last):
+                continue
+            if has_line:
+                contour.lineTo(line_end)
+                has_line = False
+            if verb == SkPathVerb.kQuad:
+                contour.quadTo(p1, p2)
+            else:
+                contour.conicTo(p1, p2, rec.value().conicWeight())
+            last = p2
+        elif verb == SkPathVerb.kCubic:
+            p1 = snap_point(p[1], grid)
+            p2 = snap_point(p[2], grid)
+            p3 = snap_point(p[3], grid)
+            if (
+                points_almost_equal(p1, last)
+                and points_almost_equal(p2, last)
+                and points_almost_equal(p3, last)
+            ):
+                continue
+            if has_line:
+                contour.lineTo(line_end)
+                has_line = False
+            contour.cubicTo(p1, p2, p3)
+            last = p3
+        elif verb == SkPathVerb.kClose:
+            if has_line:
+                # unless it's the same as the implied closing line
+                if not points_almost_equal(line_end, start):
+                    contour.lineTo(line_end)
+                has_line = False
+            contour.close()
+            add_quantized_contour(contour, result)
+        else:
+            raise AssertionError(verb)
+
+    if has_line:
+        contour.lineTo(line_end)
+    add_quantized_contour(contour, result)
+
+    (&path)[0] = result
+    return 0
+
+
+cdef int cleanup_path(SkPathBuilder& path, SkScalar tolerance) except -1:
+    cdef SkPathBuilder contour
+    cdef list contours = []
+    cdef SkPathVerb verb
+    cdef SkSpan[const SkPoint] p
+    cdef optional[SkPathIter] iterator = path.iter()
+    cdef optional[SkPathIter.Rec] rec
+    cdef SkPoint start, last, line_start, line_end
+    # a line segment is only added to the contour when the next segment
+    # isn't collinear with it, or when it doesn't just close the contour
+    cdef bint has_line = False
+    cdef int segments = 0
+
+    while True:
+        rec = iterator.value().next()
+        if not rec.has_value():
+            break
+        verb = rec.value().fVerb
+        p = rec.value().fPoints
+        if verb == SkPathVerb.kMove:
+            if has_line:
+                contour.lineTo(line_end)
+                has_line = False
+            if segments:
+                contours.append(Path.create(contour))
+            contour.reset()
+            start = last = p[0]
+            contour.moveTo(start)
+            segments = 0
+        elif verb == SkPathVerb.kLine:
+            if points_almost_equal(p[1], last, tolerance):
+                continue
+            # p[1] is within 'tolerance' from the line through the start and
+            # end of the pending one if the triangle's area is at most
+            # half the base times the tolerance
+            if has_line and collinear(
+                line_start,
+                line_end,
+                p[1],
+                tolerance * sqrt(
+                    (p[1].x() - line_start.x()) * (p[1].x() - line_start.x())
+                    + (p[1].y() - line_start.y()) * (p[1].y() - line_start.y())
+                ) / 2,
+            ):
+                line_end = p[1]
+                if points_almost_equal(line_start, line_end, tolerance):
+                    # the line went back to where it started
+                    has_line = False
+                    segments -= 1
+            else:
+                if has_line:
+                    contour.lineTo(line_end)
+                line_start = last
+                line_end = p[1]
+                has_line = True
+                segments += 1
+            last = p[1]
+        elif verb == SkPathVerb.kQuad or verb == SkPathVerb.kConic:
+            if points_almost_equal(p[1], last, tolerance) and points_almost_equal(
+                p[2], last, tolerance
+            ):
+                continue
+            if has_line:
+                contour.lineTo(line_end)
+                has_line = False
+            if verb == SkPathVerb.kQuad:
+                contour.quadTo(p[1], p[2])
+            else:
+                contour.conicTo(p[1], p[2], rec.value().conicWeight())
+            last = p[2]
+            segments += 1
+        elif verb == SkPathVerb.kCubic:
+            if (
+                points_almost_equal(p[1], last, tolerance)
+                and points_almost_equal(p[2], last, tolerance)
+                and points_almost_equal(p[3], last, tolerance)
+            ):
+                continue
+            if has_line:
+                contour.lineTo(line_end)
+                has_line = False
+            contour.cubicTo(p[1], p[2], p[3])
+            last = p[3]
+            segments += 1
+        elif verb == SkPathVerb.kClose:
+            if has_line:
+                if points_almost_equal(line_end, start, tolerance):
+                    # same as the implied closing line
+                    segments -= 1
+                else:
+                    contour.lineTo(line_end)
+                has_line = False
+            if segments:
+                contour.close()
+                contours.append(Path.create(contour))
+            contour.reset()
+            segments = 0
+        else:
+            raise AssertionError(verb)
+
+    if has_line:
+        contour.lineTo(line_end)
+    if segments:
+        contours.append(Path.create(contour))
+
+    # Count the copies of each contour, keyed on its verbs, points and weights.
+    # With the even-odd rule two copies cancel each other out; with the
+    # non-zero winding rule they add up, so they are all kept.
+    cdef SkPathFillType fill_type = path.fillType()
+    cdef bint even_odd = (
+        fill_type == SkPathFillType.kEvenOdd
+        or fill_type == SkPathFillType.kInverseEvenOdd
+    )
+    cdef dict copies = {}
+    cdef Path this
+    cdef FrozenPath key
+    for this in contours:
+        key = FrozenPath.create(this.snapshot())
+        copies[key] = copies.get(key, 0) + 1
+
+    path.reset()
+    path.setFillType(fill_type)
+    for key, count in copies.items():
+        if even_odd:
+            count %= 2
+        for _ in range(count):
+            path.addPath(key.path)
+    return 0
+
+
+cdef inline SkPoint lerp_points(const SkPoint& p1, const SkPoint& p2, double t):
+    return SkPoint.Make(
+        p1.x() + (p2.x() - p1.x()) * t, p1.y() + (p2.y() - p1.y()) * t
+    )
+
+
+cdef void split_bezier(
+    const SkPoint *src, int n, double t, SkPoint *left, SkPoint *right
+) noexcept:
+    # de Casteljau subdivision of a Bezier segment with n (2 to 4) points
+    cdef SkPoint tmp[4]
+    cdef int i, j
+    for i in range(n):
+        tmp[i] = src[i]
+    left[0] = src[0]
+    right[n - 1] = src[n - 1]
+    for j in range(1, n):
+        for i in range(n - j):
+            tmp[i] = lerp_points(tmp[i], tmp[i + 1], t)
+        left[j] = tmp[0]
+        right[n - 1 - j] = tmp[n - 1 - j]
+
+
+cdef double eval_bernstein(const double *c, int n, double t) noexcept:
+    cdef double tmp[4]
+    cdef int i, j
+    for i in range(n):
+        tmp[i] = c[i]
+    for j in range(1, n):
+        for i in range(n - j):
+            tmp[i] += (tmp[i + 1] - tmp[i]) * t
+    return tmp[0]
+
+
+cdef int quadratic_bernstein_roots(double c0, double c1, double c2, double *ts) noexcept:
+    # Store in 'ts' the roots within (0, 1) of the quadratic polynomial with
+    # the given Bernstein coefficients; return their number.
+    cdef double a = c0 - 2 * c1 + c2
+    cdef double b = 2 * (c1 - c0)
+    cdef double c = c0
+    cdef double disc, q, t
+    cdef int n = 0
+    if a == 0:
+        if b != 0:
+            t = -c / b
+            if 0 < t < 1:
+                ts[n] = t
+                n += 1
+        return n
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return 0
+    # numerically stable form of the quadratic formula
+    q = -0.5 * (b + (sqrt(disc) if b >= 0 else -sqrt(disc)))
+    t = q / a
+    if 0 < t < 1:
+        ts[n] = t
+        n += 1
+    if q != 0:
+        t = c / q
+        if 0 < t < 1 and (n == 0 or t != ts[0]):
+            ts[n] = t
+            n += 1
+    return n
+
+
+DEF ROOT_BISECTION_STEPS = 52
+
+
+cdef int bezier_crossings(const double *c, int n, double *ts) noexcept:
+    # Store in 'ts', sorted, the parameters within (0, 1) where the Bezier
+    # polynomial of degree n - 1 with Bernstein coefficients 'c' changes sign;
+    # return their number (at most n - 1).
+    cdef double breaks[4]
+    cdef double a, b, m, fa, fm, tmp
+    cdef int count = 0, nbreaks, i, j, k
+
+    if n == 2:
+        if (c[0] < 0 < c[1]) or (c[1] < 0 < c[0]):
+            ts[0] = c[0] / (c[0] - c[1])
+            return 1
+        return 0
+    elif n == 3:
+        count = quadratic_bernstein_roots(c[0], c[1], c[2], ts)
+    else:
+        # split the cubic into monotonic spans at its extrema, then bisect
+        # the spans whose ends have opposite signs
+        breaks[0] = 0
+        nbreaks = 1 + quadratic_bernstein_roots(
+            c[1] - c[0], c[2] - c[1], c[3] - c[2], breaks + 1
+        )
+        if nbreaks == 3 and breaks[1] > breaks[2]:
+            breaks[1], breaks[2] = breaks[2], breaks[1]
+        breaks[nbreaks] = 1
+        for i in range(nbreaks):
+            a = breaks[i]
+            b = breaks[i + 1]
+            fa = eval_bernstein(c, n, a)
+            if not ((fa < 0 < eval_bernstein(c, n, b)) or (eval_bernstein(c, n, b) < 0 < fa)):
+                continue
+            for k in range(ROOT_BISECTION_STEPS):
+                m = 0.5 * (a + b)
+                fm = eval_bernstein(c, n, m)
+                if (fm < 0) == (fa < 0):
+                    a = m
+                    fa = fm
+                else:
+                    b = m
+            ts[count] = 0.5 * (a + b)
+            count += 1
+
+    # sort (insertion sort, there are at most 3 values)
+    for i in range(1, count):
+        tmp = ts[i]
+        j = i - 1
+        while j >= 0 and ts[j] > tmp:
+            ts[j + 1] = ts[j]
+            j -= 1
+        ts[j + 1] = tmp
+    return count
+
+
+cdef class _HalfPlaneClipper:
+    # Clips closed contours against the half-plane where sign * (coordinate
+    # along axis - value) >= 0. The parts of the contour lying outside are
+    # projected onto the boundary line, which preserves the winding number of
+    # every point inside the half-plane. Consecutive line segments along the
+    # boundary are merged.
+
+    cdef int clip(
+        self, const SkPathBuilder& contour, int axis, double value, double sign
+    ) except -1:
+        cdef optional[SkPathIter] iterator = contour.iter()
+        cdef optional[SkPathIter.Rec] rec
+        cdef SkPathVerb verb
+        cdef SkSpan[const SkPoint] p
+        cdef SkPoint start
+        cdef SkPoint line[2]
+
+        self.axis = axis
+        self.value = value
+        self.sign = sign
+        self.result.reset()
+
+        while True:
+            rec = iterator.value().next()
+            if not rec.has_value():
+                break
+            verb = rec.value().fVerb
+            p = rec.value().fPoints
+            if verb == SkPathVerb.kMove:
+                start = p[0]
+                self.start = self.project(start)
+                self.current = self.start
+                self.has_pending = False
+                self.result.moveTo(self.start)
+            elif verb == SkPathVerb.kLine:
+                self.clip_segment(p.data(), 2)
+            elif verb == SkPathVerb.kQuad:
+                self.clip_segment(p.data(), 3)
+            elif verb == SkPathVerb.kCubic:
+                self.clip_segment(p.data(), 4)
+            elif verb == SkPathVerb.kConic:
+                raise UnsupportedVerbError("CONIC")
+            elif verb == SkPathVerb.kClose:
+                pass
+            else:
+                raise AssertionError(verb)
+
+        if self.result.isEmpty():
+            return 0
+
+        # the contour is implicitly closed by a line back to the start point
+        line[0] = contour.getLastPt().value()
+        line[1] = start
+        if not points_almost_equal(line[0], line[1]):
+            self.clip_segment(line, 2)
+        if self.has_pending and not points_almost_equal(self.pending, self.start):
+            self.result.lineTo(self.pending)
+        self.has_pending = False
+        self.result.close()
+        return 1
+
+    cdef inline double side(self, const SkPoint& p):
+        return self.sign * ((p.x() if self.axis == 0 else p.y()) - self.value)
+
+    cdef inline SkPoint project(self, const SkPoint& p):
+        if self.side(p) >= 0:
+            return p
+        elif self.axis == 0:
+            return SkPoint.Make(self.value, p.y())
+        else:
+            return SkPoint.Make(p.x(), self.value)
+
+    cdef inline SkPoint snap(self, const SkPoint& p):
+        if self.axis == 0:
+            return SkPoint.Make(self.value, p.y())
+        else:
+            return SkPoint.Make(p.x(), self.value)
+
+    cdef int clip_segment(self, const SkPoint *pts, int n) except -1:
+        cdef double coords[4]
+        cdef double ts[3]
+        cdef double prev_t = 0
+        cdef SkPoint piece[4]
+        cdef SkPoint left[4]
+        cdef int i, k, count
+
+        for i in range(n):
+            coords[i] = (pts[i].x() if self.axis == 0 else pts[i].y()) - self.value
+            piece[i] = pts[i]
+        count = bezier_crossings(coords, n, ts)
+
+        for k in range(count):
+            split_bezier(piece, n, (ts[k] - prev_t) / (1 - prev_t), left, piece)
+            # avoid tiny gaps or overlaps at the boundary
+            left[n - 1] = piece[0] = self.snap(piece[0])
+            self.add_piece(left, n)
+            prev_t = ts[k]
+        self.add_piece(piece, n)
+        return 0
+
+    cdef int add_piece(self, const SkPoint *pts, int n) except -1:
+        cdef double coords[4]
+        cdef int i
+        for i in range(n):
+            coords[i] = (pts[i].x() if self.axis == 0 else pts[i].y()) - self.value
+
+        if self.sign * eval_bernstein(coords, n, 0.5) < 0:
+            # outside: replace with a line along the boundary
+            self.add_line(self.project(pts[n - 1]), True)
+        elif n == 2:
+            self.add_line(pts[1], False)
+        else:
+            self.flush()
+            if n == 3:
+                self.result.quadTo(pts[1], pts[2])
+            else:
+                self.result.cubicTo(pts[1], pts[2], pts[3])
+            self.current = pts[n - 1]
+        return 0
+
+    cdef int add_line(self, const SkPoint& pt, bint on_edge) except -1:
+        if points_almost_equal(pt, self.current):
+            return 0
+        if self.has_pending and not (on_edge and self.pending_on_edge):
+            self.flush()
+        self.pending = pt
+        self.pending_on_edge = on_edge
+        self.has_pending = True
+        self.current = pt
+        return 0
+
+    cdef int flush(self) except -1:
+        if self.has_pending:
+            self.result.lineTo(self.pending)
+            self.has_pending = False
+        return 0
+
+
+cdef int clip_path_to_rect(
+    const SkPathBuilder& path,
+    SkPathBuilder& result,
+    double left,
+    double top,
+    double right,
+    double bottom,
+) except -1:
+    cdef SkPathBuilder contour
+    cdef optional[SkPathIter] iterator = path.iter()
+    cdef optional[SkPathIter.Rec] rec
+    cdef SkPathVerb verb
+    cdef SkSpan[const SkPoint] p
+    cdef _HalfPlaneClipper clipper = _HalfPlaneClipper.__new__(_HalfPlaneClipper)
+    cdef SkPoint quad_pts[1 + 2 * (1 << 5)]
+    cdef int i, num_quads
+
+    while True:
+        rec = iterator.value().next()
+        if not rec.has_value():
+            break
+        verb = rec.value().fVerb
+        p = rec.value().fPoints
+        if verb == SkPathVerb.kMove:
+            if not contour.isEmpty():
+                clip_contour_to_rect(
+                    contour, result, clipper, left, top, right, bottom
+                )
+            contour.moveTo(p[0])
+        elif verb == SkPathVerb.kLine:
+            contour.lineTo(p[1])
+        elif verb == SkPathVerb.kQuad:
+            contour.quadTo(p[1], p[2])
+        elif verb == SkPathVerb.kConic:
+            # the clipper only splits polynomial curves
+            num_quads = ConvertConicToQuads(
+                p[0],
+                p[1],
+                p[2],
+                rec.value().conicWeight(),
+                quad_pts,
+                compute_conic_to_quad_pow2(
+                    p[0], p[1], p[2], rec.value().conicWeight(), 0.25
+                ),
+            )
+            for i in range(num_quads):
+                contour.quadTo(quad_pts[2 * i + 1], quad_pts[2 * i + 2])
+        elif verb == SkPathVerb.kCubic:
+            contour.cubicTo(p[1], p[2], p[3])
+        elif verb == SkPathVerb.kClose:
+            contour.close()
+            clip_contour_to_rect(contour, result, clipper, left, top, right, bottom)
+        else:
+            raise AssertionError(verb)
+    if not contour.isEmpty():
+        clip_contour_to_rect(contour, result, clipper, left, top, right, bottom)
+    return 0
+
+
+cdef int clip_contour_to_rect(
+    SkPathBuilder& contour,
+    SkPathBuilder& result,
+    _HalfPlaneClipper clipper,
+    double left,
+    double top,
+    double right,
+    double bottom,
+) except -1:
+    # Clip a single contour and add it to the result; the contour is reset.
+    # The control points bounds are used to trivially accept or reject it.
+    cdef optional[SkRect] maybe_bounds = contour.computeFiniteBounds()
+    cdef SkRect bounds
+    if not maybe_bounds.has_value():
+        contour.reset()
+        return 0
+    bounds = maybe_bounds.value()
+
+    if (
+        bounds.right() <= left
+        or bounds.left() >= right
+        or bounds.bottom() <= top
+        or bounds.top() >= bottom
+    ):
+        contour.reset()
+        return 0
+
+    if (
+        bounds.left() >= left
+        and bounds.right() <= right
+        and bounds.top() >= top
+        and bounds.bottom() <= bottom
+    ):
+        result.addPath(contour.detach())
+        return 1
+
+    clipper.clip(contour, 0, left, 1)
+    contour = clipper.result.detach()
+    clipper.clip(contour, 0, right, -1)
+    contour = clipper.result.detach()
+    clipper.clip(contour, 1, top, 1)
+    contour = clipper.result.detach()
+    clipper.clip(contour, 1, bottom, -1)
+    contour.reset()
+    # Drop the contours that were entirely projected onto the rectangle's
+    # edges, e.g. an L-shape around one of its corners, unless they go all
+    # around it. The area alone can't tell, as the lobes of a figure-eight
+    # cancel out, but those have segments strictly inside the rectangle.
+    if clipper.result.isEmpty() or not (
+        contour_enters_rect(clipper.result, left, top, right, bottom)
+        or fabs(get_path_area(clipper.result)) > SK_ScalarNearlyZero
+    ):
+        clipper.result.reset()
+        return 0
+    result.addPath(clipper.result.detach())
+    return 1
+
+
+cdef bint contour_enters_rect(
+    const SkPathBuilder& contour,
+    double left,
+    double top,
+    double right,
+    double bottom,
+) except -1:
+    # Whether the middle point of any segment, including the implicit closing
+    # line, is strictly inside the rectangle. Conics aren't supported.
+    cdef optional[SkPathIter] iterator = contour.iter()
+    cdef optional[SkPathIter.Rec] rec
+    cdef SkPathVerb verb
+    cdef SkSpan[const SkPoint] p
+    cdef SkPoint start, last
+    cdef double xs[4]
+    cdef double ys[4]
+    cdef double x, y
+    cdef int i, n
+    while True:
+        rec = iterator.value().next()
+        if not rec.has_value():
+            break
+        verb = rec.value().fVerb
+        p = rec.value().fPoints
+        if verb == SkPathVerb.kMove:
+            start = last = p[0]
+            continue
+        elif verb == SkPathVerb.kLine:
+            n = 2
+        elif verb == SkPathVerb.kQuad:
+            n = 3
+        elif verb == SkPathVerb.kCubic:
+            n = 4
+        elif verb == SkPathVerb.kClose:
+            x = (<double>last.x() + start.x()) / 2
+            y = (<double>last.y() + start.y()) / 2
+            if left < x < right and top < y < bottom:
+                return True
+            last = start
+            continue
+        else:
+            raise UnsupportedVerbError(PathVerb(<uint8_t>verb))
+        for i in range(n):
+            xs[i] = p[i].x()
+            ys[i] = p[i].y()
+        x = eval_bernstein(xs, n, 0.5)
+        y = eval_bernstein(ys, n, 0.5)
+        if left < x < right and top < y < bottom:
+            return True
+        last = p[n - 1]
+    return False
+
+
+DEF MAX_HIT_TEST_BANDS = 1024
+
+
+cdef class _HitTester:
+    # Precomputed structure for testing many points against the same path.
+    # Every segment (plus the implicit closing line of each contour) is split
+    # into pieces that are monotonic in y, and the pieces are bucketed in
+    # horizontal bands of equal height, so that a point is only tested against
+    # the pieces that span its band. For each piece crossing the horizontal
+    # line through the point, to the right of it, the winding number is
+    # incremented or decremented depending on the piece's direction.
+
+    @staticmethod
+    cdef _HitTester create(const SkPathBuilder& path):
+        cdef _HitTester self = _HitTester.__new__(_HitTester)
+        cdef SkPathFillType fill_type = path.fillType()
+        cdef optional[SkPathIter] iterator = path.iter()
+        cdef optional[SkPathIter.Rec] rec
+        cdef SkPathVerb verb
+        cdef SkSpan[const SkPoint] p
+        cdef SkPoint start, last
+        cdef SkPoint line[2]
+        cdef bint has_contour = False
+
+        self.even_odd = (
+            fill_type == SkPathFillType.kEvenOdd
+            or fill_type == SkPathFillType.kInverseEvenOdd
+        )
+        self.inverse = (
+            fill_type == SkPathFillType.kInverseWinding
+            or fill_type == SkPathFillType.kInverseEvenOdd
+        )
+        # a segment is split into at most 3 monotonic pieces, and each 'move'
+        # verb leaves room for the closing line of the previous contour
+        self.edges = <_HitTestEdge *> PyMem_Malloc(
+            (3 * path.verbs().size() + 1) * sizeof(_HitTestEdge)
+        )
+        if not self.edges:
+            raise MemoryError()
+
+        while True:
+            rec = iterator.value().next()
+            if not rec.has_value():
+                break
+            verb = rec.value().fVerb
+            p = rec.value().fPoints
+            if verb == SkPathVerb.kMove:
+                if has_contour and not points_almost_equal(last, start):
+                    line[0] = last
+                    line[1] = start
+                    self.add_segment(line, 2, 1)
+                start = last = p[0]
+                has_contour = True
+            elif verb == SkPathVerb.kLine:
+                self.add_segment(p.data(), 2, 1)
+                last = p[1]
+            elif verb == SkPathVerb.kQuad:
+                self.add_segment(p.data(), 3, 1)
+                last = p[2]
+            elif verb == SkPathVerb.kConic:
+                self.add_segment(p.data(), 3, rec.value().conicWeight())
+                last = p[2]
+            elif verb == SkPathVerb.kCubic:
+                self.add_segment(p.data(), 4, 1)
+                last = p[3]
+            elif verb == SkPathVerb.kClose:
+                if not points_almost_equal(last, start):
+                    line[0] = last
+                    line[1] = start
+                    self.add_segment(line, 2, 1)
+                last = start
+            else:
+                raise AssertionError(verb)
+        if has_contour and not points_almost_equal(last, start):
+            line[0] = last
+            line[1] = start
+            self.add_segment(line, 2, 1)
+
+        self.build_bands()
+        return self
+
+    def __dealloc__(self):
+        PyMem_Free(self.edges)
+        PyMem_Free(self.band_offsets)
+        PyMem_Free(self.band_edges)
+
+    cdef int add_segment(self, const SkPoint *pts, int n, double weight) except -1:
+        cdef _HitTestEdge *edge
+        cdef double ys[4]
+        cdef double ts[4]
+        cdef double p10, p20, a, b, c, x, y0, y1
+        cdef int i, k, count = 0
+
+        for i in range(n):
+            ys[i] = pts[i].y()
+        # find the parameters of the y extrema
+        if n == 3:
+            # derivative of the (rational) quadratic, in power basis
+            p10 = ys[1] - ys[0]
+            p20 = ys[2] - ys[0]
+            a = (weight - 1) * p20
+            b = p20 - 2 * weight * p10
+            c = weight * p10
+            count = quadratic_bernstein_roots(c, c + 0.5 * b, a + b + c, ts + 1)
+        elif n == 4:
+            count = quadratic_bernstein_roots(
+                ys[1] - ys[0], ys[2] - ys[1], ys[3] - ys[2], ts + 1
+            )
+            if count == 2 and ts[1] > ts[2]:
+                ts[1], ts[2] = ts[2], ts[1]
+        ts[0] = 0
+        ts[count + 1] = 1
+
+        for i in range(count + 1):
+            edge = self.edges + self.count
+            edge.n = n
+            edge.weight = weight
+            for k in range(n):
+                edge.x[k] = pts[k].x()
+                edge.y[k] = ys[k]
+            edge.t0 = ts[i]
+            edge.t1 = ts[i + 1]
+            if edge.t1 <= edge.t0:
+                continue
+            # the control points bounds of the whole segment are good enough
+            # to tell on which side of a point the piece lies
+            edge.left = edge.right = edge.x[0]
+            for k in range(1, n):
+                x = edge.x[k]
+                if x < edge.left:
+                    edge.left = x
+                elif x > edge.right:
+                    edge.right = x
+            eval_edge(edge, edge.t0, &x, &y0)
+            eval_edge(edge, edge.t1, &x, &y1)
+            if y0 < y1:
+                edge.top, edge.bottom, edge.winding = y0, y1, 1
+            elif y0 > y1:
+                edge.top, edge.bottom, edge.winding = y1, y0, -1
+            else:
+                edge.top, edge.bottom, edge.winding = y0, y0, 0
+            if self.count == 0:
+                self.top, self.bottom = edge.top, edge.bottom
+            else:
+                if edge.top < self.top:
+                    self.top = edge.top
+                if edge.bottom > self.bottom:
+                    self.bottom = edge.bottom
+            self.count += 1
+        return 0
+
+    cdef int build_bands(self) except -1:
+        cdef Py_ssize_t i, total = 0
+        cdef int band, first, last
+        cdef int *fill
+
+        self.num_bands = <int>min(max(self.count, 1), MAX_HIT_TEST_BANDS)
+        self.band_height = (self.bottom - self.top) / self.num_bands
+        if self.band_height <= 0:
+            self.num_bands = 1
+            self.band_height = 1
+        self.band_offsets = <Py_ssize_t *> PyMem_Malloc(
+            (self.num_bands + 1) * sizeof(Py_ssize_t)
+        )
+        if not self.band_offsets:
+            raise MemoryError()
+        memset(self.band_offsets, 0, (self.num_bands + 1) * sizeof(Py_ssize_t))
+
+        # count the edges in each band, then lay them out contiguously
+        for i in range(self.count):
+            first = self.band_index(self.edges[i].top)
+            last = self.band_index(self.edges[i].bottom)
+            for band in range(first, last + 1):
+                self.band_offsets[band + 1] += 1
+        for band in range(self.num_bands):
+            self.band_offsets[band + 1] += self.band_offsets[band]
+        total = self.band_offsets[self.num_bands]
+
+        self.band_edges = <Py_ssize_t *> PyMem_Malloc(
+            max(total, 1) * sizeof(Py_ssize_t)
+        )
+        fill = <int *> PyMem_Malloc(self.num_bands * sizeof(int))
+        if not self.band_edges or not fill:
+            PyMem_Free(fill)
+            raise MemoryError()
+        memset(fill, 0, self.num_bands * sizeof(int))
+        for i in range(self.count):
+            first = self.band_index(self.edges[i].top)
+            last = self.band_index(self.edges[i].bottom)
+            for band in range(first, last + 1):
+                self.band_edges[self.band_offsets[band] + fill[band]] = i
+                fill[band] += 1
+        PyMem_Free(fill)
+        return 0
+
+    cdef inline int band_index(self, double y) noexcept:
+        cdef int band = <int>((y - self.top) / self.band_height)
+        if band < 0:
+            return 0
+        elif band >= self.num_bands:
+            return self.num_bands - 1
+        return band
+
+    cdef int contains(self, double x, double y) noexcept:
+        # Return 1 if the point is inside the path, 0 if it is outside, or -1
+        # if it lies on (or within SK_ScalarNearlyZero of) an edge, or can't
+        # be tested, in which case the caller should use SkPath::contains.
+        cdef const _HitTestEdge *edge
+        cdef Py_ssize_t i
+        cdef int band, winding = 0, k
+        cdef double a, b, m, ex, ey
+
+        if not (isfinite(x) and isfinite(y)):
+            return -1
+        if self.count == 0 or y < self.top or y > self.bottom:
+            return self.inverse
+
+        band = self.band_index(y)
+        for i in range(self.band_offsets[band], self.band_offsets[band + 1]):
+            edge = self.edges + self.band_edges[i]
+            if y < edge.top or y > edge.bottom or x > edge.right + SK_ScalarNearlyZero:
+                continue
+            if edge.winding == 0:
+                if x >= edge.left - SK_ScalarNearlyZero:
+                    return -1
+                continue
+            if x < edge.left - SK_ScalarNearlyZero:
+                # the piece is entirely to the right of the point
+                if y < edge.bottom:
+                    winding += edge.winding
+                continue
+            # find where the piece crosses the horizontal line through the
+            # point by bisection, since it's monotonic in y
+            a = edge.t0
+            b = edge.t1
+            if edge.winding < 0:
+                a, b = b, a
+            for k in range(ROOT_BISECTION_STEPS):
+                m = 0.5 * (a + b)
+                eval_edge(edge, m, &ex, &ey)
+                if ey < y:
+                    a = m
+                else:
+                    b = m
+            eval_edge(edge, 0.5 * (a + b), &ex, &ey)
+            if fabs(ex - x) <= SK_ScalarNearlyZero:
+                return -1
+            if ex > x and y < edge.bottom:
+                winding += edge.winding
+
+        if self.even_odd:
+            winding &= 1
+        return (winding != 0) != self.inverse
+
+
+cdef void eval_edge(const _HitTestEdge *edge, double t, double *x, double *y) noexcept:
+    cdef double cx[3]
+    cdef double cy[3]
+    cdef double cw[3]
+    cdef double w = edge.weight
+    cdef double d
+    if edge.n == 3 and w != 1:
+        cx[0] = edge.x[0]
+        cx[1] = w * edge.x[1]
+        cx[2] = edge.x[2]
+        cy[0] = edge.y[0]
+        cy[1] = w * edge.y[1]
+        cy[2] = edge.y[2]
+        cw[0] = 1
+        cw[1] = w
+        cw[2] = 1
+        d = eval_bernstein(cw, 3, t)
+        x[0] = eval_bernstein(cx, 3, t) / d
+        y[0] = eval_bernstein(cy, 3, t) / d
+    else:
+        x[0] = eval_bernstein(edge.x, edge.n, t)
+        y[0] = eval_bernstein(edge.y, edge.n, t)
+
+
+def intersections(Path one, Path two, double tolerance=1e-3):
+    """Return the points where the segments of two paths cross or touch.
+
+    The result is a list of ((x, y), (i, t), (j, u)) tuples, sorted by i and
+    t, where i and j are the indices of the intersecting segments in the
+    verbs of each path (as in list(path)), and t and u are the curve
+    parameters of the point on each segment. The closing line of a closed
+    contour has the index of its 'close' verb; open contours have none.
+    Intersections closer than 'tolerance' to each other are merged.
+    Overlapping collinear segments only report their end points.
+
+    The segments are pruned by their bounding boxes, then recursively
+    subdivided until they are flat within 'tolerance', which is much cheaper
+    than computing op(one, two, PathOp.INTERSECTION).
+    """
+    if tolerance <= 0:
+        raise ValueError("tolerance must be greater than 0")
+    cdef _SegmentList first = _SegmentList.create(one.path)
+    cdef _SegmentList second = _SegmentList.create(two.path)
+    cdef list result = []
+    cdef Py_ssize_t i, j
+    for i in range(first.count):
+        for j in range(second.count):
+            intersect_segments(
+                &first.items[i], &second.items[j], tolerance, False, result
+            )
+    result.sort(key=lambda hit: hit[1])
+    return result
+
+
+def self_intersections(Path path, double tolerance=1e-3):
+    """Return the points where the segments of a path cross or touch each
+    other, in the same format as intersections(path, path).
+
+    Consecutive segments of a contour are not reported to intersect at the
+    point they share. Loops within a single segment are not detected.
+    """
+    if tolerance <= 0:
+        raise ValueError("tolerance must be greater than 0")
+    cdef _SegmentList segments = _SegmentList.create(path.path)
+    cdef list result = []
+    cdef Py_ssize_t i, j
+    for i in range(segments.count):
+        for j in range(i + 1, segments.count):
+            intersect_segments(
+                &segments.items[i], &segments.items[j], tolerance, True, result
+            )
+    result.sort(key=lambda hit: hit[1])
+    return result
+
+
+cdef class _SegmentList:
+    # The line, quadratic and cubic segments of a path, with double precision
+    # coordinates, including the closing lines of closed contours.
+
+    @staticmethod
+    cdef _SegmentList create(const SkPathBuilder& path):
+        cdef _SegmentList self = _SegmentList.__new__(_SegmentList)
+        cdef optional[SkPathIter] iterator = path.iter()
+        cdef optional[SkPathIter.Rec] rec
+        cdef SkPathVerb verb
+        cdef SkSpan[const SkPoint] p
+        cdef SkPoint start, last
+        cdef SkPoint line[2]
+        cdef Py_ssize_t index = -1, contour = -1
+        cdef bint first = False
+
+        self.items = <_Segment *> PyMem_Malloc(
+            (path.verbs().size() + 1) * sizeof(_Segment)
+        )
+        if not self.items:
+            raise MemoryError()
+
+        while True:
+            rec = iterator.value().next()
+            if not rec.has_value():
+                break
+            index += 1
+            verb = rec.value().fVerb
+            p = rec.value().fPoints
+            if verb == SkPathVerb.kMove:
+                start = last = p[0]
+                contour += 1
+                first = True
+                continue
+            elif verb == SkPathVerb.kLine:
+                self.add(p.data(), 2, index, contour, first)
+                last = p[1]
+            elif verb == SkPathVerb.kQuad:
+                self.add(p.data(), 3, index, contour, first)
+                last = p[2]
+            elif verb == SkPathVerb.kCubic:
+                self.add(p.data(), 4, index, contour, first)
+                last = p[3]
+            elif verb == SkPathVerb.kConic:
+                raise UnsupportedVerbError("CONIC")
+            elif verb == SkPathVerb.kClose:
+                if last != start:
+                    line[0] = last
+                    line[1] = start
+                    self.add(line, 2, index, contour, first)
+                last = start
+            else:
+                raise AssertionError(verb)
+            first = False
+        return self
+
+    def __dealloc__(self):
+        PyMem_Free(self.items)
+
+    cdef int add(
+        self,
+        const SkPoint *pts,
+        int n,
+        Py_ssize_t index,
+        Py_ssize_t contour,
+        bint first,
+    ) except -1:
+        cdef _Segment *segment = self.items + self.count
+        cdef int i
+        segment.n = n
+        segment.index = index
+        segment.contour = contour
+        segment.first = first
+        for i in range(n):
+            segment.pts[2 * i] = pts[i].x()
+            segment.pts[2 * i + 1] = pts[i].y()
+        control_bounds(segment.pts, n, segment.bounds)
+        self.count += 1
+        return 0
+
+
+DEF MAX_INTERSECTION_DEPTH = 64
+
+
+cdef void control_bounds(const double *pts, int n, double *bounds) noexcept:
+    # store xMin, yMin, xMax, yMax of the n points in 'bounds'
+    cdef int i
+    bounds[0] = bounds[2] = pts[0]
+    bounds[1] = bounds[3] = pts[1]
+    for i in range(1, n):
+        bounds[0] = min(bounds[0], pts[2 * i])
+        bounds[1] = min(bounds[1], pts[2 * i + 1])
+        bounds[2] = max(bounds[2], pts[2 * i])
+        bounds[3] = max(bounds[3], pts[2 * i + 1])
+
+
+cdef inline bint bounds_overlap(
+    const double *a, const double *b, double tolerance
+) noexcept:
+    return (
+        a[0] <= b[2] + tolerance
+        and b[0] <= a[2] + tolerance
+        and a[1] <= b[3] + tolerance
+        and b[1] <= a[3] + tolerance
+    )
+
+
+cdef bint is_flat(const double *pts, int n, double tolerance) noexcept:
+    # whether all the control points are within 'tolerance' from the chord
+    cdef double dx = pts[2 * n - 2] - pts[0]
+    cdef double dy = pts[2 * n - 1] - pts[1]
+    cdef double length = sqrt(dx * dx + dy * dy)
+    cdef double ex, ey
+    cdef int i
+    for i in range(1, n - 1):
+        ex = pts[2 * i] - pts[0]
+        ey = pts[2 * i + 1] - pts[1]
+        if length > 0:
+            if fabs(ex * dy - ey * dx) > tolerance * length:
+                return False
+        elif ex * ex + ey * ey > tolerance * tolerance:
+            return False
+    return True
+
+
+cdef void split_bezier_half(
+    const double *src, int n, double *left, double *right
+) noexcept:
+    # de Casteljau subdivision at t=0.5 of a Bezier with n interleaved points
+    cdef double tmp[8]
+    cdef int i, j
+    for i in range(2 * n):
+        tmp[i] = src[i]
+    left[0] = src[0]
+    left[1] = src[1]
+    right[2 * n - 2] = src[2 * n - 2]
+    right[2 * n - 1] = src[2 * n - 1]
+    for j in range(1, n):
+        for i in range(n - j):
+            tmp[2 * i] = 0.5 * (tmp[2 * i] + tmp[2 * i + 2])
+            tmp[2 * i + 1] = 0.5 * (tmp[2 * i + 1] + tmp[2 * i + 3])
+        left[2 * j] = tmp[0]
+        left[2 * j + 1] = tmp[1]
+        right[2 * (n - 1 - j)] = tmp[2 * (n - 1 - j)]
+        right[2 * (n - 1 - j) + 1] = tmp[2 * (n - 1 - j) + 1]
+
+
+cdef int intersect_segments(
+    const _Segment *a,
+    const _Segment *b,
+    double tolerance,
+    bint same_path,
+    list result,
+) except -1:
+    # Append to 'result' the intersections of two segments which aren't
+    # already in it (within tolerance).
+    cdef list hits = []
+    cdef double t, u, x, y, jx, jy
+    cdef double cx[4]
+    cdef double cy[4]
+    cdef int i
+    cdef bint adjacent = False
+
+    if not bounds_overlap(a.bounds, b.bounds, tolerance):
+        return 0
+    intersect_pieces(
+        a.pts, a.n, 0, 1, b.pts, b.n, 0, 1, tolerance, 0, hits
+    )
+    if not hits:
+        return 0
+
+    if same_path and a.contour == b.contour:
+        # the point shared by consecutive segments of a contour doesn't count
+        if b.index == a.index + 1:
+            jx, jy = a.pts[2 * a.n - 2], a.pts[2 * a.n - 1]
+            adjacent = True
+        elif (
+            a.first
+            and b.pts[2 * b.n - 2] == a.pts[0]
+            and b.pts[2 * b.n - 1] == a.pts[1]
+        ):
+            jx, jy = a.pts[0], a.pts[1]
+            adjacent = True
+
+    for t, u in hits:
+        for i in range(a.n):
+            cx[i] = a.pts[2 * i]
+            cy[i] = a.pts[2 * i + 1]
+        x = eval_bernstein(cx, a.n, t)
+        y = eval_bernstein(cy, a.n, t)
+        if adjacent and fabs(x - jx) <= tolerance and fabs(y - jy) <= tolerance:
+            continue
+        for (px, py), _, _ in result:
+            if fabs(x - px) <= tolerance and fabs(y - py) <= tolerance:
+                break
+        else:
+            result.append(((x, y), (a.index, t), (b.index, u)))
+    return 0
+
+
+cdef int intersect_pieces(
+    const double *p,
+    int n,
+    double t0,
+    double t1,
+    const double *q,
+    int m,
+    double u0,
+    double u1,
+    double tolerance,
+    int depth,
+    list hits,
+) except -1:
+    # Recursively subdivide the two Bezier pieces, spanning parameters t0-t1
+    # and u0-u1 of their segments, until they are flat; then intersect the
+    # chords and append the (t, u) parameters to 'hits'.
+    cdef double pb[4]
+    cdef double qb[4]
+    cdef double left[8]
+    cdef double right[8]
+    cdef double dx1, dy1, dx2, dy2, ex, ey, denom, s, v, mid
+    cdef bint p_flat, q_flat
+
+    control_bounds(p, n, pb)
+    control_bounds(q, m, qb)
+    if not bounds_overlap(pb, qb, tolerance):
+        return 0
+
+    p_flat = n == 2 or is_flat(p, n, tolerance)
+    q_flat = m == 2 or is_flat(q, m, tolerance)
+    if (p_flat and q_flat) or depth >= MAX_INTERSECTION_DEPTH:
+        dx1 = p[2 * n - 2] - p[0]
+        dy1 = p[2 * n - 1] - p[1]
+        dx2 = q[2 * m - 2] - q[0]
+        dy2 = q[2 * m - 1] - q[1]
+        denom = dx1 * dy2 - dy1 * dx2
+        if denom == 0:
+            return 0
+        ex = q[0] - p[0]
+        ey = q[1] - p[1]
+        s = (ex * dy2 - ey * dx2) / denom
+        v = (ex * dy1 - ey * dx1) / denom
+        if -1e-9 <= s <= 1 + 1e-9 and -1e-9 <= v <= 1 + 1e-9:
+            s = min(max(s, 0), 1)
+            v = min(max(v, 0), 1)
+            hits.append((t0 + (t1 - t0) * s, u0 + (u1 - u0) * v))
+        return 0
+
+    # split the larger of the pieces that aren't flat yet
+    if not p_flat and (
+        q_flat or max(pb[2] - pb[0], pb[3] - pb[1]) >= max(qb[2] - qb[0], qb[3] - qb[1])
+    ):
+        split_bezier_half(p, n, left, right)
+        mid = 0.5 * (t0 + t1)
+        intersect_pieces(left, n, t0, mid, q, m, u0, u1, tolerance, depth + 1, hits)
+        intersect_pieces(right, n, mid, t1, q, m, u0, u1, tolerance, depth + 1, hits)
+    else:
+        split_bezier_half(q, m, left, right)
+        mid = 0.5 * (u0 + u1)
+        intersect_pieces(p, n, t0, t1, left, m, u0, mid, tolerance, depth + 1, hits)
+        intersect_pieces(p, n, t0, t1, right, m, mid, u1, tolerance, depth + 1, hits)
+    return 0
+
+
+# Boolean operations on polygons, i.e. paths made only of line segments.
+#
+# The edges of the operands are split where they cross or touch each other,
+# until they only meet at their end points; edges that overlap become
+# duplicates, which are merged adding up their winding contributions. An edge
+# is kept if the result of the operation differs on its two sides, given the
+# winding numbers of the operands just off its middle point, counted along a
+# horizontal ray going left. The kept edges are directed with the inside of
+# the result on their left, and joined into contours by always taking the
+# first turn clockwise, so that every face gets its own contour. If the edges
+# still cross after MAX_POLYGON_SPLIT_PASSES, Skia is used instead.
+
+DEF MAX_POLYGON_SPLIT_PASSES = 8
+DEF MAX_POLYGON_BANDS = 1024
+
+
+cdef bint is_polygon(const SkPathBuilder& path) noexcept nogil:
+    cdef SkSpan[const SkPathVerb] verbs = path.verbs()
+    cdef size_t i
+    for i in range(verbs.size()):
+        if (
+            verbs[i] != SkPathVerb.kMove
+            and verbs[i] != SkPathVerb.kLine
+            and verbs[i] != SkPathVerb.kClose
+        ):
+            return False
+    return True
+
+
+cdef int add_polygon_edge(
+    vector[_PolyEdge]& edges, const SkPoint& p, const SkPoint& q, int operand
+) except -1 nogil:
+    cdef _PolyEdge edge
+    if p == q:
+        return 0
+    edge.x0 = p.x()
+    edge.y0 = p.y()
+    edge.x1 = q.x()
+    edge.y1 = q.y()
+    edge.winding[0] = edge.winding[1] = 0
+    if edge.y1 < edge.y0:
+        edge.winding[operand] = 1
+    elif edge.y1 > edge.y0:
+        edge.winding[operand] = -1
+    edges.push_back(edge)
+    return 0
+
+
+cdef int add_polygon_edges(
+    const SkPathBuilder& path, int operand, vector[_PolyEdge]& edges
+) except -1 nogil:
+    # contours are implicitly closed, as when filling
+    cdef SkSpan[const SkPathVerb] verbs = path.verbs()
+    cdef SkSpan[const SkPoint] pts = path.points()
+    cdef size_t i, j = 0
+    cdef SkPoint first, last
+    cdef bint is_open = False
+    for i in range(verbs.size()):
+        if verbs[i] == SkPathVerb.kMove:
+            if is_open:
+                add_polygon_edge(edges, last, first, operand)
+            first = last = pts[j]
+            is_open = True
+            j += 1
+        elif verbs[i] == SkPathVerb.kLine:
+            add_polygon_edge(edges, last, pts[j], operand)
+            last = pts[j]
+            j += 1
+        elif verbs[i] == SkPathVerb.kClose:
+            if is_open:
+                add_polygon_edge(edges, last, first, operand)
+            is_open = False
+        else:
+            with gil:
+                raise UnsupportedVerbError(PathVerb(<uint8_t>verbs[i]))
+    if is_open:
+        add_polygon_edge(edges, last, first, operand)
+    return 0
+
+
+cdef inline double edge_param(const _PolyEdge *e, double x, double y) noexcept nogil:
+    # the position of a point of the edge along its longest side, from 0 to 1
+    cdef double dx = e.x1 - e.x0
+    cdef double dy = e.y1 - e.y0
+    if fabs(dx) >= fabs(dy):
+        return (x - e.x0) / dx
+    return (y - e.y0) / dy
+
+
+cdef int add_edge_split(
+    vector[_EdgeSplit]& splits, const _PolyEdge *e, size_t index, double x, double y
+) except -1 nogil:
+    cdef _EdgeSplit split
+    if (x == e.x0 and y == e.y0) or (x == e.x1 and y == e.y1):
+        return 0
+    split.t = edge_param(e, x, y)
+    if not 0 < split.t < 1:
+        return 0
+    split.edge = index
+    split.x = x
+    split.y = y
+    splits.push_back(split)
+    return 0
+
+
+cdef int intersect_polygon_edges(
+    const vector[_PolyEdge]& edges, size_t i, size_t j, vector[_EdgeSplit]& splits
+) except -1 nogil:
+    cdef const _PolyEdge *e = &edges[i]
+    cdef const _PolyEdge *f = &edges[j]
+    cdef double rx = e.x1 - e.x0, ry = e.y1 - e.y0
+    cdef double sx = f.x1 - f.x0, sy = f.y1 - f.y0
+    cdef double wx = f.x0 - e.x0, wy = f.y0 - e.y0
+    cdef double d = rx * sy - ry * sx
+    cdef double t, u, x, y
+    if d == 0:
+        if wx * ry - wy * rx != 0:
+            return 0  # parallel
+        # collinear: split each edge at the other's end points inside it
+        add_edge_split(splits, e, i, f.x0, f.y0)
+        add_edge_split(splits, e, i, f.x1, f.y1)
+        add_edge_split(splits, f, j, e.x0, e.y0)
+        add_edge_split(splits, f, j, e.x1, e.y1)
+        return 0
+    t = (wx * sy - wy * sx) / d
+    u = (wx * ry - wy * rx) / d
+    if t < 0 or t > 1 or u < 0 or u > 1:
+        return 0
+    if t == 0 or t == 1 or u == 0 or u == 1:
+        # an end point touches the other edge: split there exactly
+        if t == 0:
+            add_edge_split(splits, f, j, e.x0, e.y0)
+        elif t == 1:
+            add_edge_split(splits, f, j, e.x1, e.y1)
+        if u == 0:
+            add_edge_split(splits, e, i, f.x0, f.y0)
+        elif u == 1:
+            add_edge_split(splits, e, i, f.x1, f.y1)
+        return 0
+    # round to single precision, like all the other points of the paths
+    x = <float>(e.x0 + t * rx)
+    y = <float>(e.y0 + t * ry)
+    add_edge_split(splits, e, i, x, y)
+    add_edge_split(splits, f, j, x, y)
+    return 0
+
+
+cdef int compare_edges_by_left(const void *a, const void *b) noexcept nogil:
+    cdef double xa = fmin((<const _PolyEdge *>a).x0, (<const _PolyEdge *>a).x1)
+    cdef double xb = fmin((<const _PolyEdge *>b).x0, (<const _PolyEdge *>b).x1)
+    return (xa > xb) - (xa < xb)
+
+
+cdef int compare_edge_splits(const void *a, const void *b) noexcept nogil:
+    cdef const _EdgeSplit *sa = <const _EdgeSplit *>a
+    cdef const _EdgeSplit *sb = <const _EdgeSplit *>b
+    if sa.edge != sb.edge:
+        return (sa.edge > sb.edge) - (sa.edge < sb.edge)
+    return (sa.t > sb.t) - (sa.t < sb.t)
+
+
+cdef int compare_edges_by_points(const void *a, const void *b) noexcept nogil:
+    cdef const _PolyEdge *ea = <const _PolyEdge *>a
+    cdef const _PolyEdge *eb = <const _PolyEdge *>b
+    if ea.x0 != eb.x0:
+        return (ea.x0 > eb.x0) - (ea.x0 < eb.x0)
+    if ea.y0 != eb.y0:
+        return (ea.y0 > eb.y0) - (ea.y0 < eb.y0)
+    if ea.x1 != eb.x1:
+        return (ea.x1 > eb.x1) - (ea.x1 < eb.x1)
+    return (ea.y1 > eb.y1) - (ea.y1 < eb.y1)
+
+
+cdef bint split_polygon_edges(vector[_PolyEdge]& edges) except -1 nogil:
+    # Split the edges where they cross or touch each other; return True if
+    # any was split. Rounding the crossings can create new ones, so this is
+    # repeated until nothing changes.
+    cdef size_t n = edges.size()
+    if n == 0:
+        return False
+    qsort(edges.data(), n, sizeof(_PolyEdge), compare_edges_by_left)
+
+    cdef vector[_EdgeSplit] splits
+    cdef vector[size_t] active
+    cdef const _PolyEdge *e
+    cdef const _PolyEdge *f
+    cdef size_t i, j, k, m
+    cdef double left, bottom, top
+    for i in range(n):
+        e = &edges[i]
+        left = fmin(e.x0, e.x1)
+        bottom = fmin(e.y0, e.y1)
+        top = fmax(e.y0, e.y1)
+        m = 0
+        for k in range(active.size()):
+            j = active[k]
+            f = &edges[j]
+            if fmax(f.x0, f.x1) < left:
+                continue  # and it can't touch any of the following edges
+            active[m] = j
+            m += 1
+            if fmax(f.y0, f.y1) < bottom or fmin(f.y0, f.y1) > top:
+                continue
+            intersect_polygon_edges(edges, i, j, splits)
+        active.resize(m)
+        active.push_back(i)
+
+    if splits.empty():
+        return False
+    qsort(splits.data(), splits.size(), sizeof(_EdgeSplit), compare_edge_splits)
+
+    cdef vector[_PolyEdge] result
+    cdef _PolyEdge piece
+    result.reserve(n + splits.size())
+    k = 0
+    for i in range(n):
+        piece = edges[i]
+        while k < splits.size() and splits[k].edge == i:
+            if splits[k].x != piece.x0 or splits[k].y != piece.y0:
+                piece.x1 = splits[k].x
+                piece.y1 = splits[k].y
+                result.push_back(piece)
+                piece.x0 = piece.x1
+                piece.y0 = piece.y1
+            k += 1
+        piece.x1 = edges[i].x1
+        piece.y1 = edges[i].y1
+        result.push_back(piece)
+    edges.swap(result)
+    return True
+
+
+cdef int merge_polygon_edges(vector[_PolyEdge]& edges) except -1 nogil:
+    # Direct all the edges from their lowest point, so that duplicates sort
+    # next to each other, and merge them; the winding contributions don't
+    # depend on the direction. Drop the edges that don't contribute, except
+    # the horizontal ones, which never do but can still be on the boundary.
+    cdef size_t n = edges.size()
+    cdef size_t i, m = 0
+    cdef _PolyEdge *e
+    for i in range(n):
+        e = &edges[i]
+        if e.x1 < e.x0 or (e.x1 == e.x0 and e.y1 < e.y0):
+            e.x0, e.x1 = e.x1, e.x0
+            e.y0, e.y1 = e.y1, e.y0
+    qsort(edges.data(), n, sizeof(_PolyEdge), compare_edges_by_points)
+    for i in range(n):
+        if m > 0 and compare_edges_by_points(&edges[m - 1], &edges[i]) == 0:
+            edges[m - 1].winding[0] += edges[i].winding[0]
+            edges[m - 1].winding[1] += edges[i].winding[1]
+        else:
+            edges[m] = edges[i]
+            m += 1
+    n = m
+    m = 0
+    for i in range(n):
+        e = &edges[i]
+        if e.y0 != e.y1 and e.winding[0] == 0 and e.winding[1] == 0:
+            continue
+        edges[m] = edges[i]
+        m += 1
+    edges.resize(m)
+    return 0
+
+
+cdef class _PolygonBoolean:
+
+    cdef bint build(
+        self, const SkPathBuilder& one, const SkPathBuilder* two, SkPathOp operator
+    ) except -1 nogil:
+        # Return False if the edges were still being split after the last
+        # pass: some may still cross, and the result would be wrong.
+        cdef int i
+        cdef bint converged = False
+        self.operator = operator
+        self.num_operands = 1 if two is NULL else 2
+        self.fill_types[0] = one.fillType()
+        self.fill_types[1] = SkPathFillType.kWinding
+        add_polygon_edges(one, 0, self.edges)
+        if two is not NULL:
+            self.fill_types[1] = two.fillType()
+            add_polygon_edges(two[0], 1, self.edges)
+        for i in range(MAX_POLYGON_SPLIT_PASSES):
+            if not split_polygon_edges(self.edges):
+                converged = True
+                break
+        if not converged:
+            return False
+        merge_polygon_edges(self.edges)
+        self.build_bands()
+        return True
+
+    cdef int build_bands(self) except -1 nogil:
+        # Sort the non-horizontal edges into horizontal bands, so that a ray
+        # only needs to be tested against the edges in its band.
+        cdef size_t n = self.edges.size()
+        cdef size_t i, b, count = 0
+        cdef const _PolyEdge *e
+        cdef double bottom = 0
+        self.top = 0
+        for i in range(n):
+            e = &self.edges[i]
+            if e.y0 == e.y1:
+                continue
+            if count == 0:
+                self.top = fmin(e.y0, e.y1)
+                bottom = fmax(e.y0, e.y1)
+            else:
+                self.top = fmin(self.top, fmin(e.y0, e.y1))
+                bottom = fmax(bottom, fmax(e.y0, e.y1))
+            count += 1
+        self.num_bands = max(1, min(count, <size_t>MAX_POLYGON_BANDS))
+        self.band_height = (bottom - self.top) / self.num_bands
+        self.band_offsets.assign(self.num_bands + 1, 0)
+        if count == 0:
+            return 0
+
+        # count the edges in each band, then fill them in
+        for i in range(n):
+            e = &self.edges[i]
+            if e.y0 == e.y1:
+                continue
+            for b in range(
+                self.band_index(fmin(e.y0, e.y1)), self.band_index(fmax(e.y0, e.y1)) + 1
+            ):
+                self.band_offsets[b + 1] += 1
+        for b in range(self.num_bands):
+            self.band_offsets[b + 1] += self.band_offsets[b]
+        self.band_edges.resize(self.band_offsets[self.num_bands])
+        cdef vector[size_t] fill = self.band_offsets
+        for i in range(n):
+            e = &self.edges[i]
+            if e.y0 == e.y1:
+                continue
+            for b in range(
+                self.band_index(fmin(e.y0, e.y1)), self.band_index(fmax(e.y0, e.y1)) + 1
+            ):
+                self.band_edges[fill[b]] = i
+                fill[b] += 1
+        return 0
+
+    cdef size_t band_index(self, double y) noexcept nogil:
+        if self.band_height <= 0 or y <= self.top:
+            return 0
+        cdef double b = (y - self.top) / self.band_height
+        if b >= self.num_bands - 1:
+            return self.num_bands - 1
+        return <size_t>b
+
+    cdef void winding_at(
+        self, size_t skip, double x, double y, bint below, int *winding
+    ) noexcept nogil:
+        # Count the winding numbers of the operands at (x, y), along a ray
+        # going left; if 'below', just below y. The point must be in the
+        # middle of the edge at index 'skip', which isn't counted.
+        cdef size_t b = self.band_index(y)
+        cdef size_t k, i
+        cdef const _PolyEdge *e
+        cdef double ymin, ymax, side
+        winding[0] = winding[1] = 0
+        if self.band_offsets.size() <= b + 1:
+            return
+        for k in range(self.band_offsets[b], self.band_offsets[b + 1]):
+            i = self.band_edges[k]
+            if i == skip:
+                continue
+            e = &self.edges[i]
+            # 'side' is negative if the point is right of the upward edge
+            if e.y0 < e.y1:
+                ymin, ymax = e.y0, e.y1
+                side = (e.x1 - e.x0) * (y - e.y0) - (e.y1 - e.y0) * (x - e.x0)
+            else:
+                ymin, ymax = e.y1, e.y0
+                side = (e.x0 - e.x1) * (y - e.y1) - (e.y0 - e.y1) * (x - e.x1)
+            if below:
+                if not ymin < y <= ymax:
+                    continue
+            elif not ymin <= y < ymax:
+                continue
+            if side < 0:
+                winding[0] += e.winding[0]
+                winding[1] += e.winding[1]
+
+    cdef bint inside(self, const int *winding) noexcept nogil:
+        cdef bint a = fill_contains(self.fill_types[0], winding[0])
+        if self.num_operands == 1:
+            return a
+        cdef bint b = fill_contains(self.fill_types[1], winding[1])
+        if self.operator == kDifference_SkPathOp:
+            return a and not b
+        elif self.operator == kIntersect_SkPathOp:
+            return a and b
+        elif self.operator == kUnion_SkPathOp:
+            return a or b
+        elif self.operator == kXOR_SkPathOp:
+            return a != b
         else:
-            raise NumberOfPointsError("qCurveTo requires at least 1 point; got 0")
+            return b and not a
+
+    cdef int resolve(self, SkPathBuilder& result) except -1 nogil:
+        cdef vector[_PolyEdge] kept
+        cdef _PolyEdge e
+        cdef size_t i
+        cdef double x, y
+        cdef int left[2]
+        cdef int right[2]
+        cdef bint inside_left, inside_right
+        for i in range(self.edges.size()):
+            e = self.edges[i]
+            x = (e.x0 + e.x1) / 2
+            y = (e.y0 + e.y1) / 2
+            if e.y0 == e.y1:
+                # the edge goes right, so its left is above it
+                self.winding_at(i, x, y, False, left)
+                self.winding_at(i, x, y, True, right)
+            else:
+                self.winding_at(i, x, y, False, left)
+                right[0] = left[0] + e.winding[0]
+                right[1] = left[1] + e.winding[1]
+                # the left of the edge is on the left if it goes up
+                if e.y0 > e.y1:
+                    left[0], right[0] = right[0], left[0]
+                    left[1], right[1] = right[1], left[1]
+            inside_left = self.inside(left)
+            inside_right = self.inside(right)
+            if inside_left == inside_right:
+                continue
+            if inside_right:
+                e.x0, e.x1 = e.x1, e.x0
+                e.y0, e.y1 = e.y1, e.y0
+            kept.push_back(e)
+
+        left[0] = left[1] = 0
+        if self.inside(left):
+            result.setFillType(SkPathFillType.kInverseEvenOdd)
+        else:
+            result.setFillType(SkPathFillType.kEvenOdd)
+        join_polygon_edges(kept, result)
+        return 0
 
-    cdef _qCurveToOne(self, pt1, pt2):
-        self.path.quadTo(pt1[0], pt1[1], pt2[0], pt2[1])
 
-    cpdef closePath(self):
-        self.path.close()
+cdef inline bint fill_contains(SkPathFillType fill_type, int winding) noexcept nogil:
+    cdef bint inside
+    if (
+        fill_type == SkPathFillType.kEvenOdd
+        or fill_type == SkPathFillType.kInverseEvenOdd
+    ):
+        inside = winding & 1
+    else:
+        inside = winding != 0
+    if (
+        fill_type == SkPathFillType.kInverseWinding
+        or fill_type == SkPathFillType.kInverseEvenOdd
+    ):
+        return not inside
+    return inside
+
+
+cdef size_t next_polygon_edge(const vector[_PolyEdge]& edges, size_t i) noexcept nogil:
+    # Return the edge following edges[i] on the boundary of the same face: the
+    # first one clockwise from edges[i] reversed, among those starting where
+    # it ends (the edges are sorted by their start point). If there is none,
+    # which can only be due to rounding, return i.
+    cdef const _PolyEdge *e = &edges[i]
+    cdef double x = e.x1, y = e.y1
+    cdef double rx = e.x0 - x, ry = e.y0 - y
+    cdef double dx, dy, angle, best_angle = 0
+    cdef size_t lo = 0, hi = edges.size(), mid, best = i
+    # binary search for the first edge starting at (x, y)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if edges[mid].x0 < x or (edges[mid].x0 == x and edges[mid].y0 < y):
+            lo = mid + 1
+        else:
+            hi = mid
+    while lo < edges.size() and edges[lo].x0 == x and edges[lo].y0 == y:
+        dx = edges[lo].x1 - x
+        dy = edges[lo].y1 - y
+        angle = atan2(dx * ry - dy * rx, rx * dx + ry * dy)
+        if angle <= 0:
+            angle += 2 * M_PI
+        if best == i or angle < best_angle:
+            best = lo
+            best_angle = angle
+        lo += 1
+    return best
+
+
+cdef inline bint is_straight(
+    const SkPoint& p1, const SkPoint& p2, const SkPoint& p3
+) noexcept nogil:
+    # p2 is on the segment from p1 to p3, and different from both
+    cdef double dx1 = <double>p2.x() - p1.x(), dy1 = <double>p2.y() - p1.y()
+    cdef double dx2 = <double>p3.x() - p2.x(), dy2 = <double>p3.y() - p2.y()
+    return dx1 * dy2 - dy1 * dx2 == 0 and dx1 * dx2 + dy1 * dy2 > 0
+
+
+cdef int add_polygon_contour(vector[SkPoint]& pts, SkPathBuilder& result) except -1 nogil:
+    # drop the points in the middle of straight lines, also across the start
+    cdef size_t i, start = 0, m = 0
+    for i in range(pts.size()):
+        while m >= 2 and is_straight(pts[m - 2], pts[m - 1], pts[i]):
+            m -= 1
+        pts[m] = pts[i]
+        m += 1
+    while m - start > 2:
+        if is_straight(pts[m - 2], pts[m - 1], pts[start]):
+            m -= 1
+        elif is_straight(pts[m - 1], pts[start], pts[start + 1]):
+            start += 1
+        else:
+            break
+    if m - start < 3:
+        return 0
+    result.moveTo(pts[start])
+    for i in range(start + 1, m):
+        result.lineTo(pts[i])
+    result.close()
+    return 0
 
-    cpdef endPath(self):
-        if not self.allow_open_paths:
-            raise OpenPathError()
 
-    cpdef addComponent(self, glyphName, transformation):
-        if self.glyphSet is None:
-            raise TypeError("Missing required glyphSet; can't decompose components")
+cdef int join_polygon_edges(
+    vector[_PolyEdge]& edges, SkPathBuilder& result
+) except -1 nogil:
+    cdef size_t n = edges.size()
+    cdef size_t start, i
+    cdef vector[uint8_t] used
+    cdef vector[SkPoint] pts
+    qsort(edges.data(), n, sizeof(_PolyEdge), compare_edges_by_points)
+    used.assign(n, 0)
+    for start in range(n):
+        if used[start]:
+            continue
+        pts.clear()
+        i = start
+        while not used[i]:
+            used[i] = 1
+            pts.push_back(SkPoint.Make(edges[i].x0, edges[i].y0))
+            i = next_polygon_edge(edges, i)
+        add_polygon_contour(pts, result)
+    return 0
 
-        base_glyph = self.glyphSet[glyphName]
-        cdef Path base_path = Path()
-        base_glyph.draw(base_path.getPen(glyphSet=self.glyphSet))
-        cdef Path component_path = base_path.transform(*transformation)
 
-        self.path.addPath(component_path)
+cdef bint polygon_boolean(
+    const SkPathBuilder& one,
+    const SkPathBuilder* two,
+    SkPathOp operator,
+    SkPathBuilder& result,
+) except -1:
+    # Return False, leaving 'result' untouched, if the polygon engine can't
+    # guarantee the result, for the caller to fall back to Skia.
+    cdef _PolygonBoolean engine = _PolygonBoolean.__new__(_PolygonBoolean)
+    cdef bint converged
+    with nogil:
+        converged = engine.build(one, two, operator)
+        if converged:
+            engine.resolve(result)
+    return converged
+
+
+cdef int set_stroke_paint(
+    SkPaint *paint,
+    SkScalar width,
+    LineCap cap,
+    LineJoin join,
+    SkScalar miter_limit,
+    object dash_array,
+    SkScalar dash_offset,
+) except -1:
+    cdef _SkScalarArray intervals
+
+    paint.setStyle(SkPaintStyle.kStroke_Style)
+    paint.setStrokeWidth(width)
+    paint.setStrokeCap(<SkLineCap>cap)
+    paint.setStrokeJoin(<SkLineJoin>join)
+    paint.setStrokeMiter(miter_limit)
+
+    if dash_array:
+        intervals = _SkScalarArray.create(dash_array)
+        if intervals.count % 2 != 0:
+            raise ValueError("Expected an even number of dash_array entries")
+        paint.setPathEffect(
+            SkDashPathEffect.Make(<SkSpan[const SkScalar]>intervals.as_span(), dash_offset)
+        )
+    return 0
 
 
-cdef double get_path_area(const SkPathBuilder& path) except? -1234567:
-    # Adapted from fontTools/pens/areaPen.py
-    cdef double value = .0
-    cdef SkPathVerb verb
-    cdef SkSpan[const SkPoint] p
-    cdef SkPoint p0, start_point
-    cdef SkScalar x0, y0, x1, y1, x2, y2, x3, y3
+cdef int close_contours(const SkPathBuilder& path, SkPathBuilder& result) except -1:
+    # Copy the path to 'result', closing all the open contours.
     cdef optional[SkPathIter] iterator = path.iter()
-    cdef bint need_close = False
     cdef optional[SkPathIter.Rec] rec
+    cdef SkPathVerb verb
+    cdef SkSpan[const SkPoint] p
+    cdef bint is_open = False
 
-    p0 = start_point = SkPoint.Make(.0, .0)
+    result.setFillType(path.fillType())
     while True:
         rec = iterator.value().next()
         if not rec.has_value():
@@ -1036,76 +4226,26 @@ cdef double get_path_area(const SkPathBuilder& path) except? -1234567:
         verb = rec.value().fVerb
         p = rec.value().fPoints
         if verb == SkPathVerb.kMove:
-            if need_close:
-                x0, y0 = p0.x(), p0.y()
-                x1, y1 = start_point.x(), start_point.y()
-                value -= (x1 - x0) * (y1 + y0) * .5
-            p0 = start_point = p[0]
-            need_close = True
+            if is_open:
+                result.close()
+            result.moveTo(p[0])
+            is_open = True
         elif verb == SkPathVerb.kLine:
-            x0, y0 = p0.x(), p0.y()
-            x1, y1 = p[1].x(), p[1].y()
-            value -= (x1 - x0) * (y1 + y0) * .5
-            p0 = p[1]
+            result.lineTo(p[1])
         elif verb == SkPathVerb.kQuad:
-            # https://github.com/Pomax/bezierinfo/issues/44
-            x0, y0 = p0.x(), p0.y()
-            x1, y1 = p[1].x() - x0, p[1].y() - y0
-            x2, y2 = p[2].x() - x0, p[2].y() - y0
-            value -= (x2 * y1 - x1 * y2) / 3
-            value -= (p[2].x() - x0) * (p[2].y() + y0) * .5
-            p0 = p[2]
+            result.quadTo(p[1], p[2])
         elif verb == SkPathVerb.kConic:
-            raise UnsupportedVerbError("CONIC")
+            result.conicTo(p[1], p[2], rec.value().conicWeight())
         elif verb == SkPathVerb.kCubic:
-            # https://github.com/Pomax/bezierinfo/issues/44
-            x0, y0 = p0.x(), p0.y()
-            x1, y1 = p[1].x() - x0, p[1].y() - y0
-            x2, y2 = p[2].x() - x0, p[2].y() - y0
-            x3, y3 = p[3].x() - x0, p[3].y() - y0
-            value -= (
-                       x1 * (   -   y2 -   y3) +
-                       x2 * (y1        - 2*y3) +
-                       x3 * (y1 + 2*y2       )
-                     ) * 0.15
-            value -= (p[3].x() - x0) * (p[3].y() + y0) * .5
-            p0 = p[3]
+            result.cubicTo(p[1], p[2], p[3])
         elif verb == SkPathVerb.kClose:
-            x0, y0 = p0.x(), p0.y()
-            x1, y1 = start_point.x(), start_point.y()
-            value -= (x1 - x0) * (y1 + y0) * .5
-            p0 = start_point = SkPoint.Make(.0, .0)
-            need_close = False
+            result.close()
+            is_open = False
         else:
             raise AssertionError(verb)
-
-    if need_close:
-        x0, y0 = p0.x(), p0.y()
-        x1, y1 = start_point.x(), start_point.y()
-        value -= (x1 - x0) * (y1 + y0) * .5
-
-    return value
-
-
-cdef class _SkScalarArray:
-
-    @staticmethod
-    cdef _SkScalarArray create(object values):
-        # 'values' must be a sequence (e.g. list or tuple) of floats
-        cdef _SkScalarArray self = _SkScalarArray.__new__(_SkScalarArray)
-        self.count = len(values)
-        self.data = <SkScalar *> PyMem_Malloc(self.count * sizeof(SkScalar))
-        if not self.data:
-            raise MemoryError()
-        for i, v in enumerate(values):
-            self.data[i] = v
-        return self
-
-    def __dealloc__(self):
-        PyMem_Free(self.data)  # no-op if data is NULL
-
-    cdef SkSpan[SkScalar] as_span(self):
-        return SkSpan[SkScalar](self.data, self.count)
+    if is_open:
+        result.close()
+    return 0
 
 
 cdef inline int pts_in_verb(SkPathVerb v) except -1:
@@ -1115,7 +4255,8 @@ cdef inline int pts_in_verb(SkPathVerb v) except -1:
 
 
 cdef bint reverse_contour(SkPathBuilder& path) except False:
-    cdef SkPathBuilder temp
+    cdef ScratchBuilder scratch
+    cdef SkPathBuilder *temp
     cdef SkPoint lastPt
     cdef optional[SkPoint] maybeLastPt = path.getLastPt()
 
@@ -1131,6 +4272,7 @@ cdef bint reverse_contour(SkPathBuilder& path) except False:
     cdef const SkPoint *pts = pa.end() - 1  # pointer to the last point
 
     # the last point becomes the first
+    temp = scratch.get()
     temp.moveTo(lastPt)
 
     cdef SkPathVerb v
@@ -1163,7 +4305,7 @@ cdef bint reverse_contour(SkPathBuilder& path) except False:
     # assignment to references is allowed in C++ but Cython doesn't support it
     # https://github.com/cython/cython/issues/1863
     # path = temp
-    (&path)[0] = temp
+    (&path)[0] = temp[0]
     return True
 
 
@@ -1214,28 +4356,52 @@ cdef int path_is_inside(const SkPathBuilder& self, const SkPathBuilder& other) e
 cpdef int restore_starting_points(Path path, list points) except -1:
     if not points:
         return 0
+    cdef vector[SkPoint] first_points
+    first_points.reserve(len(points))
+    for pt in points:
+        first_points.push_back(SkPoint.Make(pt[0], pt[1]))
+    return restore_first_points(path, first_points)
+
+
+cdef int append_first_points(
+    const SkPathBuilder& path, vector[SkPoint]& points
+) except -1:
+    cdef SkSpan[const SkPathVerb] verbs = path.verbs()
+    cdef SkSpan[const SkPoint] pts = path.points()
+    cdef size_t i
+    cdef size_t j = 0
+    for i in range(verbs.size()):
+        if verbs[i] == SkPathVerb.kMove:
+            points.push_back(pts[j])
+        j += pts_in_verb(verbs[i])
+    return 0
+
+
+cdef int restore_first_points(Path path, vector[SkPoint]& points) except -1:
+    # Same as restore_starting_points; the points that were used are removed.
+    if points.empty():
+        return 0
 
     cdef list contours = list(path.contours)
     cdef Py_ssize_t n = len(contours)
-    cdef Py_ssize_t m = len(points)
-    cdef int i, j
+    cdef size_t j
+    cdef int i
     cdef Path this
     cdef bint modified = False
 
     for i in range(n):
         this = contours[i]
-        for j in range(m):
-            pt = points[j]
-            if set_contour_start_point(this.path, pt[0], pt[1]):
+        for j in range(points.size()):
+            if set_contour_start_point(this.path, points[j].x(), points[j].y()):
                 modified = True
                 # we don't retry the same point again on a different contour
-                del points[j]
-                m -= 1
+                points.erase(points.begin() + j)
                 break
 
     if not modified:
         return 0
 
+    path.invalidate()
     path.path.reset()
     for i in range(n):
         this = contours[i]
@@ -1273,7 +4439,7 @@ cpdef bint winding_from_even_odd(Path path, bint clockwise=False) except False:
     cdef dict contours_by_area = {}
     cdef object area
     for contour in path.contours:
-        area = -fabs(get_path_area(contour.path))
+        area = -fabs(contour.signed_area())
         if area not in contours_by_area:
             contours_by_area[area] = []
         contours_by_area[area].append(contour)
@@ -1283,46 +4449,42 @@ cpdef bint winding_from_even_odd(Path path, bint clockwise=False) except False:
         contours.extend(group)
     cdef Py_ssize_t n = len(contours)
 
-    # XXX permature optimization? needs profile
-    cdef size_t* nested
-    nested = <size_t*>PyMem_Malloc(n * sizeof(size_t))
-    if not nested:
-        raise MemoryError()
+    cdef ScratchBuffer scratch
+    cdef size_t* nested = <size_t*>scratch.get(n * sizeof(size_t))
     memset(nested, 0, n * sizeof(size_t))
-    try:
-        # increment the nesting level when a contour is inside another
-        for i in range(n):
-            contour = contours[i]
-            for j in range(i + 1, n):
-                other = contours[j]
-                if path_is_inside(contour.path, other.path):
-                    nested[j] += 1
 
-        IF DEBUG_WINDING:
-            print("nested: ", end="")
-            for i in range(n):
-                print(nested[i], end=" ")
-            print("")
+    # increment the nesting level when a contour is inside another
+    for i in range(n):
+        contour = contours[i]
+        for j in range(i + 1, n):
+            other = contours[j]
+            if path_is_inside(contour.path, other.path):
+                nested[j] += 1
 
-        # reverse a contour when its winding and even-odd number disagree;
-        # for TrueType, set the outermost direction to clockwise
+    IF DEBUG_WINDING:
+        print("nested: ", end="")
         for i in range(n):
-            contour = contours[i]
-            is_clockwise = get_path_area(contour.path) < .0
-            is_even = not (nested[i] & 1)
+            print(nested[i], end=" ")
+        print("")
+
+    # reverse a contour when its winding and even-odd number disagree;
+    # for TrueType, set the outermost direction to clockwise
+    for i in range(n):
+        contour = contours[i]
+        is_clockwise = contour.signed_area() < .0
+        is_even = not (nested[i] & 1)
 
+        IF DEBUG_WINDING:
+            print(
+                "%d: inverse=%s is_clockwise=%s is_even=%s"
+                % (i, inverse, is_clockwise, is_even)
+            )
+        if inverse ^ is_clockwise ^ is_even:
             IF DEBUG_WINDING:
-                print(
-                    "%d: inverse=%s is_clockwise=%s is_even=%s"
-                    % (i, inverse, is_clockwise, is_even)
-                )
-            if inverse ^ is_clockwise ^ is_even:
-                IF DEBUG_WINDING:
-                    print("reverse_contour %d" % i)
-                reverse_contour(contour.path)
-    finally:
-        PyMem_Free(nested)
+                print("reverse_contour %d" % i)
+            reverse_contour(contour.path)
 
+    path.invalidate()
     path.path.reset()
     for i in range(n):
         contour = contours[i]
@@ -1353,6 +4515,69 @@ cdef list _decompose_quadratic_segment(tuple points):
     return quad_segments
 
 
+cdef int add_truetype_contour(
+    SkPathBuilder& path, const SkPoint *pts, const uint8_t *on_curve, int n
+) except -1:
+    cdef int i, j, k
+    cdef SkPoint off
+    cdef bint has_off = False
+
+    if n <= 0:
+        return 0
+
+    for k in range(n):
+        if on_curve[k]:
+            break
+    else:
+        # TrueType closed quadratic spline without on-curve points: start
+        # from the implied on-curve point between the last and first off-curves
+        path.moveTo(midpoint(pts[n - 1], pts[0]))
+        for i in range(n):
+            path.quadTo(pts[i], midpoint(pts[i], pts[(i + 1) % n]))
+        path.close()
+        return 1
+
+    # start from the first on-curve point and go round back to it
+    path.moveTo(pts[k])
+    for j in range(1, n + 1):
+        i = (k + j) % n
+        if on_curve[i]:
+            if has_off:
+                path.quadTo(off, pts[i])
+                has_off = False
+            elif j < n:
+                # the closing lineTo is implied by close()
+                path.lineTo(pts[i])
+        else:
+            if has_off:
+                path.quadTo(off, midpoint(off, pts[i]))
+            off = pts[i]
+            has_off = True
+    path.close()
+    return 1
+
+
+cdef int end_truetype_contour(
+    list coords, bytearray flags, list end_pts, Py_ssize_t start
+) except -1:
+    # if the contour is a single quadratic spline (its first point is the only
+    # on-curve one) and that point is implied by the last and first off-curve
+    # points, drop it as well
+    cdef Py_ssize_t last = len(coords) - 1
+    if (
+        last - start >= 2
+        and flags.find(1, start + 1) == -1
+        and is_middle_point(
+            sk_point(coords[last]), sk_point(coords[start]), sk_point(coords[start + 1])
+        )
+    ):
+        del coords[start]
+        del flags[start]
+        last -= 1
+    end_pts.append(last)
+    return 0
+
+
 cdef int find_oncurve_point(
     SkScalar x,
     SkScalar y,
@@ -1429,7 +4654,8 @@ cdef int set_contour_start_point(SkPathBuilder& path, SkScalar x, SkScalar y) ex
         reverse_contour(path)
         return 1
 
-    cdef SkPathBuilder temp
+    cdef ScratchBuilder scratch
+    cdef SkPathBuilder *temp = scratch.get()
     temp.setFillType(path.fillType())
 
     cdef SkPathVerb first_verb
@@ -1499,7 +4725,302 @@ cdef int set_contour_start_point(SkPathBuilder& path, SkScalar x, SkScalar y) ex
         temp.cubicTo(pts[pi], pts[pi + 1], pts[pi + 2])
 
     temp.close()
-    (&path)[0] = temp
+    (&path)[0] = temp[0]
+    return 1
+
+
+# Cubic to quadratic conversion, ported from fontTools.cu2qu:
+# https://github.com/fonttools/fonttools/blob/main/Lib/fontTools/cu2qu/cu2qu.py
+
+DEF MAX_CU2QU_SEGMENTS = 100
+
+
+cdef int convert_cubics_to_quads(
+    list paths, const double *max_errors, bint all_quadratic
+) except -1:
+    # Convert the cubics of all the (compatible) paths in place; the cubics at
+    # the same position are approximated with the same number of segments.
+    cdef Py_ssize_t num_paths = len(paths)
+    cdef Py_ssize_t k, j, i, last_i, pi = 0, wi = 0
+    cdef Path first, path
+    cdef SkPathBuilder result
+    cdef SkSpan[const SkPathVerb] verbs
+    cdef const SkPoint **points = NULL
+    cdef const SkScalar **weights = NULL
+    cdef double complex *splines = NULL
+    cdef double complex *spline
+    cdef double complex cubic[4]
+    cdef list results
+    cdef SkPoint on_curve
+    cdef int n, kind
+
+    if num_paths == 0:
+        return 0
+    first = paths[0]
+    for k in range(1, num_paths):
+        path = paths[k]
+        if path.getVerbs() != first.getVerbs():
+            raise IncompatiblePathsError(
+                "path %d is not compatible with path 0" % k
+            )
+    for verb in first.path.verbs():
+        if verb == SkPathVerb.kCubic:
+            break
+    else:
+        return 0
+
+    points = <const SkPoint **> PyMem_Malloc(num_paths * sizeof(SkPoint *))
+    weights = <const SkScalar **> PyMem_Malloc(num_paths * sizeof(SkScalar *))
+    splines = <double complex *> PyMem_Malloc(
+        num_paths * (MAX_CU2QU_SEGMENTS + 2) * sizeof(double complex)
+    )
+    if not points or not weights or not splines:
+        PyMem_Free(points)
+        PyMem_Free(weights)
+        PyMem_Free(splines)
+        raise MemoryError()
+
+    try:
+        results = []
+        for k in range(num_paths):
+            path = paths[k]
+            points[k] = path.path.points().data()
+            weights[k] = path.path.conicWeights().data()
+            result = SkPathBuilder()
+            result.setFillType(path.path.fillType())
+            results.append(Path.create(result))
+
+        verbs = first.path.verbs()
+        for verb in verbs:
+            if verb == SkPathVerb.kCubic:
+                # try increasing numbers of segments in round-robin, until
+                # the cubics in all the paths fit within their errors
+                n = 1
+                i = last_i = 0
+                while True:
+                    for j in range(4):
+                        cubic[j] = (
+                            points[i][pi - 1 + j].x()
+                            + points[i][pi - 1 + j].y() * 1j
+                        )
+                    kind = cubic_approx_spline(
+                        cubic,
+                        n,
+                        max_errors[i],
+                        all_quadratic,
+                        splines + i * (MAX_CU2QU_SEGMENTS + 2),
+                    )
+                    if not kind:
+                        if n == MAX_CU2QU_SEGMENTS:
+                            raise PathOpsError(
+                                "could not approximate cubic with quadratic "
+                                "curves within max_err"
+                            )
+                        n += 1
+                        last_i = i
+                        continue
+                    i = (i + 1) % num_paths
+                    if i == last_i:
+                        break
+
+            for k in range(num_paths):
+                path = results[k]
+                if verb == SkPathVerb.kMove:
+                    path.path.moveTo(points[k][pi])
+                elif verb == SkPathVerb.kLine:
+                    path.path.lineTo(points[k][pi])
+                elif verb == SkPathVerb.kQuad:
+                    path.path.quadTo(points[k][pi], points[k][pi + 1])
+                elif verb == SkPathVerb.kConic:
+                    path.path.conicTo(
+                        points[k][pi], points[k][pi + 1], weights[k][wi]
+                    )
+                elif verb == SkPathVerb.kCubic:
+                    if kind == 2:
+                        path.path.cubicTo(
+                            points[k][pi], points[k][pi + 1], points[k][pi + 2]
+                        )
+                        continue
+                    spline = splines + k * (MAX_CU2QU_SEGMENTS + 2)
+                    for j in range(1, n + 1):
+                        if j == n:
+                            on_curve = points[k][pi + 2]
+                        else:
+                            on_curve = SkPoint.Make(
+                                0.5 * (spline[j].real + spline[j + 1].real),
+                                0.5 * (spline[j].imag + spline[j + 1].imag),
+                            )
+                        path.path.quadTo(
+                            SkPoint.Make(spline[j].real, spline[j].imag),
+                            on_curve,
+                        )
+                elif verb == SkPathVerb.kClose:
+                    path.path.close()
+                else:
+                    raise UnsupportedVerbError(verb)
+
+            if verb == SkPathVerb.kConic:
+                wi += 1
+            pi += pts_in_verb(verb)
+    finally:
+        PyMem_Free(points)
+        PyMem_Free(weights)
+        PyMem_Free(splines)
+
+    for k in range(num_paths):
+        path = paths[k]
+        path.invalidate()
+        path.path = (<Path>results[k]).path
+    return 0
+
+
+cdef inline double dot(double complex a, double complex b) noexcept:
+    return a.real * b.real + a.imag * b.imag
+
+
+cdef inline double complex cubic_approx_control(
+    double t,
+    double complex p0,
+    double complex p1,
+    double complex p2,
+    double complex p3,
+) noexcept:
+    cdef double complex _p1 = p0 + (p1 - p0) * 1.5
+    cdef double complex _p2 = p3 + (p2 - p3) * 1.5
+    return _p1 + (_p2 - _p1) * t
+
+
+cdef bint calc_intersect(
+    double complex a,
+    double complex b,
+    double complex c,
+    double complex d,
+    double complex *result,
+) noexcept:
+    # intersection of the lines a-b and c-d; False if they're parallel
+    cdef double complex ab = b - a
+    cdef double complex cd = d - c
+    cdef double complex p = ab * 1j
+    cdef double denom = dot(p, cd)
+    if denom == 0:
+        # if either line is degenerate and they touch, b is the intersection
+        if b == c and (a == b or c == d):
+            result[0] = b
+            return True
+        return False
+    result[0] = c + cd * (dot(p, a - c) / denom)
+    return True
+
+
+cdef bint cubic_farthest_fit_inside(
+    double complex p0,
+    double complex p1,
+    double complex p2,
+    double complex p3,
+    double tolerance,
+) noexcept:
+    # whether the cubic with the given control points (the differences
+    # between two curves) stays within 'tolerance' from the origin
+    cdef double complex mid, deriv3
+    if abs(p2) <= tolerance and abs(p1) <= tolerance:
+        return True
+    mid = (p0 + 3 * (p1 + p2) + p3) * 0.125
+    if abs(mid) > tolerance:
+        return False
+    deriv3 = (p3 + p2 - p1 - p0) * 0.125
+    return cubic_farthest_fit_inside(
+        p0, (p0 + p1) * 0.5, mid - deriv3, mid, tolerance
+    ) and cubic_farthest_fit_inside(
+        mid, mid + deriv3, (p2 + p3) * 0.5, p3, tolerance
+    )
+
+
+cdef int cubic_approx_spline(
+    const double complex *cubic,
+    int n,
+    double tolerance,
+    bint all_quadratic,
+    double complex *spline,
+) noexcept:
+    # Approximate the cubic with a spline of n quadratic segments, stored in
+    # 'spline' as the start point, n off-curve points and the end point.
+    # Return 1 on success, 0 if it doesn't fit within tolerance, or 2 if the
+    # cubic should be kept (only when not 'all_quadratic').
+    cdef double complex q0, q1, q2, next_q1, d0, d1, c0, c1, c2, c3
+    cdef double complex a, b, c, d, a1, b1, c1_, d1_
+    cdef double complex next_cubic[4]
+    cdef double dt, t1, t1_2, delta_2, delta_3
+    cdef int i
+
+    if n == 1:
+        if not calc_intersect(cubic[0], cubic[1], cubic[2], cubic[3], &q1):
+            return 0
+        c1 = cubic[0] + (q1 - cubic[0]) * (2.0 / 3.0)
+        c2 = cubic[3] + (q1 - cubic[3]) * (2.0 / 3.0)
+        if not cubic_farthest_fit_inside(
+            0, c1 - cubic[1], c2 - cubic[2], 0, tolerance
+        ):
+            return 0
+        spline[0] = cubic[0]
+        spline[1] = q1
+        spline[2] = cubic[3]
+        return 1
+    if n == 2 and not all_quadratic:
+        return 2
+
+    # the polynomial coefficients, used to split the cubic in n pieces
+    c = (cubic[1] - cubic[0]) * 3.0
+    b = (cubic[2] - cubic[1]) * 3.0 - c
+    d = cubic[0]
+    a = cubic[3] - d - c - b
+    dt = 1.0 / n
+    delta_2 = dt * dt
+    delta_3 = dt * delta_2
+
+    q2 = cubic[0]
+    d1 = 0
+    spline[0] = cubic[0]
+    for i in range(n + 1):
+        if i < n:
+            # the i-th of the n pieces of the cubic
+            t1 = i * dt
+            t1_2 = t1 * t1
+            a1 = a * delta_3
+            b1 = (3 * a * t1 + b) * delta_2
+            c1_ = (2 * b * t1 + c + 3 * a * t1_2) * dt
+            d1_ = a * t1 * t1_2 + b * t1_2 + c * t1 + d
+            next_cubic[0] = d1_
+            next_cubic[1] = c1_ / 3.0 + d1_
+            next_cubic[2] = (b1 + c1_) / 3.0 + next_cubic[1]
+            next_cubic[3] = a1 + d1_ + c1_ + b1
+            next_q1 = cubic_approx_control(
+                i / (n - 1.0), next_cubic[0], next_cubic[1], next_cubic[2], next_cubic[3]
+            )
+            spline[i + 1] = next_q1
+        if i == 0:
+            c0, c1, c2, c3 = next_cubic[0], next_cubic[1], next_cubic[2], next_cubic[3]
+            q1 = next_q1
+            continue
+        # check the quadratic approximating the previous piece
+        q0 = q2
+        if i < n:
+            q2 = (q1 + next_q1) * 0.5
+        else:
+            q2 = c3
+        d0 = d1
+        d1 = q2 - c3
+        if abs(d1) > tolerance or not cubic_farthest_fit_inside(
+            d0,
+            q0 + (q1 - q0) * (2.0 / 3.0) - c1,
+            q2 + (q1 - q2) * (2.0 / 3.0) - c2,
+            d1,
+            tolerance,
+        ):
+            return 0
+        if i < n:
+            c0, c1, c2, c3 = next_cubic[0], next_cubic[1], next_cubic[2], next_cubic[3]
+            q1 = next_q1
+    spline[n + 1] = cubic[3]
     return 1
 
 
@@ -1534,6 +5055,16 @@ cdef int compute_conic_to_quad_pow2(
     return pow2
 
 
+cdef SkPath operand_snapshot(Path path, bint cleanup) except *:
+    # Return the path's snapshot, or a cleaned up copy, leaving it unchanged.
+    cdef SkPathBuilder temp
+    if not cleanup:
+        return path.snapshot()
+    temp = path.path
+    cleanup_path(temp, SK_ScalarNearlyZero)
+    return temp.detach()
+
+
 cpdef Path op(
     Path one,
     Path two,
@@ -1541,19 +5072,35 @@ cpdef Path op(
     bint fix_winding=True,
     bint keep_starting_points=True,
     bint clockwise=False,
+    SkScalar round_to=0,
+    bint cleanup=False,
+    bint polygon_engine=False,
 ):
     cdef list first_points
     if keep_starting_points:
         first_points = one.firstPoints + two.firstPoints
-    cdef optional[SkPath] skresult = Op(one.path.snapshot(), two.path.snapshot(), operator)
-    if not skresult.has_value():
-        raise PathOpsError("operation did not succeed")
+    cdef SkPath skone = operand_snapshot(one, cleanup)
+    cdef SkPath sktwo = operand_snapshot(two, cleanup)
+    cdef SkPathBuilder polyone, polytwo
+    cdef bint resolved = False
+    cdef optional[SkPath] skresult
     cdef Path result = Path()
-    result.path = skresult.value()
+    if polygon_engine and is_polygon(one.path) and is_polygon(two.path):
+        polyone = skone
+        polytwo = sktwo
+        resolved = polygon_boolean(polyone, &polytwo, operator, result.path)
+    if not resolved:
+        with nogil:
+            skresult = Op(skone, sktwo, operator)
+        if not skresult.has_value():
+            raise PathOpsError("operation did not succeed")
+        result.path = skresult.value()
     if fix_winding:
         winding_from_even_odd(result, clockwise)
     if keep_starting_points:
         restore_starting_points(result, first_points)
+    if round_to > 0:
+        result.quantize(round_to)
     return result
 
 
@@ -1562,22 +5109,150 @@ cpdef Path simplify(
     bint fix_winding=True,
     bint keep_starting_points=True,
     bint clockwise=False,
+    SkScalar round_to=0,
+    bint cleanup=False,
+    bint polygon_engine=False,
 ):
     cdef list first_points
     if keep_starting_points:
         first_points = path.firstPoints
-    cdef optional[SkPath] skresult = Simplify(path.path.snapshot())
+    cdef SkPath skpath = operand_snapshot(path, cleanup)
+    cdef SkPathBuilder polygon
+    cdef bint resolved = False
+    cdef optional[SkPath] skresult
+    cdef Path result = Path()
+    if polygon_engine and is_polygon(path.path):
+        polygon = skpath
+        resolved = polygon_boolean(polygon, NULL, kUnion_SkPathOp, result.path)
+    if not resolved:
+        with nogil:
+            skresult = Simplify(skpath)
+        if not skresult.has_value():
+            raise PathOpsError("operation did not succeed")
+        result.path = skresult.value()
+    if fix_winding:
+        winding_from_even_odd(result, clockwise)
+    if keep_starting_points:
+        restore_starting_points(result, first_points)
+    if round_to > 0:
+        result.quantize(round_to)
+    return result
+
+
+cpdef Path outline_stroke(
+    Path path,
+    SkScalar width,
+    LineCap cap,
+    LineJoin join,
+    SkScalar miter_limit,
+    object dash_array=None,
+    SkScalar dash_offset=0.0,
+    bint fix_winding=True,
+    bint clockwise=False,
+):
+    """Return a new simplified Path with the outline of the stroked 'path'.
+
+    Equivalent to calling Path.stroke(..., simplify=True) on a copy of the
+    input path, without modifying the latter.
+    """
+    cdef SkPaint paint = SkPaint()
+    cdef SkPathBuilder stroked
+
+    set_stroke_paint(
+        &paint, width, cap, join, miter_limit, dash_array, dash_offset
+    )
+    FillPathWithPaint(path.snapshot(), paint, &stroked)
+
+    cdef SkPath skpath = stroked.detach()
+    cdef optional[SkPath] skresult
+    with nogil:
+        skresult = Simplify(skpath)
     if not skresult.has_value():
         raise PathOpsError("operation did not succeed")
     cdef Path result = Path()
     result.path = skresult.value()
     if fix_winding:
         winding_from_even_odd(result, clockwise)
-    if keep_starting_points:
-        restore_starting_points(result, first_points)
     return result
 
 
+def cubics_to_quads(paths, max_err=1.0, bint all_quadratic=True):
+    """Like Path.cubics_to_quads, for a list of compatible paths (e.g. the
+    masters of a variable glyph), which are modified in place.
+
+    The cubics at the same position in each path are converted to splines
+    with the same number of segments, so the results stay compatible.
+    'max_err' can also be a sequence with the maximum error for each path.
+    Raise IncompatiblePathsError if the paths don't have the same verbs.
+    """
+    paths = list(paths)
+    cdef Py_ssize_t n = len(paths)
+    if isinstance(max_err, (int, float)):
+        max_err = [max_err] * n
+    elif len(max_err) != n:
+        raise ValueError("expected %d max_err values, found %d" % (n, len(max_err)))
+    cdef double *max_errors = <double *> PyMem_Malloc(max(n, 1) * sizeof(double))
+    if not max_errors:
+        raise MemoryError()
+    try:
+        for i in range(n):
+            max_errors[i] = max_err[i]
+        convert_cubics_to_quads(paths, max_errors, all_quadratic)
+    finally:
+        PyMem_Free(max_errors)
+
+
+def metrics(paths):
+    """Compute the geometric metrics of many paths in one go.
+
+    The area, direction, control point bounds and contour count of each path
+    are computed in a single walk over its verbs and points; the tight bounds
+    are computed by Skia.
+
+    Return a dict of lists, with one item per path for each of these keys:
+
+    - "area": the absolute area, like Path.area;
+    - "clockwise": the direction, like Path.clockwise;
+    - "bounds" and "controlPointBounds": (xMin, yMin, xMax, yMax) tuples, or
+      None for empty paths, like the Path properties of the same name;
+    - "contours": the number of contours, like len(path);
+    - "points": the number of points, including off-curve points.
+
+    The lists can be passed as is to e.g. numpy.array() or pandas.DataFrame().
+    """
+    cdef list areas = []
+    cdef list clockwise = []
+    cdef list bounds = []
+    cdef list control_bounds = []
+    cdef list contours = []
+    cdef list points = []
+    cdef Path path
+    cdef double area
+    cdef optional[SkRect] control_rect
+    cdef int n_contours
+    for path in paths:
+        # one walk for everything but the tight bounds, which come from Skia;
+        # the results are cached on the path like the properties do
+        with cython.critical_section(path):
+            walk_path_metrics(path.path, &area, &control_rect, &n_contours)
+            path.area_cache = area
+            path.control_bounds_cache = control_rect
+        areas.append(fabs(area))
+        clockwise.append(area < 0)
+        bounds.append(rect_to_tuple(path.tight_bounds()))
+        control_bounds.append(rect_to_tuple(control_rect))
+        contours.append(n_contours)
+        points.append(path.path.points().size())
+    return {
+        "area": areas,
+        "clockwise": clockwise,
+        "bounds": bounds,
+        "controlPointBounds": control_bounds,
+        "contours": contours,
+        "points": points,
+    }
+
+
 cdef class OpBuilder:
 
     def __init__(
@@ -1585,19 +5260,122 @@ cdef class OpBuilder:
         bint fix_winding=True,
         bint keep_starting_points=True,
         bint clockwise=False,
+        SkScalar round_to=0,
     ):
         self.fix_winding = fix_winding
         self.keep_starting_points = keep_starting_points
-        self.first_points = []
         self.clockwise = clockwise
+        self.round_to = round_to
 
     cpdef add(self, Path path, SkPathOp operator):
-        self.builder.add(path.path.snapshot(), operator)
+        self.builder.add(path.snapshot(), operator)
+        self.num_operands += 1
         if self.keep_starting_points:
-            self.first_points.extend(path.firstPoints)
+            append_first_points(path.path, self.first_points)
+
+    def add_many(self, paths, operators, bint merge_disjoint=False):
+        """Add each path with the operator at the same index in 'operators',
+        or with the same operator if a single PathOp is given; same as
+        calling add() for each path, but faster.
+
+        If 'merge_disjoint' is True, consecutive paths added with UNION whose
+        bounds don't overlap are joined into a single operand, so Skia has
+        fewer operations to resolve.
+        """
+        cdef list path_list = list(paths)
+        cdef Py_ssize_t n = len(path_list)
+        cdef list operator_list = None
+        cdef SkPathOp operator
+        if isinstance(operators, int):
+            operator = operators
+        else:
+            operator_list = list(operators)
+            if len(operator_list) != n:
+                raise ValueError(
+                    "expected %d operators, found %d" % (n, len(operator_list))
+                )
+
+        cdef Path path
+        cdef Py_ssize_t i
+        cdef optional[SkRect] rect
+        cdef SkPathBuilder group
+        cdef SkPathOp group_operator = kUnion_SkPathOp
+        cdef Py_ssize_t group_size = 0
+        cdef bint can_merge = False
+        cdef double left = 0, top = 0, right = 0, bottom = 0
+
+        for i in range(n):
+            path = path_list[i]
+            if operator_list is not None:
+                operator = operator_list[i]
+            if self.keep_starting_points:
+                append_first_points(path.path, self.first_points)
+            if not merge_disjoint:
+                self.builder.add(path.snapshot(), operator)
+                self.num_operands += 1
+                continue
+
+            rect = path.finite_bounds()
+            if (
+                can_merge
+                and operator == kUnion_SkPathOp
+                and rect.has_value()
+                and path.path.fillType() == group.fillType()
+                and (
+                    rect.value().left() >= right
+                    or rect.value().right() <= left
+                    or rect.value().top() >= bottom
+                    or rect.value().bottom() <= top
+                )
+            ):
+                group.addPath(path.snapshot())
+                group_size += 1
+                left = fmin(left, rect.value().left())
+                top = fmin(top, rect.value().top())
+                right = fmax(right, rect.value().right())
+                bottom = fmax(bottom, rect.value().bottom())
+                continue
+
+            if group_size:
+                self.add_group(group, group_operator)
+            group = path.path
+            group_operator = operator
+            group_size = 1
+            # Skia combines the first operand with an empty path, so XOR and
+            # REVERSE_DIFFERENCE are the same as UNION there
+            if self.num_operands == 0 and (
+                operator == kXOR_SkPathOp or operator == kReverseDifference_SkPathOp
+            ):
+                group_operator = kUnion_SkPathOp
+            # an inverse fill can't be merged by appending
+            can_merge = (
+                rect.has_value()
+                and group_operator == kUnion_SkPathOp
+                and path.path.fillType() != SkPathFillType.kInverseWinding
+                and path.path.fillType() != SkPathFillType.kInverseEvenOdd
+            )
+            if can_merge:
+                left = rect.value().left()
+                top = rect.value().top()
+                right = rect.value().right()
+                bottom = rect.value().bottom()
+
+        if group_size:
+            self.add_group(group, group_operator)
+
+    cdef int add_group(self, SkPathBuilder& group, SkPathOp operator) except -1:
+        self.builder.add(group.detach(), operator)
+        self.num_operands += 1
+        return 0
 
     cpdef Path resolve(self):
-        cdef optional[SkPath] skresult = self.builder.resolve()
+        cdef optional[SkPath] skresult
+        with nogil:
+            skresult = self.builder.resolve()
+        # the SkOpBuilder is reset after resolving, so are its first points
+        cdef vector[SkPoint] first_points
+        first_points.swap(self.first_points)
+        self.num_operands = 0
         if not skresult.has_value():
             raise PathOpsError("operation did not succeed")
         cdef Path result = Path()
@@ -1605,7 +5383,9 @@ cdef class OpBuilder:
         if self.fix_winding:
             winding_from_even_odd(result, self.clockwise)
         if self.keep_starting_points:
-            restore_starting_points(result, self.first_points)
+            restore_first_points(result, first_points)
+        if self.round_to > 0:
+            result.quantize(self.round_to)
         return result
 
 
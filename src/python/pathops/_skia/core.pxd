@@ -9,10 +9,10 @@ cdef extern from "include/core/SkSpan.h":
         SkSpan()
         SkSpan(T* data, size_t size)
         SkSpan[T] subspan(size_t offset) const
-        T& operator[](size_t) const
+        T& operator[](size_t) nogil const
         bint empty() const
-        size_t size() const
-        T* data() const
+        size_t size() nogil const
+        T* data() nogil const
         T* begin() const
         T* end() const
 
@@ -61,16 +61,16 @@ cdef extern from "include/core/SkPoint.h":
     cdef cppclass SkPoint:
 
         @staticmethod
-        SkPoint Make(SkScalar x, SkScalar y)
+        SkPoint Make(SkScalar x, SkScalar y) nogil
 
-        SkScalar x()
-        SkScalar y()
+        SkScalar x() nogil
+        SkScalar y() nogil
 
         bint equals(SkScalar x, SkScalar y)
 
-        bint operator==(const SkPoint& other)
+        bint operator==(const SkPoint& other) nogil
 
-        bint operator!=(const SkPoint& other)
+        bint operator!=(const SkPoint& other) nogil
 
 
 cdef extern from "include/core/SkPath.h":
@@ -112,6 +112,16 @@ cdef extern from "include/core/SkPath.h":
 
         bint getLastPt(SkPoint* lastPt)
 
+        size_t approximateBytesUsed()
+
+        SkSpan[const SkPoint] points() const
+
+        SkSpan[const SkPathVerb] verbs() const
+
+        SkSpan[const SkScalar] conicWeights() const
+
+        SkPathIter iter() const
+
 
 cdef extern from * namespace "SkPath":
 
@@ -156,10 +166,10 @@ cdef extern from "include/core/SkPathBuilder.h":
         void dump(DumpFormat)
 
         void moveTo(SkScalar x, SkScalar y)
-        void moveTo(const SkPoint& p)
+        void moveTo(const SkPoint& p) nogil
 
         void lineTo(SkScalar x, SkScalar y)
-        void lineTo(const SkPoint& p)
+        void lineTo(const SkPoint& p) nogil
 
         void cubicTo(
             SkScalar x1, SkScalar y1,
@@ -177,17 +187,21 @@ cdef extern from "include/core/SkPathBuilder.h":
         void arcTo(const SkPoint& r, SkScalar xAxisRotate, SkArcSize largeArc,
                    SkPathDirection sweep, const SkPoint& xy)
 
-        void close()
+        void close() nogil
+
+        void setLastPt(SkScalar x, SkScalar y)
 
         void transform(const SkMatrix& matrix)
 
         void reset()
 
+        void incReserve(int extraPtCount, int extraVerbCount)
+
         SkPath detach()
         SkPath snapshot()
 
-        void setFillType(SkPathFillType ft)
-        SkPathFillType fillType()
+        void setFillType(SkPathFillType ft) nogil
+        SkPathFillType fillType() nogil
 
         # TODO also expose optional AddPathMode enum
         void addPath(const SkPath& src) except +
@@ -200,11 +214,13 @@ cdef extern from "include/core/SkPathBuilder.h":
 
         bint isEmpty() const
 
-        SkSpan[const SkPoint] points() const
+        SkSpan[const SkPoint] points() nogil const
 
         optional[SkPoint] getLastPt() const
 
-        SkSpan[const SkPathVerb] verbs() const
+        SkSpan[const SkPathVerb] verbs() nogil const
+
+        SkSpan[const SkScalar] conicWeights() const
 
         SkPathIter iter() const
 
@@ -221,6 +237,9 @@ cdef extern from "include/core/SkRect.h":
         @staticmethod
         bint Intersects(const SkRect& a, const SkRect& b)
 
+        @staticmethod
+        SkRect MakeLTRB(SkScalar l, SkScalar t, SkScalar r, SkScalar b)
+
 
 cdef extern from "include/core/SkScalar.h":
 
@@ -273,3 +292,36 @@ cdef extern from "include/core/SkPaint.h":
 
 cdef extern from "include/core/SkPathUtils.h" namespace "skpathutils":
     cdef bint FillPathWithPaint(const SkPath& src, const SkPaint& paint, SkPathBuilder* dst)
+
+
+cdef extern from "include/core/SkPathMeasure.h":
+    cdef cppclass SkPathMeasure:
+        SkPathMeasure() except +
+        SkPathMeasure(const SkPath& path, bint forceClosed, SkScalar resScale) except +
+        SkScalar getLength()
+        bint getPosTan(SkScalar distance, SkPoint* position, SkPoint* tangent)
+        bint getSegment(
+            SkScalar startD, SkScalar stopD, SkPathBuilder* dst, bint startWithMoveTo
+        )
+        bint isClosed()
+        bint nextContour()
+
+
+cdef extern from "include/core/SkString.h":
+    cdef cppclass SkString:
+        SkString()
+        const char* c_str() const
+
+
+cdef extern from "include/utils/SkParsePath.h":
+    cdef cppclass SkParsePath:
+
+        enum class PathEncoding "SkParsePath::PathEncoding":
+            kAbsolute "SkParsePath::PathEncoding::Absolute",
+            kRelative "SkParsePath::PathEncoding::Relative"
+
+        @staticmethod
+        optional[SkPath] FromSVGString(const char str[])
+
+        @staticmethod
+        SkString ToSVGString(const SkPath& path, PathEncoding encoding)
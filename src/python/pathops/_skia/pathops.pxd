@@ -10,11 +10,11 @@ cdef extern from "include/pathops/SkPathOps.h":
         kXOR_SkPathOp,                   # exclusive-or the two paths
         kReverseDifference_SkPathOp      # subtract the first path from the op path
 
-    optional[SkPath] Op(const SkPath& one, const SkPath& two, SkPathOp op)
+    optional[SkPath] Op(const SkPath& one, const SkPath& two, SkPathOp op) nogil
 
-    optional[SkPath] Simplify(const SkPath& path)
+    optional[SkPath] Simplify(const SkPath& path) nogil
 
-    optional[SkPath] AsWinding(const SkPath& path)
+    optional[SkPath] AsWinding(const SkPath& path) nogil
 
     cdef cppclass SkOpBuilder:
 
@@ -22,4 +22,4 @@ cdef extern from "include/pathops/SkPathOps.h":
 
         void add(const SkPath& path, SkPathOp _operator)
 
-        optional[SkPath] resolve()
+        optional[SkPath] resolve() nogil
@@ -0,0 +1,153 @@
+"""Asynchronous versions of the boolean path operations.
+
+The operations run in a shared thread pool, with the GIL released while
+Skia does the work, so they don't block the asyncio event loop and can run
+in parallel. The size of the pool bounds the number of operations running at
+the same time; the others wait in the queue. Cancelling an awaiting task
+drops its operation if it hasn't started yet; an operation that is already
+running can't be interrupted, and its result is discarded.
+
+The input paths must not be modified until the returned awaitable is done.
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import _pathops
+
+
+__all__ = [
+    "OpBuilder",
+    "op",
+    "set_max_workers",
+    "shutdown",
+    "simplify",
+]
+
+
+_executor = None
+_max_workers = None
+_lock = threading.Lock()
+
+
+def set_max_workers(max_workers=None):
+    """Set the maximum number of operations that can run concurrently.
+
+    If None (default), use the number of CPUs. The pool is re-created on the
+    next operation; operations already submitted run to completion.
+    """
+    global _max_workers
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be greater than 0")
+    with _lock:
+        _max_workers = max_workers
+        _shutdown(wait=False)
+
+
+def shutdown(wait=True):
+    """Shut down the thread pool; a new one is created on the next operation."""
+    with _lock:
+        _shutdown(wait=wait)
+
+
+def _shutdown(wait):
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_max_workers or os.cpu_count() or 1,
+                thread_name_prefix="pathops",
+            )
+        return _executor
+
+
+async def _run(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+async def op(
+    one,
+    two,
+    operator,
+    fix_winding=True,
+    keep_starting_points=True,
+    clockwise=False,
+    round_to=0,
+    cleanup=False,
+    polygon_engine=False,
+):
+    return await _run(
+        _pathops.op,
+        one,
+        two,
+        operator,
+        fix_winding=fix_winding,
+        keep_starting_points=keep_starting_points,
+        clockwise=clockwise,
+        round_to=round_to,
+        cleanup=cleanup,
+        polygon_engine=polygon_engine,
+    )
+
+
+async def simplify(
+    path,
+    fix_winding=True,
+    keep_starting_points=True,
+    clockwise=False,
+    round_to=0,
+    cleanup=False,
+    polygon_engine=False,
+):
+    return await _run(
+        _pathops.simplify,
+        path,
+        fix_winding=fix_winding,
+        keep_starting_points=keep_starting_points,
+        clockwise=clockwise,
+        round_to=round_to,
+        cleanup=cleanup,
+        polygon_engine=polygon_engine,
+    )
+
+
+class OpBuilder:
+    """Like pathops.OpBuilder, but resolve() is a coroutine.
+
+    Paths can't be added while resolve() is running.
+    """
+
+    def __init__(
+        self,
+        fix_winding=True,
+        keep_starting_points=True,
+        clockwise=False,
+        round_to=0,
+    ):
+        self._builder = _pathops.OpBuilder(
+            fix_winding=fix_winding,
+            keep_starting_points=keep_starting_points,
+            clockwise=clockwise,
+            round_to=round_to,
+        )
+
+    def add(self, path, operator):
+        self._builder.add(path, operator)
+
+    def add_many(self, paths, operators, merge_disjoint=False):
+        self._builder.add_many(paths, operators, merge_disjoint=merge_disjoint)
+
+    async def resolve(self):
+        return await _run(self._builder.resolve)
@@ -1,11 +1,23 @@
+from collections import deque
 from functools import partial
-from . import Path, PathOp, op
+import os
+from . import (
+    IncompatiblePathsError,
+    Path,
+    PathOp,
+    UnsupportedVerbError,
+    op,
+    self_intersections,
+)
+from ._pathops import restore_starting_points
 
 
 __all__ = [
     "difference",
     "intersection",
+    "iunion",
     "reverse_difference",
+    "simplify_masters",
     "union",
     "xor",
 ]
@@ -37,6 +49,171 @@ def union(
     path.draw(outpen)
 
 
+def _union_path(path, fix_winding, keep_starting_points, clockwise):
+    if path:
+        path.simplify(
+            fix_winding=fix_winding,
+            keep_starting_points=keep_starting_points,
+            clockwise=clockwise,
+        )
+    return path
+
+
+def iunion(
+    glyphs,
+    fix_winding=True,
+    keep_starting_points=True,
+    clockwise=False,
+    executor=None,
+    window=None,
+):
+    """Remove overlaps from an iterable of (name, contours) pairs.
+
+    Yield (name, Path) pairs lazily, in the same order as the input. If an
+    'executor' (e.g. a concurrent.futures.ThreadPoolExecutor) is given, the
+    glyphs are processed in parallel, reading ahead no more than 'window'
+    glyphs (by default twice the number of CPUs) from the input iterable.
+    The contours are always drawn in the calling thread.
+    """
+    if executor is None:
+        for name, contours in glyphs:
+            path = _draw(contours)
+            yield name, _union_path(
+                path, fix_winding, keep_starting_points, clockwise
+            )
+        return
+
+    if window is None:
+        window = 2 * (os.cpu_count() or 1)
+    elif window < 1:
+        raise ValueError("window must be greater than 0")
+    pending = deque()
+    try:
+        for name, contours in glyphs:
+            path = _draw(contours)
+            future = executor.submit(
+                _union_path, path, fix_winding, keep_starting_points, clockwise
+            )
+            pending.append((name, future))
+            if len(pending) >= window:
+                name, future = pending.popleft()
+                yield name, future.result()
+        while pending:
+            name, future = pending.popleft()
+            yield name, future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def _verbs(path):
+    return [verb for verb, _ in path]
+
+
+def _has_crossings(path):
+    try:
+        return bool(self_intersections(path))
+    except UnsupportedVerbError:
+        return True
+
+
+def _reversed_indices(path, simplified):
+    # the indices of the contours that simplifying 'path' only reversed, or
+    # None if it changed anything else
+    source = list(path.contours)
+    contours = list(simplified.contours)
+    if len(source) != len(contours):
+        return None
+    return {
+        i
+        for i, (a, b) in enumerate(zip(source, contours))
+        if a.clockwise != b.clockwise
+    }
+
+
+def _reverse_contours(path, indices, fillType, keep_starting_points):
+    result = Path(fillType=fillType)
+    for i, contour in enumerate(path.contours):
+        if i in indices:
+            contour.reverse()
+        result.addPath(contour)
+    if keep_starting_points:
+        restore_starting_points(result, path.firstPoints)
+    return result
+
+
+def simplify_masters(
+    paths,
+    fix_winding=True,
+    keep_starting_points=True,
+    clockwise=False,
+):
+    """Remove overlaps from the point-compatible masters of a glyph.
+
+    Return a list of new Paths, one per master, which are guaranteed to be
+    compatible with each other. Raise IncompatiblePathsError as soon as the
+    input masters, or the results of removing their overlaps, turn out not
+    to be compatible, without processing the remaining masters.
+
+    If none of the masters has crossing segments, and removing the overlaps
+    from the first master only changes the direction of some contours, the
+    same contours are reversed in the other masters instead of simplifying
+    each of them. This assumes that contours that don't cross are nested
+    the same way in all masters, as they must be to interpolate cleanly.
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+    verbs = _verbs(paths[0])
+    for i, path in enumerate(paths[1:], 1):
+        if _verbs(path) != verbs:
+            raise IncompatiblePathsError(
+                "master %d is not compatible with master 0" % i
+            )
+
+    first = Path(paths[0])
+    first.simplify(
+        fix_winding=fix_winding,
+        keep_starting_points=keep_starting_points,
+        clockwise=clockwise,
+    )
+    results = [first]
+
+    # Finding the crossings is costly, so the other masters are only checked
+    # once the shortcut is known to work for the first one.
+    if len(paths) > 1 and not _has_crossings(paths[0]):
+        indices = _reversed_indices(paths[0], first)
+        if (
+            indices is not None
+            and _reverse_contours(
+                paths[0], indices, first.fillType, keep_starting_points
+            )
+            == first
+            and not any(_has_crossings(path) for path in paths[1:])
+        ):
+            results.extend(
+                _reverse_contours(path, indices, first.fillType, keep_starting_points)
+                for path in paths[1:]
+            )
+            return results
+
+    verbs = _verbs(first)
+    for i, path in enumerate(paths[1:], 1):
+        result = Path(path)
+        result.simplify(
+            fix_winding=fix_winding,
+            keep_starting_points=keep_starting_points,
+            clockwise=clockwise,
+        )
+        if _verbs(result) != verbs:
+            raise IncompatiblePathsError(
+                "master %d is not compatible with master 0 "
+                "after removing overlaps" % i
+            )
+        results.append(result)
+    return results
+
+
 def _do(
     operator,
     subject_contours,
@@ -0,0 +1,64 @@
+import asyncio
+
+from pathops import Path, PathOp, op, simplify, OpBuilder
+from pathops import aio
+import pytest
+
+
+def _rect(x0, y0, x1, y1):
+    path = Path()
+    path.moveTo(x0, y0)
+    path.lineTo(x1, y0)
+    path.lineTo(x1, y1)
+    path.lineTo(x0, y1)
+    path.close()
+    return path
+
+
+@pytest.fixture
+def paths():
+    return [_rect(i, i, i + 10, i + 10) for i in range(0, 40, 5)]
+
+
+def test_op(paths):
+    async def main():
+        return await asyncio.gather(
+            *(aio.op(a, b, PathOp.UNION) for a, b in zip(paths, paths[1:]))
+        )
+
+    results = asyncio.run(main())
+
+    assert results == [op(a, b, PathOp.UNION) for a, b in zip(paths, paths[1:])]
+
+
+def test_simplify(paths):
+    path = Path()
+    for p in paths:
+        path.addPath(p)
+
+    result = asyncio.run(aio.simplify(path, clockwise=True))
+
+    assert result == simplify(path, clockwise=True)
+
+
+def test_op_builder(paths):
+    builder = aio.OpBuilder()
+    expected = OpBuilder()
+    for p in paths:
+        builder.add(p, PathOp.UNION)
+        expected.add(p, PathOp.UNION)
+
+    assert asyncio.run(builder.resolve()) == expected.resolve()
+
+
+def test_set_max_workers(paths):
+    with pytest.raises(ValueError):
+        aio.set_max_workers(0)
+
+    aio.set_max_workers(1)
+    try:
+        result = asyncio.run(aio.op(paths[0], paths[1], PathOp.INTERSECTION))
+    finally:
+        aio.set_max_workers(None)
+
+    assert result == op(paths[0], paths[1], PathOp.INTERSECTION)
@@ -0,0 +1,135 @@
+from multiprocessing import shared_memory
+
+from pathops import FillType, Path, PathCollection, PathOp, op, simplify
+
+import pytest
+
+
+def _rect(x0, y0, x1, y1):
+    path = Path()
+    path.moveTo(x0, y0)
+    path.lineTo(x1, y0)
+    path.lineTo(x1, y1)
+    path.lineTo(x0, y1)
+    path.close()
+    return path
+
+
+@pytest.fixture
+def paths():
+    overlapping = _rect(0, 0, 10, 10)
+    overlapping.addPath(_rect(5, 5, 15, 15))
+
+    curves = Path(fillType=FillType.EVEN_ODD)
+    curves.moveTo(0, 0)
+    curves.quadTo(5, 10, 10, 0)
+    curves.cubicTo(10, -5, 5, -10, 0, -10)
+    curves.close()
+
+    conic = Path()
+    conic.moveTo(0, 0)
+    conic.conicTo(10, 0, 10, 10, 0.5)
+    conic.close()
+
+    return [overlapping, Path(), curves, conic]
+
+
+def test_append_and_getitem(paths):
+    collection = PathCollection(paths)
+
+    assert len(collection) == len(paths)
+    assert list(collection) == paths
+    assert collection[-1] == paths[-1]
+    assert collection[2].fillType == FillType.EVEN_ODD
+    with pytest.raises(IndexError):
+        collection[len(paths)]
+
+
+def test_getitem_returns_a_copy(paths):
+    collection = PathCollection(paths)
+
+    path = collection[0]
+    path.lineTo(100, 100)
+
+    assert collection[0] == paths[0]
+
+
+def test_to_bytes_and_from_bytes(paths):
+    data = PathCollection(paths).to_bytes()
+
+    collection = PathCollection.from_bytes(data)
+
+    assert list(collection) == paths
+    assert collection.to_bytes() == data
+    assert collection.nbytes < len(data)
+
+
+def test_from_bytes_ignores_trailing_data(paths):
+    data = PathCollection(paths).to_bytes()
+
+    assert list(PathCollection.from_bytes(data + b"\0" * 100)) == paths
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"NOTPATHS" + b"\0" * 100,
+    ],
+)
+def test_from_bytes_invalid(data):
+    with pytest.raises(ValueError):
+        PathCollection.from_bytes(data)
+
+
+def test_from_bytes_truncated(paths):
+    data = PathCollection(paths).to_bytes()
+
+    with pytest.raises(ValueError, match="too short"):
+        PathCollection.from_bytes(data[:-1])
+
+
+def test_save_and_open(paths, tmp_path):
+    filename = tmp_path / "paths.bin"
+    PathCollection(paths).save(filename)
+
+    assert list(PathCollection.open(filename)) == paths
+
+
+def test_shared_memory(paths):
+    data = PathCollection(paths).to_bytes()
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[: len(data)] = data
+        collection = PathCollection.from_bytes(shm.buf)
+        assert list(collection) == paths
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_simplify(paths):
+    paths = paths[:3]
+    collection = PathCollection(paths)
+
+    result = collection.simplify(clockwise=True)
+
+    assert isinstance(result, PathCollection)
+    assert list(result) == [simplify(path, clockwise=True) for path in paths]
+
+
+def test_op():
+    ones = [_rect(0, 0, 10, 10), _rect(0, 0, 5, 5)]
+    twos = [_rect(5, 5, 15, 15), _rect(10, 10, 20, 20)]
+
+    result = PathCollection(ones).op(PathCollection(twos), PathOp.INTERSECTION)
+
+    assert list(result) == [
+        op(one, two, PathOp.INTERSECTION) for one, two in zip(ones, twos)
+    ]
+    assert not result[1]
+
+
+def test_op_different_lengths():
+    with pytest.raises(ValueError, match="different lengths"):
+        PathCollection([Path()]).op(PathCollection(), PathOp.UNION)
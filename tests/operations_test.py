@@ -1,5 +1,13 @@
-from pathops import Path, PathVerb
-from pathops.operations import union, difference, intersection, reverse_difference, xor
+from pathops import Path, PathVerb, IncompatiblePathsError
+from pathops.operations import (
+    union,
+    iunion,
+    difference,
+    intersection,
+    reverse_difference,
+    xor,
+    simplify_masters,
+)
 import pytest
 
 
@@ -43,3 +51,160 @@ def test_intersection(subject_path, clip_path, expected):
     intersection([sub], [clip], result.getPen())
 
     assert list(result) == expected
+
+
+def _square(x, y, size=10):
+    path = Path()
+    path.moveTo(x, y)
+    path.lineTo(x + size, y)
+    path.lineTo(x + size, y + size)
+    path.lineTo(x, y + size)
+    path.close()
+    return path
+
+
+GLYPHS = [
+    ("a", [_square(0, 0), _square(5, 5)]),
+    ("b", []),
+    ("c", [_square(0, 0), _square(20, 0), _square(25, 5)]),
+    ("d", [_square(0, 0, 100), _square(10, 10)]),
+]
+
+
+@pytest.mark.parametrize("use_executor", [False, True])
+def test_iunion(use_executor):
+    expected = []
+    for name, contours in GLYPHS:
+        path = Path()
+        union(contours, path.getPen())
+        expected.append((name, path))
+
+    if use_executor:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(2) as executor:
+            result = list(iunion(GLYPHS, executor=executor, window=2))
+    else:
+        result = list(iunion(GLYPHS))
+
+    assert result == expected
+
+
+def test_iunion_is_exported():
+    import pathops
+
+    assert pathops.iunion is iunion
+
+
+def test_iunion_is_lazy():
+    from concurrent.futures import ThreadPoolExecutor
+
+    consumed = []
+
+    def glyphs():
+        for name, contours in GLYPHS:
+            consumed.append(name)
+            yield name, contours
+
+    with ThreadPoolExecutor(2) as executor:
+        it = iunion(glyphs(), executor=executor, window=2)
+        name, _ = next(it)
+        assert name == "a"
+        assert consumed == ["a", "b"]
+        it.close()
+
+
+def _master(*contours):
+    path = Path()
+    for contour in contours:
+        path.addPath(contour)
+    return path
+
+
+def _hole(x, y, size=10):
+    path = _square(x, y, size)
+    path.reverse()
+    return path
+
+
+@pytest.mark.parametrize(
+    "masters",
+    [
+        # overlapping contours
+        [
+            _master(_square(0, 0), _square(5, 5)),
+            _master(_square(0, 0, 20), _square(5, 5, 20)),
+        ],
+        # no crossings, a counter drawn in the wrong direction
+        [
+            _master(_hole(0, 0, 100), _square(10, 10, 50)),
+            _master(_hole(0, 0, 120), _square(20, 20, 60)),
+            _master(_hole(0, 0, 80), _square(5, 5, 30)),
+        ],
+        # no crossings, a nested contour in the same direction
+        [
+            _master(_square(0, 0, 100), _square(10, 10, 50)),
+            _master(_square(0, 0, 120), _square(20, 20, 60)),
+        ],
+    ],
+)
+def test_simplify_masters(masters):
+    expected = []
+    for master in masters:
+        path = Path(master)
+        path.simplify()
+        expected.append(path)
+
+    assert simplify_masters(masters) == expected
+    assert simplify_masters([]) == []
+
+
+def test_simplify_masters_shortcut(monkeypatch):
+    import pathops.operations
+
+    checked = []
+    has_crossings = pathops.operations._has_crossings
+
+    def spy(path):
+        checked.append(path)
+        return has_crossings(path)
+
+    monkeypatch.setattr(pathops.operations, "_has_crossings", spy)
+
+    # no crossings: once the first master is known to only need reversing,
+    # the others are checked for crossings, then reversed the same way
+    masters = [
+        _master(_hole(0, 0, 100), _square(10, 10, 50)),
+        _master(_hole(0, 0, 120), _square(20, 20, 60)),
+        _master(_hole(0, 0, 80), _square(5, 5, 30)),
+    ]
+    expected = []
+    for master in masters:
+        path = Path(master)
+        path.simplify()
+        expected.append(path)
+
+    assert simplify_masters(masters) == expected
+    assert checked == masters
+
+    # the first master has crossings: the others aren't checked
+    checked.clear()
+    masters = [
+        _master(_square(0, 0), _square(5, 5)),
+        _master(_square(0, 0, 20), _square(5, 5, 20)),
+    ]
+    simplify_masters(masters)
+    assert checked == masters[:1]
+
+
+def test_simplify_masters_incompatible():
+    with pytest.raises(IncompatiblePathsError, match="master 1 is not"):
+        simplify_masters([_square(0, 0), _master(_square(0, 0), _square(5, 5))])
+
+    with pytest.raises(IncompatiblePathsError, match="after removing overlaps"):
+        simplify_masters(
+            [
+                _master(_square(0, 0), _square(5, 5)),
+                _master(_square(0, 0), _square(20, 20)),
+            ]
+        )
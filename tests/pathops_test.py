@@ -1,5 +1,6 @@
 from pathops import (
     Path,
+    FrozenPath,
     PathPen,
     OpenPathError,
     OpBuilder,
@@ -10,10 +11,22 @@ from pathops import (
     float2bits,
     ArcSize,
     Direction,
+    op,
     simplify,
+    outline_stroke,
+    metrics,
+    cubics_to_quads,
+    intersections,
+    self_intersections,
+    LineCap,
+    LineJoin,
     NumberOfPointsError,
+    UnsupportedVerbError,
+    IncompatiblePathsError,
 )
 
+import math
+
 import pytest
 
 
@@ -197,6 +210,38 @@ class PathTest(object):
         ):
             pen.curveTo((0, 0), (1, 1), (2, 2), (3, 3))
 
+    def test_pen_accepts_point_sequences(self):
+        path1 = Path()
+        pen1 = path1.getPen()
+        pen1.moveTo((0, 0))
+        pen1.qCurveTo((1, 1), (2, 2), (3, 3))
+        pen1.curveTo((4, 4), (5, 5), (6, 6))
+        pen1.closePath()
+        pen1.qCurveTo((1.0, 1.0), (-1.0, 1.0), (-1.0, -1.0), (1.0, -1.0), None)
+
+        path2 = Path()
+        pen2 = path2.getPen()
+        pen2.moveTo([0, 0])
+        pen2.qCurveTo([1, 1], [2, 2], [3, 3])
+        pen2.curveTo(iter((4, 4)), [5, 5], [6, 6])
+        pen2.closePath()
+        pen2.qCurveTo([1.0, 1.0], [-1.0, 1.0], [-1.0, -1.0], [1.0, -1.0], None)
+
+        assert path1 == path2
+        assert list(path2) == [
+            (PathVerb.MOVE, ((0.0, 0.0),)),
+            (PathVerb.QUAD, ((1.0, 1.0), (1.5, 1.5))),
+            (PathVerb.QUAD, ((2.0, 2.0), (3.0, 3.0))),
+            (PathVerb.CUBIC, ((4.0, 4.0), (5.0, 5.0), (6.0, 6.0))),
+            (PathVerb.CLOSE, ()),
+            (PathVerb.MOVE, ((1.0, 0.0),)),
+            (PathVerb.QUAD, ((1.0, 1.0), (0.0, 1.0))),
+            (PathVerb.QUAD, ((-1.0, 1.0), (-1.0, 0.0))),
+            (PathVerb.QUAD, ((-1.0, -1.0), (0.0, -1.0))),
+            (PathVerb.QUAD, ((1.0, -1.0), (1.0, 0.0))),
+            (PathVerb.CLOSE, ()),
+        ]
+
     def test_last_implicit_lineTo(self):
         # https://github.com/fonttools/skia-pathops/issues/6
         path = Path()
@@ -645,6 +690,106 @@ def test_reverse_path(operations, expected):
     assert list(path) == expected
 
 
+@pytest.mark.parametrize("operations, expected", TEST_DATA)
+def test_extend(operations, expected):
+    path = Path()
+    path.extend(operations)
+
+    expected_path = Path()
+    for verb, pts in operations:
+        expected_path.add(verb, *pts)
+    assert path == expected_path
+
+    copy = Path()
+    copy.reserve(len(list(path)), len(path.points))
+    copy.extend(path)
+    assert copy == path
+
+
+@pytest.mark.parametrize(
+    "records",
+    [
+        lambda path: path,
+        iter,
+        lambda path: (record for record in path),
+    ],
+    ids=["path", "iterator", "generator"],
+)
+def test_extend_self(records):
+    path = _rect_path(0, 0, 10, 10)
+    expected = Path(path)
+    expected.addPath(path)
+
+    path.extend(records(path))
+
+    assert path == expected
+
+
+def test_modify_while_iterating_contours():
+    path = _rect_path(0, 0, 10, 10)
+    path.addPath(_rect_path(20, 0, 30, 10))
+
+    for contour in path.contours:
+        path.addPath(contour)
+
+    assert len(path) == 4
+
+
+def test_extend_conic_and_plain_ints():
+    path = Path()
+    path.extend(
+        [
+            (0, [(0, 0)]),
+            (3, [(10, 0), (10, 10), 0.5]),
+            (5, []),
+        ]
+    )
+
+    assert list(path) == [
+        (PathVerb.MOVE, ((0, 0),)),
+        (PathVerb.CONIC, ((10, 0), (10, 10), 0.5)),
+        (PathVerb.CLOSE, ()),
+    ]
+
+
+def test_extend_invalid_verb():
+    path = Path()
+    with pytest.raises(UnsupportedVerbError):
+        path.extend([(PathVerb.MOVE, ((0, 0),)), (6, ())])
+    assert list(path) == [(PathVerb.MOVE, ((0, 0),))]
+
+
+def test_reserve_negative():
+    with pytest.raises(ValueError):
+        Path().reserve(-1, 0)
+
+
+def test_scratch_builders_are_reused():
+    from pathops._pathops import _scratch_stats
+
+    path = Path()
+    for i in range(3):
+        path.moveTo(i * 20, 0)
+        path.lineTo(i * 20 + 10, 0)
+        path.lineTo(i * 20 + 10, 10)
+        path.close()
+    expected = list(path)
+
+    # warm up the pool
+    path.reverse()
+    path.reverse()
+    simplify(path, clockwise=True)
+
+    acquired, allocated = _scratch_stats()
+    for _ in range(10):
+        path.reverse()
+        path.reverse()
+        simplify(path, clockwise=True)
+    assert list(path) == expected
+    assert _scratch_stats()[0] > acquired
+    assert _scratch_stats()[1] == allocated
+
+
 def test_duplicate_start_point():
     # https://github.com/fonttools/skia-pathops/issues/13
     path = Path()
@@ -1048,3 +1193,1059 @@ def test_simplify_clockwise(overlapping_path):
     overlapping_path.simplify(clockwise=True)
 
     assert overlapping_path == result
+
+
+@pytest.fixture
+def open_zigzag_path():
+    path = Path()
+    path.moveTo(0, 0)
+    path.lineTo(10, 10)
+    path.lineTo(20, 0)
+    path.lineTo(0, 5)
+    return path
+
+
+def test_stroke_simplify(open_zigzag_path):
+    expected = Path(open_zigzag_path)
+    expected.stroke(2, LineCap.BUTT_CAP, LineJoin.MITER_JOIN, 4)
+    expected.simplify(keep_starting_points=False)
+
+    open_zigzag_path.stroke(
+        2, LineCap.BUTT_CAP, LineJoin.MITER_JOIN, 4, simplify=True
+    )
+
+    assert open_zigzag_path == expected
+
+
+def test_outline_stroke(open_zigzag_path):
+    original = Path(open_zigzag_path)
+    expected = Path(open_zigzag_path)
+    expected.stroke(
+        2, LineCap.ROUND_CAP, LineJoin.ROUND_JOIN, 4, simplify=True, clockwise=True
+    )
+
+    result = outline_stroke(
+        open_zigzag_path, 2, LineCap.ROUND_CAP, LineJoin.ROUND_JOIN, 4, clockwise=True
+    )
+
+    assert open_zigzag_path == original
+    assert result == expected
+    assert result.clockwise
+
+
+def test_from_svg():
+    path = Path.from_svg("M0 0 L10 0 l0 10 H0 z m20 20 Q30 20 30 30 C30 40 20 40 20 30")
+
+    assert list(path) == [
+        (PathVerb.MOVE, ((0.0, 0.0),)),
+        (PathVerb.LINE, ((10.0, 0.0),)),
+        (PathVerb.LINE, ((10.0, 10.0),)),
+        (PathVerb.LINE, ((0.0, 10.0),)),
+        (PathVerb.CLOSE, ()),
+        (PathVerb.MOVE, ((20.0, 20.0),)),
+        (PathVerb.QUAD, ((30.0, 20.0), (30.0, 30.0))),
+        (PathVerb.CUBIC, ((30.0, 40.0), (20.0, 40.0), (20.0, 30.0))),
+    ]
+
+
+def test_from_svg_fill_type():
+    path = Path.from_svg("M0 0L10 0L10 10Z", fillType=FillType.EVEN_ODD)
+
+    assert path.fillType == FillType.EVEN_ODD
+
+
+def test_from_svg_invalid():
+    with pytest.raises(ValueError, match="invalid SVG path data"):
+        Path.from_svg("M0 0 L10")
+
+
+@pytest.mark.parametrize("relative", [False, True])
+def test_to_svg_roundtrip(overlapping_path, relative):
+    d = overlapping_path.to_svg(relative=relative)
+
+    assert Path.from_svg(d) == overlapping_path
+
+
+def test_from_svg_arc():
+    path = Path.from_svg("M7 5A3 1 0 0 0 7 2")
+
+    expected = Path()
+    expected.moveTo(7, 5)
+    expected.arcTo(3, 1, 0, ArcSize.SMALL, Direction.CCW, 7, 2)
+
+    assert path == expected
+
+
+@pytest.mark.parametrize(
+    "coords, end_pts, flags, segments",
+    [
+        (
+            [(0, 0), (0, 10), (10, 10), (10, 0)],
+            [3],
+            [1, 1, 1, 1],
+            [
+                ("moveTo", ((0, 0),)),
+                ("lineTo", ((0, 10),)),
+                ("lineTo", ((10, 10),)),
+                ("lineTo", ((10, 0),)),
+                ("closePath", ()),
+            ],
+        ),
+        (
+            [(0, 0), (0, 10), (10, 10), (10, 0)],
+            [3],
+            [1, 0, 0, 1],
+            [
+                ("moveTo", ((0, 0),)),
+                ("qCurveTo", ((0, 10), (10, 10), (10, 0))),
+                ("closePath", ()),
+            ],
+        ),
+        (
+            [(1, 1), (-1, 1), (-1, -1), (1, -1), (20, 0), (30, 0), (30, 10)],
+            [3, 6],
+            [0, 0, 0, 0, 1, 1, 1],
+            [
+                ("qCurveTo", ((1, 1), (-1, 1), (-1, -1), (1, -1), None)),
+                ("closePath", ()),
+                ("moveTo", ((20, 0),)),
+                ("lineTo", ((30, 0),)),
+                ("lineTo", ((30, 10),)),
+                ("closePath", ()),
+            ],
+        ),
+        (
+            # the start point is implied by the last and first off-curve
+            # points, but it's kept as the contour has other on-curve points
+            [(5, 0), (10, 0), (10, 10), (0, 10), (0, 0)],
+            [4],
+            [1, 0, 1, 0, 0],
+            [
+                ("moveTo", ((5, 0),)),
+                ("qCurveTo", ((10, 0), (10, 10))),
+                ("qCurveTo", ((0, 10), (0, 0), (5, 0))),
+                ("closePath", ()),
+            ],
+        ),
+    ],
+)
+def test_from_truetype(coords, end_pts, flags, segments):
+    expected = Path()
+    pen = expected.getPen()
+    for method, pts in segments:
+        getattr(pen, method)(*pts)
+
+    path = Path.from_truetype(coords, end_pts, flags)
+
+    assert path == expected
+    assert path.to_truetype() == (coords, end_pts, bytearray(flags))
+
+
+def test_from_truetype_starts_at_first_oncurve():
+    path = Path.from_truetype([(0, 10), (10, 10), (10, 0), (0, 0)], [3], [0, 1, 1, 1])
+
+    assert list(path) == [
+        (PathVerb.MOVE, ((10, 10),)),
+        (PathVerb.LINE, ((10, 0),)),
+        (PathVerb.LINE, ((0, 0),)),
+        (PathVerb.QUAD, ((0, 10), (10, 10))),
+        (PathVerb.CLOSE, ()),
+    ]
+
+
+def test_from_truetype_invalid():
+    with pytest.raises(ValueError, match="expected 2 flags"):
+        Path.from_truetype([(0, 0), (1, 1)], [1], [1])
+    with pytest.raises(ValueError, match="invalid contour end point"):
+        Path.from_truetype([(0, 0), (1, 1)], [2], [1, 1])
+    with pytest.raises(ValueError, match="do not belong to any contour"):
+        Path.from_truetype([(0, 0), (1, 1)], [0], [1, 1])
+
+
+def test_to_truetype_unsupported_verb():
+    path = Path()
+    path.moveTo(0, 0)
+    path.cubicTo(1, 1, 2, 2, 3, 3)
+    with pytest.raises(UnsupportedVerbError, match="CUBIC"):
+        path.to_truetype()
+
+
+def test_freeze(overlapping_path):
+    frozen = overlapping_path.freeze()
+
+    assert isinstance(frozen, FrozenPath)
+    assert frozen == overlapping_path
+    assert list(frozen) == list(overlapping_path)
+    assert list(frozen.segments) == list(overlapping_path.segments)
+    assert len(frozen) == 2
+    assert frozen.bounds == overlapping_path.bounds
+    assert frozen.fillType == overlapping_path.fillType
+    assert not hasattr(frozen, "moveTo")
+    assert len(Path().freeze()) == 0
+    drawn = Path()
+    frozen.draw(drawn.getPen())
+    assert drawn == overlapping_path
+
+    overlapping_path.lineTo(20, 20)
+    assert frozen != overlapping_path
+
+    thawed = frozen.thaw()
+    assert isinstance(thawed, Path)
+    assert thawed == frozen
+    thawed.lineTo(20, 20)
+    assert thawed == overlapping_path
+    assert thawed != frozen
+
+
+def test_frozen_path_hash(overlapping_path):
+    frozen1 = overlapping_path.freeze()
+    frozen2 = FrozenPath(overlapping_path)
+    frozen3 = FrozenPath(overlapping_path, fillType=FillType.EVEN_ODD)
+
+    assert frozen1 == frozen2
+    assert hash(frozen1) == hash(frozen2)
+    assert frozen1 != frozen3
+    assert len({frozen1, frozen2, frozen3}) == 2
+    assert Path(frozen3).fillType == FillType.EVEN_ODD
+
+
+def test_nbytes(overlapping_path):
+    empty = Path()
+    assert empty.nbytes > 0
+    assert overlapping_path.nbytes > empty.nbytes
+    assert overlapping_path.freeze().nbytes > Path().freeze().nbytes
+
+
+def test_nbytes_counts_points_and_verbs():
+    path = Path()
+    before = path.nbytes
+    path.moveTo(0, 0)
+    path.lineTo(1, 0)
+    path.conicTo(1, 1, 0, 1, 0.5)
+    path.close()
+
+    # 4 points, 4 verbs and 1 conic weight
+    assert path.nbytes == before + 4 * 8 + 4 + 4
+
+
+def test_reuse_operand_after_modification(overlapping_path):
+    clip = Path()
+    pen = clip.getPen()
+    pen.moveTo((0, 0))
+    pen.lineTo((20, 0))
+    pen.lineTo((20, 20))
+    pen.lineTo((0, 20))
+    pen.closePath()
+
+    result1 = op(overlapping_path, clip, PathOp.INTERSECTION)
+    assert result1 == op(overlapping_path, clip, PathOp.INTERSECTION)
+    assert overlapping_path.isConvex is False
+
+    overlapping_path.reset()
+    pen = overlapping_path.getPen()
+    pen.moveTo((10, 10))
+    pen.lineTo((30, 10))
+    pen.lineTo((30, 30))
+    pen.closePath()
+
+    result2 = op(overlapping_path, clip, PathOp.INTERSECTION)
+    assert result2 != result1
+    assert result2 == op(Path(overlapping_path), Path(clip), PathOp.INTERSECTION)
+    assert overlapping_path.isConvex is True
+
+    overlapping_path.fillType = FillType.INVERSE_WINDING
+    assert simplify(overlapping_path, fix_winding=False) != simplify(
+        Path(overlapping_path, fillType=FillType.WINDING), fix_winding=False
+    )
+
+
+def test_cached_metrics_invalidated():
+    path = Path()
+    path.moveTo(0, 0)
+    path.lineTo(0, 10)
+    path.lineTo(10, 10)
+    path.lineTo(10, 0)
+    path.close()
+    assert path.bounds == path.controlPointBounds == (0, 0, 10, 10)
+    assert path.area == 100
+    assert path.clockwise
+    assert path.isConvex
+
+    path.clockwise = False
+    assert not path.clockwise
+    assert path.area == 100
+
+    path.moveTo(40, 0)
+    path.cubicTo(40, 20, 20, 20, 20, 0)
+    path.close()
+    assert path.bounds == (0, 0, 40, 15)
+    assert path.controlPointBounds == (0, 0, 40, 20)
+    assert path.area == pytest.approx(100 + 240)
+    assert not path.clockwise
+    assert not path.isConvex
+
+    path.reset()
+    assert path.bounds is None
+    assert path.controlPointBounds is None
+    assert path.area == 0
+
+
+def test_quantize():
+    path = Path()
+    path.moveTo(0.2, -0.3)
+    path.lineTo(4.6, 0.2)
+    path.lineTo(10, 0)
+    path.lineTo(10, 0.3)
+    path.lineTo(10.4, 9.6)
+    path.cubicTo(10.1, 9.9, 9.9, 10.2, 10.2, 9.8)  # collapses to a point
+    path.lineTo(0, 10)
+    path.close()
+    path.moveTo(20.2, 20.2)  # collapses to a point
+    path.lineTo(20.3, 20.1)
+    path.lineTo(19.9, 19.9)
+    path.close()
+
+    path.quantize()
+
+    assert list(path) == [
+        (PathVerb.MOVE, ((0, 0),)),
+        (PathVerb.LINE, ((10, 0),)),
+        (PathVerb.LINE, ((10, 10),)),
+        (PathVerb.LINE, ((0, 10),)),
+        (PathVerb.CLOSE, ()),
+    ]
+
+    path.quantize(4)
+
+    assert list(path) == [
+        (PathVerb.MOVE, ((0, 0),)),
+        (PathVerb.LINE, ((12, 0),)),
+        (PathVerb.LINE, ((12, 12),)),
+        (PathVerb.LINE, ((0, 12),)),
+        (PathVerb.CLOSE, ()),
+    ]
+
+    with pytest.raises(ValueError, match="grid must be greater than 0"):
+        path.quantize(0)
+
+
+def test_quantize_drops_collapsed_contours():
+    path = Path()
+    path.moveTo(0, 0)
+    path.lineTo(10, 0.2)
+    path.lineTo(0, 0.4)  # collinear, back to the start after rounding
+    path.close()
+    path.moveTo(20, 0)
+    path.lineTo(30, 0)
+    path.lineTo(20, 0.3)  # explicit closing line
+    path.close()
+
+    path.quantize()
+
+    assert path == Path()
+
+    path.moveTo(0, 0)
+    path.lineTo(10, 0)
+    path.lineTo(10, 10)
+    path.lineTo(0.2, 0.3)  # same as the implied closing line
+    path.close()
+
+    path.quantize()
+
+    assert list(path) == [
+        (PathVerb.MOVE, ((0, 0),)),
+        (PathVerb.LINE, ((10, 0),)),
+        (PathVerb.LINE, ((10, 10),)),
+        (PathVerb.CLOSE, ()),
+    ]
+
+
+def test_op_round_to():
+    path1 = Path()
+    path1.moveTo(0.3, 0.3)
+    path1.lineTo(10.4, 0.3)
+    path1.lineTo(10.4, 10.2)
+    path1.lineTo(0.3, 10.2)
+    path1.close()
+    path2 = path1.transform(translateX=5.1, translateY=5.2)
+
+    result = op(path1, path2, PathOp.UNION, round_to=1)
+
+    expected = op(path1, path2, PathOp.UNION)
+    expected.quantize(1)
+    assert result == expected
+    assert all(x == round(x) and y == round(y) for x, y in result.points)
+
+    builder = OpBuilder(round_to=1)
+    builder.add(path1, PathOp.UNION)
+    builder.add(path2, PathOp.UNION)
+    expected = OpBuilder()
+    expected.add(path1, PathOp.UNION)
+    expected.add(path2, PathOp.UNION)
+    expected = expected.resolve()
+    expected.quantize(1)
+    assert builder.resolve() == expected
+
+    path1.addPath(path2)
+    expected = simplify(path1)
+    expected.quantize(1)
+    assert simplify(path1, round_to=1) == expected
+    path1.simplify(round_to=1)
+    assert path1 == expected
+
+
+def _rect_path(left, top, right, bottom):
+    path = Path()
+    path.moveTo(left, top)
+    path.lineTo(right, top)
+    path.lineTo(right, bottom)
+    path.lineTo(left, bottom)
+    path.close()
+    return path
+
+
+def _circle_path(cx, cy, r):
+    k = 0.5522847498 * r
+    path = Path()
+    path.moveTo(cx + r, cy)
+    path.cubicTo(cx + r, cy + k, cx + k, cy + r, cx, cy + r)
+    path.cubicTo(cx - k, cy + r, cx - r, cy + k, cx - r, cy)
+    path.cubicTo(cx - r, cy - k, cx - k, cy - r, cx, cy - r)
+    path.cubicTo(cx + k, cy - r, cx + r, cy - k, cx + r, cy)
+    path.close()
+    return path
+
+
+def test_clip_to_rect():
+    path = _rect_path(0, 0, 10, 10)
+
+    result = path.clip_to_rect(5, -5, 15, 5)
+
+    assert list(result) == [
+        (PathVerb.MOVE, ((5, 0),)),
+        (PathVerb.LINE, ((10, 0),)),
+        (PathVerb.LINE, ((10, 5),)),
+        (PathVerb.LINE, ((5, 5),)),
+        (PathVerb.CLOSE, ()),
+    ]
+    assert path.clip_to_rect(20, 20, 30, 30) == Path()
+    assert path.clip_to_rect(-1, -1, 11, 11) == path
+
+
+def test_clip_to_rect_trivial_accept_reject():
+    inside = _rect_path(1, 1, 2, 2)
+    inside.reverse()
+    path = Path(inside)
+    path.addPath(_rect_path(100, 100, 110, 110))
+    path.addPath(_rect_path(0, 0, 10, 10))
+
+    result = path.clip_to_rect(0, 0, 5, 5)
+
+    contours = list(result.contours)
+    assert len(contours) == 2
+    assert contours[0] == inside
+    assert contours[1].bounds == (0, 0, 5, 5)
+
+
+@pytest.mark.parametrize(
+    "rect",
+    [
+        (0, -20, 20, 20),
+        (-5, -5, 5, 5),
+        (-20, 3, 20, 20),
+        (-7, -7, 100, 100),
+    ],
+)
+def test_clip_to_rect_curves(rect):
+    path = _circle_path(0, 0, 10)
+    hole = _circle_path(0, 0, 4)
+    hole.reverse()
+    path.addPath(hole)
+
+    result = path.clip_to_rect(*rect)
+    expected = op(path, _rect_path(*rect), PathOp.INTERSECTION)
+
+    assert result.area == pytest.approx(expected.area, rel=1e-4)
+    assert result.bounds == pytest.approx(expected.bounds, abs=1e-3)
+
+
+def test_clip_to_rect_conics():
+    path = Path.from_svg("M10 0A10 10 0 0 0 -10 0A10 10 0 0 0 10 0Z")
+    assert PathVerb.CONIC in {verb for verb, _ in path}
+
+    result = path.clip_to_rect(0, 0, 20, 20)
+    expected = op(path, _rect_path(0, 0, 20, 20), PathOp.INTERSECTION)
+
+    assert result.area == pytest.approx(expected.area, rel=1e-3)
+    assert result.bounds == pytest.approx(expected.bounds, abs=1e-3)
+
+
+def test_clip_to_rect_figure_eight():
+    # the lobes have opposite directions, so the signed area is zero
+    path = Path()
+    path.moveTo(0, 0)
+    path.lineTo(10, 10)
+    path.lineTo(10, 0)
+    path.lineTo(0, 10)
+    path.close()
+
+    result = path.clip_to_rect(2, -5, 20, 20)
+
+    assert len(result) == 1
+    assert result.contains((8, 5))
+    assert result.contains((3, 5))
+    assert not result.contains((1, 5))
+
+
+def test_clip_to_rect_around_corner():
+    # an L-shape around the top-left corner, with bounds overlapping the rect
+    path = Path()
+    path.moveTo(-5, -5)
+    path.lineTo(15, -5)
+    path.lineTo(15, -1)
+    path.lineTo(-1, -1)
+    path.lineTo(-1, 15)
+    path.lineTo(-5, 15)
+    path.close()
+
+    assert path.clip_to_rect(0, 0, 10, 10) == Path()
+
+    # a contour going all around the rect is clipped to the rect itself
+    path = _rect_path(-5, -5, 15, 15)
+    assert path.clip_to_rect(0, 0, 10, 10).area == pytest.approx(100)
+
+
+def test_clip_to_rect_inverse_fill():
+    path = _rect_path(0, 0, 10, 10)
+    path.fillType = FillType.INVERSE_WINDING
+
+    result = path.clip_to_rect(5, 5, 15, 15)
+
+    expected = op(
+        path,
+        _rect_path(5, 5, 15, 15),
+        PathOp.INTERSECTION,
+        fix_winding=False,
+        keep_starting_points=False,
+    )
+    assert result == expected
+
+
+@pytest.mark.parametrize("fillType", list(FillType))
+def test_contains_many(fillType):
+    path = _circle_path(0, 0, 10)
+    path.addPath(_circle_path(0, 0, 4))
+    path.addPath(_rect_path(20, -5, 30, 5))
+    path.conicTo(20, 0, 25, 0, 0.5)
+    path.fillType = fillType
+    points = [
+        (x * 0.5 + 0.25, y * 0.75 + 0.125)
+        for x in range(-30, 70)
+        for y in range(-20, 20)
+    ]
+    # points on the edges and vertices
+    points += [(10, 0), (0, 4), (20, 0), (30, 5), (25, -5), (1e9, 0), (0, -1e9)]
+
+    result = path.contains_many(points)
+
+    assert result == [path.contains(pt) for pt in points]
+    assert path.contains_many(iter([])) == []
+
+
+def test_contains_many_after_modification():
+    path = _rect_path(0, 0, 10, 10)
+    assert path.contains_many([(5, 5), (15, 5)]) == [True, False]
+
+    path.addPath(_rect_path(12, 0, 20, 10))
+    assert path.contains_many([(5, 5), (15, 5)]) == [True, True]
+
+    path.reset()
+    assert path.contains_many([(5, 5), (15, 5)]) == [False, False]
+
+
+def test_metrics():
+    circle = _circle_path(0, 0, 10)
+    square = _rect_path(0, 0, 10, 10)
+    square.addPath(_rect_path(20, 0, 30, 10))
+    square.reverse()
+    paths = [circle, square, Path()]
+
+    result = metrics(paths)
+
+    assert result == {
+        "area": [p.area for p in paths],
+        "clockwise": [p.clockwise for p in paths],
+        "bounds": [p.bounds for p in paths],
+        "controlPointBounds": [p.controlPointBounds for p in paths],
+        "contours": [len(p) for p in paths],
+        "points": [len(p.points) for p in paths],
+    }
+    assert metrics([]) == {key: [] for key in result}
+
+
+def test_length():
+    assert Path().length() == 0
+    assert _rect_path(0, 0, 10, 10).length() == pytest.approx(40)
+    assert _circle_path(0, 0, 10).length() == pytest.approx(20 * math.pi, rel=1e-3)
+
+    path = _rect_path(0, 0, 10, 10)
+    path.moveTo(20, 0)
+    path.lineTo(23, 4)  # open contour, no closing segment
+    assert path.length() == pytest.approx(45)
+
+
+def test_sample():
+    path = _rect_path(0, 0, 10, 10)
+    path.addPath(_rect_path(20, 0, 30, 10))
+
+    positions, tangents = path.sample([15, 5, 45, -1, 100])
+
+    assert positions == [(10, 5), (5, 0), (25, 0), (0, 0), (20, 0)]
+    assert tangents == [(0, 1), (1, 0), (1, 0), (1, 0), (0, -1)]
+
+    with pytest.raises(ValueError):
+        Path().sample([0])
+
+
+def test_segment():
+    path = _rect_path(0, 0, 10, 10)
+    path.addPath(_rect_path(20, 0, 30, 10))
+
+    assert list(path.segment(5, 15)) == [
+        (PathVerb.MOVE, ((5, 0),)),
+        (PathVerb.LINE, ((10, 0),)),
+        (PathVerb.LINE, ((10, 5),)),
+    ]
+
+    result = path.segment(35, 90)
+    assert len(result) == 2
+    assert result.firstPoints == [(0, 5), (20, 0)]
+    assert result.length() == pytest.approx(45)
+    assert list(result)[-1] == (PathVerb.CLOSE, ())
+
+    assert path.segment(10, 10) == Path()
+
+
+def test_intersections():
+    a = _rect_path(0, 0, 10, 10)
+    b = _rect_path(5, 5, 15, 15)
+
+    result = intersections(a, b)
+
+    assert len(result) == 2
+    assert result[0][0] == pytest.approx((10, 5))
+    assert result[0][1] == (2, pytest.approx(0.5))
+    assert result[0][2] == (1, pytest.approx(0.5))
+    assert result[1][0] == pytest.approx((5, 10))
+    assert result[1][1] == (3, pytest.approx(0.5))
+    assert result[1][2] == (4, pytest.approx(0.5))
+
+    assert intersections(a, _rect_path(20, 20, 30, 30)) == []
+
+
+def test_intersections_curves():
+    circle = _circle_path(0, 0, 10)
+    guide = Path()
+    guide.moveTo(-20, 3)
+    guide.lineTo(20, 3)
+
+    result = intersections(guide, circle)
+
+    x = math.sqrt(91)
+    assert [pt for pt, _, _ in result] == [
+        pytest.approx((-x, 3), abs=0.01),
+        pytest.approx((x, 3), abs=0.01),
+    ]
+    for (px, py), (i, t), (j, u) in result:
+        assert i == 1
+        assert px == pytest.approx(-20 + 40 * t)
+
+
+def test_self_intersections():
+    assert self_intersections(_circle_path(0, 0, 10)) == []
+
+    bowtie = Path()
+    bowtie.moveTo(0, 0)
+    bowtie.lineTo(10, 10)
+    bowtie.lineTo(10, 0)
+    bowtie.lineTo(0, 10)
+    bowtie.close()
+
+    result = self_intersections(bowtie)
+
+    assert len(result) == 1
+    assert result[0][0] == pytest.approx((5, 5))
+    assert result[0][1] == (1, pytest.approx(0.5))
+    assert result[0][2] == (3, pytest.approx(0.5))
+
+
+def test_offset():
+    square = _rect_path(0, 0, 10, 10)
+
+    grown = square.offset(2)
+    assert grown.bounds == pytest.approx((-2, -2, 12, 12))
+    assert grown.area == pytest.approx(196)
+
+    shrunk = square.offset(-2)
+    assert shrunk.bounds == pytest.approx((2, 2, 8, 8))
+    assert shrunk.area == pytest.approx(36)
+
+    rounded = square.offset(2, join=LineJoin.ROUND_JOIN)
+    assert rounded.bounds == pytest.approx((-2, -2, 12, 12))
+    assert rounded.area == pytest.approx(180 + 4 * math.pi, rel=1e-3)
+
+    assert square.offset(-6) == Path()
+    # the original path is left unchanged
+    assert square == _rect_path(0, 0, 10, 10)
+
+
+def test_offset_zero_and_open_contours():
+    path = _rect_path(0, 0, 10, 10)
+    path.addPath(_rect_path(5, 5, 15, 15))
+    assert path.offset(0) == simplify(path, keep_starting_points=False)
+
+    closed = Path()
+    closed.moveTo(0, 0)
+    closed.lineTo(10, 0)
+    closed.lineTo(10, 10)
+    opened = Path(closed)
+    closed.close()
+    assert opened.offset(1) == closed.offset(1)
+
+
+def test_offset_overlapping_contours():
+    path = _rect_path(0, 0, 10, 10)
+    path.addPath(_rect_path(5, 0, 15, 10))
+
+    shrunk = path.offset(-1)
+
+    # the overlap is shrunk as a whole, without cutting bands inside it
+    assert shrunk.bounds == pytest.approx((1, 1, 14, 9))
+    assert shrunk.area == pytest.approx(13 * 8)
+    assert len(shrunk) == 1
+    for point in [(4, 5), (5.5, 5), (7.5, 5), (9.5, 5), (11, 5)]:
+        assert shrunk.contains(point)
+
+
+def test_cleanup():
+    path = Path()
+    path.moveTo(0, 0)
+    path.lineTo(0, 0)  # zero-length
+    path.lineTo(5, 0)
+    path.lineTo(10, 0)  # collinear
+    path.cubicTo(10, 0, 10, 0, 10, 0)  # degenerate curve
+    path.lineTo(10, 10)
+    path.lineTo(10, 5)  # spike
+    path.lineTo(10, 10)
+    path.lineTo(0, 10)
+    path.lineTo(0, 0)  # same as the implied closing line
+    path.close()
+    path.moveTo(20, 20)  # a contour with no segments
+    path.lineTo(20, 20)
+    path.close()
+
+    path.cleanup()
+
+    assert list(path) == [
+        (PathVerb.MOVE, ((0, 0),)),
+        (PathVerb.LINE, ((10, 0),)),
+        (PathVerb.LINE, ((10, 10),)),
+        (PathVerb.LINE, ((0, 10),)),
+        (PathVerb.CLOSE, ()),
+    ]
+
+
+def test_cleanup_tolerance():
+    path = Path()
+    path.moveTo(0, 0)
+    path.lineTo(5, 0.05)
+    path.lineTo(10, 0)
+    path.lineTo(10, 10)
+    path.lineTo(10.05, 10)
+    path.close()
+
+    expected = Path(path)
+    path.cleanup()
+    assert path == expected
+
+    path.cleanup(0.1)
+    assert list(path) == [
+        (PathVerb.MOVE, ((0, 0),)),
+        (PathVerb.LINE, ((10, 0),)),
+        (PathVerb.LINE, ((10, 10),)),
+        (PathVerb.CLOSE, ()),
+    ]
+
+    with pytest.raises(ValueError):
+        path.cleanup(-1)
+
+
+@pytest.mark.parametrize(
+    "fillType, copies",
+    [
+        (FillType.WINDING, 2),
+        (FillType.EVEN_ODD, 0),
+    ],
+)
+def test_cleanup_duplicate_contours(fillType, copies):
+    square = _rect_path(0, 0, 10, 10)
+    path = Path(square)
+    path.addPath(square)
+    path.addPath(_rect_path(20, 0, 30, 10))
+    path.fillType = fillType
+
+    path.cleanup()
+
+    assert list(path.contours) == [Path(square, fillType=fillType)] * copies + [
+        Path(_rect_path(20, 0, 30, 10), fillType=fillType)
+    ]
+
+
+def test_cleanup_duplicate_contours_keep_winding():
+    # the hole only cancels one of the two copies of the outer contour
+    square = _rect_path(0, 0, 10, 10)
+    hole = _rect_path(2, 2, 8, 8)
+    hole.reverse()
+    path = Path(square)
+    path.addPath(square)
+    path.addPath(hole)
+    assert path.contains((5, 5))
+
+    path.cleanup()
+
+    assert len(path) == 3
+    assert path.contains((5, 5))
+
+
+def test_op_cleanup():
+    one = _rect_path(0, 0, 10, 10)
+    one.addPath(_rect_path(0, 0, 10, 10))
+    one.lineTo(3, 3)
+    two = _rect_path(5, 5, 15, 15)
+    before = Path(one)
+
+    result = op(one, two, PathOp.UNION, cleanup=True)
+
+    expected = op(one, two, PathOp.UNION)
+    assert result.area == pytest.approx(expected.area)
+    assert result.bounds == expected.bounds
+    assert one == before
+
+    result = simplify(one, cleanup=True)
+    assert len(result) == 1
+    assert result.area == pytest.approx(100)
+    assert one == before
+
+
+def _star_path():
+    path = Path()
+    path.moveTo(50, 0)
+    path.lineTo(79, 90)
+    path.lineTo(2, 35)
+    path.lineTo(98, 35)
+    path.lineTo(21, 90)
+    path.close()
+    return path
+
+
+@pytest.mark.parametrize("operator", list(PathOp))
+def test_op_polygon_engine(operator):
+    one = _rect_path(0, 0, 10, 10)
+    one.addPath(_rect_path(20, 0, 30, 10))
+    two = _rect_path(5, 5, 25, 15)
+
+    result = op(one, two, operator, polygon_engine=True)
+
+    expected = op(one, two, operator)
+    assert result.area == pytest.approx(expected.area)
+    assert result.bounds == pytest.approx(expected.bounds)
+    assert result.fillType == expected.fillType
+    for point in [(2, 2), (7, 7), (15, 12), (22, 7), (28, 2), (15, 2)]:
+        assert result.contains(point) == expected.contains(point)
+
+
+@pytest.mark.parametrize("fillType", [FillType.EVEN_ODD, FillType.WINDING])
+def test_simplify_polygon_engine(fillType):
+    star = _star_path()
+    star.fillType = fillType
+
+    result = simplify(star, polygon_engine=True)
+
+    expected = simplify(star)
+    assert result.area == pytest.approx(expected.area)
+    assert result.bounds == pytest.approx(expected.bounds)
+
+    star.simplify(polygon_engine=True)
+
+    assert star == result
+
+
+def test_op_polygon_engine_inverse_fill():
+    one = _rect_path(0, 0, 10, 10)
+    one.fillType = FillType.INVERSE_WINDING
+    two = _rect_path(5, 5, 15, 15)
+
+    result = op(
+        one, two, PathOp.UNION, fix_winding=False, polygon_engine=True
+    )
+
+    assert result.fillType == FillType.INVERSE_EVEN_ODD
+    assert not result.contains((2, 2))
+    assert result.contains((7, 7))
+    assert result.contains((-5, -5))
+    assert result.area == pytest.approx(75)
+
+
+def test_op_polygon_engine_curves_fall_back():
+    one = _circle_path(0, 0, 10)
+    two = _rect_path(0, 0, 20, 20)
+
+    result = op(one, two, PathOp.UNION, polygon_engine=True)
+
+    assert result == op(one, two, PathOp.UNION)
+
+
+@pytest.mark.parametrize("merge_disjoint", [False, True])
+def test_op_builder_add_many(merge_disjoint):
+    paths = [_rect_path(i * 20, 0, i * 20 + 10, 10) for i in range(5)]
+    paths.append(_rect_path(5, 5, 95, 8))
+    paths.append(_rect_path(0, 2, 100, 3))
+    operators = [PathOp.UNION] * 6 + [PathOp.DIFFERENCE]
+
+    builder = OpBuilder()
+    builder.add_many(paths, operators, merge_disjoint=merge_disjoint)
+    result = builder.resolve()
+
+    expected_builder = OpBuilder()
+    for path, operator in zip(paths, operators):
+        expected_builder.add(path, operator)
+    expected = expected_builder.resolve()
+
+    assert result.area == pytest.approx(expected.area)
+    assert result.bounds == expected.bounds
+    assert sorted(result.firstPoints) == sorted(expected.firstPoints)
+
+
+def test_op_builder_add_many_single_operator():
+    paths = [_rect_path(0, 0, 10, 10), _rect_path(20, 0, 30, 10)]
+    builder = OpBuilder()
+    builder.add_many(paths, PathOp.UNION, merge_disjoint=True)
+
+    result = builder.resolve()
+
+    assert len(result) == 2
+    assert result.area == pytest.approx(200)
+    assert sorted(result.firstPoints) == [(0, 0), (20, 0)]
+
+
+@pytest.mark.parametrize("first_operator", list(PathOp))
+def test_op_builder_add_many_first_operator(first_operator):
+    # Skia combines the first path with an empty one using its operator
+    paths = [_rect_path(0, 0, 10, 10), _rect_path(20, 0, 30, 10)]
+    operators = [first_operator, PathOp.UNION]
+    builder = OpBuilder()
+    builder.add_many(paths, operators, merge_disjoint=True)
+    result = builder.resolve()
+
+    expected_builder = OpBuilder()
+    for path, operator in zip(paths, operators):
+        expected_builder.add(path, operator)
+    expected = expected_builder.resolve()
+
+    assert result.area == pytest.approx(expected.area)
+    assert result.bounds == expected.bounds
+    if first_operator in (PathOp.DIFFERENCE, PathOp.INTERSECTION):
+        assert result.area == pytest.approx(100)
+
+
+def test_op_builder_add_many_invalid():
+    builder = OpBuilder()
+    with pytest.raises(ValueError, match="expected 2 operators, found 1"):
+        builder.add_many([Path(), Path()], [PathOp.UNION])
+    with pytest.raises(TypeError):
+        builder.add_many([Path(), None], PathOp.UNION)
+
+
+def _max_distance_from_circle(path, r, samples=500):
+    length = path.length()
+    positions, _ = path.sample([length * i / samples for i in range(samples)])
+    return max(abs(math.hypot(x, y) - r) for x, y in positions)
+
+
+def test_cubics_to_quads():
+    path = _circle_path(0, 0, 100)
+
+    path.cubics_to_quads(max_err=1.0)
+
+    assert set(path.verbs) == {PathVerb.MOVE, PathVerb.QUAD, PathVerb.CLOSE}
+    assert _max_distance_from_circle(path, 100) <= 1.0
+
+    # consecutive quadratics with implied on-curve points make one qCurveTo
+    curve = Path()
+    curve.moveTo(0, 0)
+    curve.cubicTo(0, 100, 100, 100, 100, 0)
+    curve.cubicTo(110, 0, 120, -10, 120, -20)
+    curve.cubics_to_quads(max_err=0.1)
+    assert len(curve.points) > 5
+    segments = list(curve.segments)
+    assert [segment for segment, _ in segments] == [
+        "moveTo",
+        "qCurveTo",
+        "qCurveTo",
+        "endPath",
+    ]
+    assert segments[1][1][-1] == (100, 0)
+
+    finer = _circle_path(0, 0, 100)
+    finer.cubics_to_quads(max_err=0.01)
+    assert len(finer.points) > len(path.points)
+    assert _max_distance_from_circle(finer, 100) <= 0.01
+
+
+def test_cubics_to_quads_not_all_quadratic():
+    path = _circle_path(0, 0, 100)
+    expected = Path(path)
+
+    path.cubics_to_quads(max_err=0.01, all_quadratic=False)
+
+    assert path == expected
+
+
+@pytest.mark.parametrize(
+    "cubic, quad",
+    [
+        (((0, 0), (0, 0), (0, 0)), ((0, 0), (0, 0))),
+        (((1, 0), (1, 0), (1, 0)), ((1, 0), (1, 0))),
+        (((0, 0), (0, 0), (1, 0)), ((0, 0), (1, 0))),
+    ],
+)
+def test_cubics_to_quads_degenerate(cubic, quad):
+    path = Path()
+    path.moveTo(0, 0)
+    path.cubicTo(*cubic[0], *cubic[1], *cubic[2])
+
+    path.cubics_to_quads()
+
+    assert list(path) == [
+        (PathVerb.MOVE, ((0, 0),)),
+        (PathVerb.QUAD, quad),
+    ]
+
+
+def test_cubics_to_quads_masters():
+    masters = [_circle_path(0, 0, 100), _circle_path(0, 0, 1000)]
+
+    cubics_to_quads(masters, max_err=[1.0, 1.0])
+
+    assert masters[0].verbs == masters[1].verbs
+    assert _max_distance_from_circle(masters[0], 100) <= 1.0
+    assert _max_distance_from_circle(masters[1], 1000) <= 1.0
+    # the smaller master alone would need fewer segments
+    alone = _circle_path(0, 0, 100)
+    alone.cubics_to_quads(max_err=1.0)
+    assert len(alone.points) < len(masters[0].points)
+
+    with pytest.raises(IncompatiblePathsError):
+        cubics_to_quads([_circle_path(0, 0, 100), _rect_path(0, 0, 10, 10)])
+    with pytest.raises(ValueError):
+        cubics_to_quads(masters, max_err=[1.0])
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import sysconfig
+import threading
+
+from pathops import FrozenPath, Path, PathOp, op, simplify
+
+import pytest
+
+
+NUM_THREADS = 8
+NUM_ITERATIONS = 50
+
+
+def _square(x, y, size=10):
+    path = Path()
+    path.moveTo(x, y)
+    path.lineTo(x + size, y)
+    path.lineTo(x + size, y + size)
+    path.lineTo(x, y + size)
+    path.close()
+    return path
+
+
+def _run_concurrently(func):
+    # start all the threads at the same time to maximize contention
+    barrier = threading.Barrier(NUM_THREADS)
+
+    def worker(i):
+        barrier.wait()
+        return [func(i) for _ in range(NUM_ITERATIONS)]
+
+    with ThreadPoolExecutor(NUM_THREADS) as executor:
+        return list(executor.map(worker, range(NUM_THREADS)))
+
+
+@pytest.mark.skipif(
+    not sysconfig.get_config_var("Py_GIL_DISABLED"),
+    reason="requires a free-threaded build",
+)
+def test_gil_not_enabled():
+    # importing the extension module must not re-enable the GIL
+    assert not sys._is_gil_enabled()
+
+
+def test_shared_operands():
+    one = _square(0, 0)
+    one.addPath(_square(5, 5))
+    two = _square(8, 8)
+    expected_op = op(one, two, PathOp.UNION)
+    expected_simplify = simplify(one)
+
+    def check(i):
+        return (
+            op(one, two, PathOp.UNION) == expected_op
+            and simplify(one) == expected_simplify
+        )
+
+    for results in _run_concurrently(check):
+        assert all(results)
+
+
+def test_shared_contains_many():
+    path = _square(0, 0)
+    path.addPath(_square(20, 0))
+    points = [(x, 5) for x in range(-5, 35)]
+    expected = [path.contains(pt) for pt in points]
+
+    for results in _run_concurrently(lambda i: path.contains_many(points)):
+        assert results == [expected] * NUM_ITERATIONS
+
+
+def test_shared_frozen_path():
+    frozen = FrozenPath(_square(0, 0))
+    expected = hash(FrozenPath(_square(0, 0)))
+
+    def check(i):
+        return hash(frozen) == expected and frozen.thaw() == _square(0, 0)
+
+    for results in _run_concurrently(check):
+        assert all(results)
+
+
+def test_thread_local_paths():
+    # each thread modifies its own paths
+    def work(i):
+        path = _square(i, i)
+        path.addPath(_square(i + 5, i + 5))
+        path.simplify()
+        path.reverse()
+        return path.area
+
+    for results in _run_concurrently(work):
+        assert results == [pytest.approx(175)] * NUM_ITERATIONS